@@ -6,10 +6,311 @@ Simulate trading strategy on historical data
 import pandas as pd
 import numpy as np
 import logging
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+from utils._njit import njit, NUMBA_AVAILABLE
+
+
+# Close reason codes stored in TradeBook / produced by the backtest kernel
+_REASON = {'signal': 0, 'stop_loss': 1, 'take_profit': 2, 'end_of_data': 3}
+_REASON_NAMES = np.array(list(_REASON), dtype=object)
+
+# Position side codes
+_SIDE = {'long': 1, 'short': -1}
+
+
+class TradeBook:
+    """
+    Closed trades stored as parallel NumPy arrays (struct of arrays)
+    - One preallocated array per field, written at index n
+    - Timestamps are int64 nanoseconds since epoch
+    - Grows by doubling when capacity is exceeded
+    """
+    
+    __slots__ = ('n', 'entry_ts', 'exit_ts', 'side', 'entry_px', 'exit_px',
+                 'size', 'pnl', 'entry_capital', 'close_reason_code')
+    
+    _DTYPES = {
+        'entry_ts': np.int64,
+        'exit_ts': np.int64,
+        'side': np.int8,
+        'entry_px': np.float64,
+        'exit_px': np.float64,
+        'size': np.float64,
+        'pnl': np.float64,
+        'entry_capital': np.float64,
+        'close_reason_code': np.int8
+    }
+    
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize empty trade book
+        
+        Args:
+            capacity: Initial number of trade slots (e.g. len(data) as upper bound)
+        """
+        capacity = max(int(capacity), 1)
+        self.n = 0
+        for name, dtype in self._DTYPES.items():
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+    
+    @classmethod
+    def from_arrays(cls, **columns) -> 'TradeBook':
+        """Build a trade book directly from equal-length column arrays"""
+        book = cls.__new__(cls)
+        book.n = len(columns['pnl'])
+        for name, dtype in cls._DTYPES.items():
+            setattr(book, name, np.asarray(columns[name], dtype=dtype))
+        return book
+    
+    def __len__(self) -> int:
+        return self.n
+    
+    def _grow(self):
+        """Double capacity of every column"""
+        for name in self._DTYPES:
+            old = getattr(self, name)
+            new = np.empty(len(old) * 2, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+    
+    def append(self, entry_ts: int, exit_ts: int, side: int, entry_px: float, exit_px: float,
+               size: float, pnl: float, entry_capital: float, close_reason_code: int):
+        """Write one closed trade into the next free slot (timestamps in ns)"""
+        if self.n == len(self.pnl):
+            self._grow()
+        
+        i = self.n
+        self.entry_ts[i] = entry_ts
+        self.exit_ts[i] = exit_ts
+        self.side[i] = side
+        self.entry_px[i] = entry_px
+        self.exit_px[i] = exit_px
+        self.size[i] = size
+        self.pnl[i] = pnl
+        self.entry_capital[i] = entry_capital
+        self.close_reason_code[i] = close_reason_code
+        self.n = i + 1
+    
+    def column(self, name: str) -> np.ndarray:
+        """View of the filled part of a column"""
+        return getattr(self, name)[:self.n]
+    
+    def return_percent(self) -> np.ndarray:
+        """Per-trade price return in % (sign-adjusted for side)"""
+        entry_px = self.column('entry_px')
+        return self.column('side') * (self.column('exit_px') - entry_px) / entry_px * 100
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert to a trades DataFrame (one row per trade)
+        
+        Returns:
+            DataFrame with the classic trade record columns
+        """
+        side = self.column('side')
+        entry_px = self.column('entry_px')
+        exit_px = self.column('exit_px')
+        pnl = self.column('pnl')
+        entry_ts = self.column('entry_ts')
+        exit_ts = self.column('exit_ts')
+        
+        return pd.DataFrame({
+            'entry_timestamp': pd.to_datetime(entry_ts),
+            'exit_timestamp': pd.to_datetime(exit_ts),
+            'duration': pd.to_timedelta(exit_ts - entry_ts),
+            'side': np.where(side == 1, 'long', 'short'),
+            'entry_price': entry_px,
+            'exit_price': exit_px,
+            'size': self.column('size'),
+            'pnl': pnl,
+            'pnl_percent': pnl / self.column('entry_capital') * 100,
+            'return_percent': self.return_percent(),
+            'close_reason': _REASON_NAMES[self.column('close_reason_code')]
+        })
+
+
+def _align(data: pd.DataFrame, signals: pd.Series) -> np.ndarray:
+    """
+    OHLC columns as a float64 (N, 4) array aligned to signals.index
+    
+    Skips the reindex copy when both already share the same index.
+    """
+    ohlc = data[['open', 'high', 'low', 'close']]
+    if data.index is signals.index or data.index.equals(signals.index):
+        return ohlc.to_numpy(dtype=np.float64)
+    return ohlc.reindex(signals.index).to_numpy(dtype=np.float64)
+
+
+def _signal_array(signals: pd.Series) -> np.ndarray:
+    """Signals as a positional int8 array (no copy when already int8)"""
+    return np.asarray(signals.to_numpy(), dtype=np.int8)
+
+
+@njit(cache=True)
+def _close_trade(side, entry_px, size, entry_commission, price, commission, slippage):
+    """Return (exit_price, pnl) for closing a position at price"""
+    if side == 1:
+        exit_px = price * (1 - slippage)
+        pnl = (exit_px - entry_px) * size
+    else:
+        exit_px = price * (1 + slippage)
+        pnl = (entry_px - exit_px) * size
+    pnl -= size * exit_px * commission
+    pnl -= entry_commission
+    return exit_px, pnl
+
+
+@njit(cache=True)
+def _run_backtest_kernel(high, low, close, signals, sl_long, tp_long, sl_short, tp_short,
+                         initial_capital, leverage, commission, slippage):
+    """
+    Bar-by-bar simulation over contiguous arrays
+
+    Mirrors open_position / close_position / check_stop_loss_take_profit with
+    the position held in scalars (side: 1=long, -1=short, 0=flat). Stop loss /
+    take profit levels per bar are precomputed by the caller. Without numba
+    the inputs may be plain lists (see Backtester._simulate).
+
+    Returns:
+        (entry_idx, exit_idx, side, entry_px, exit_px, size, pnl,
+         entry_capital, close_reason, equity, final_capital)
+    """
+    n = len(close)
+    
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    sides = np.empty(n, dtype=np.int8)
+    entry_pxs = np.empty(n, dtype=np.float64)
+    exit_pxs = np.empty(n, dtype=np.float64)
+    sizes = np.empty(n, dtype=np.float64)
+    pnls = np.empty(n, dtype=np.float64)
+    entry_capital = np.empty(n, dtype=np.float64)
+    close_reason = np.empty(n, dtype=np.int8)
+    equity = np.empty(n, dtype=np.float64)
+    
+    capital = initial_capital
+    pos_side = 0
+    pos_entry_i = 0
+    pos_entry_px = 0.0
+    pos_size = 0.0
+    pos_sl = 0.0
+    pos_tp = 0.0
+    pos_commission = 0.0
+    pos_entry_capital = 0.0
+    k = 0
+    
+    for i in range(n):
+        c = close[i]
+        sig = signals[i]
+        
+        # Record equity
+        equity[i] = capital
+        
+        # Check if position should be closed by SL/TP (stop loss first).
+        # Side-signed comparisons: adverse is the bar extreme moving against
+        # the position (low for long, high for short), favorable the other.
+        if pos_side != 0:
+            adverse = low[i] if pos_side == 1 else high[i]
+            favorable = high[i] if pos_side == 1 else low[i]
+            reason = -1
+            price = 0.0
+            if (adverse - pos_sl) * pos_side <= 0:
+                reason, price = 1, pos_sl
+            elif (favorable - pos_tp) * pos_side >= 0:
+                reason, price = 2, pos_tp
+            
+            if reason >= 0:
+                exit_px, pnl = _close_trade(pos_side, pos_entry_px, pos_size, pos_commission,
+                                            price, commission, slippage)
+                capital += pnl
+                entry_idx[k] = pos_entry_i
+                exit_idx[k] = i
+                sides[k] = pos_side
+                entry_pxs[k] = pos_entry_px
+                exit_pxs[k] = exit_px
+                sizes[k] = pos_size
+                pnls[k] = pnl
+                entry_capital[k] = pos_entry_capital
+                close_reason[k] = reason
+                k += 1
+                pos_side = 0
+        
+        # Process signals
+        if pos_side == 0:
+            if sig == 1 or sig == 2:
+                new_side = 1
+                actual_px = c * (1 + slippage)
+                sl = sl_long[i]
+                tp = tp_long[i]
+                price_risk = actual_px - sl
+            elif sig == 0:
+                new_side = -1
+                actual_px = c * (1 - slippage)
+                sl = sl_short[i]
+                tp = tp_short[i]
+                price_risk = sl - actual_px
+            else:
+                new_side = 0
+                actual_px = sl = tp = price_risk = 0.0
+            
+            if new_side != 0 and price_risk > 0:
+                size = capital * (2 / 100) / price_risk
+                max_position_value = capital * leverage
+                if size * actual_px > max_position_value:
+                    size = max_position_value / actual_px
+                
+                if size > 0:
+                    pos_entry_capital = capital
+                    pos_commission = size * actual_px * commission
+                    capital -= pos_commission
+                    pos_side = new_side
+                    pos_entry_i = i
+                    pos_entry_px = actual_px
+                    pos_size = size
+                    pos_sl = sl
+                    pos_tp = tp
+        
+        elif (pos_side == 1 and sig == 0) or (pos_side == -1 and sig == 1):
+            # Close position on opposite signal
+            exit_px, pnl = _close_trade(pos_side, pos_entry_px, pos_size, pos_commission,
+                                        c, commission, slippage)
+            capital += pnl
+            entry_idx[k] = pos_entry_i
+            exit_idx[k] = i
+            sides[k] = pos_side
+            entry_pxs[k] = pos_entry_px
+            exit_pxs[k] = exit_px
+            sizes[k] = pos_size
+            pnls[k] = pnl
+            entry_capital[k] = pos_entry_capital
+            close_reason[k] = 0
+            k += 1
+            pos_side = 0
+    
+    # Close any remaining position
+    if pos_side != 0:
+        exit_px, pnl = _close_trade(pos_side, pos_entry_px, pos_size, pos_commission,
+                                    close[n - 1], commission, slippage)
+        capital += pnl
+        entry_idx[k] = pos_entry_i
+        exit_idx[k] = n - 1
+        sides[k] = pos_side
+        entry_pxs[k] = pos_entry_px
+        exit_pxs[k] = exit_px
+        sizes[k] = pos_size
+        pnls[k] = pnl
+        entry_capital[k] = pos_entry_capital
+        close_reason[k] = 3
+        k += 1
+    
+    return (entry_idx[:k], exit_idx[:k], sides[:k], entry_pxs[:k], exit_pxs[:k],
+            sizes[:k], pnls[:k], entry_capital[:k], close_reason[:k], equity, capital)
 
 
 class Backtester:
@@ -38,9 +339,10 @@ class Backtester:
         self.commission = commission
         self.slippage = slippage
         
-        # Results tracking
-        self.trades = []
-        self.equity_curve = []
+        # Results tracking (SoA: trade columns + equity array aligned to equity_index)
+        self.trades = TradeBook()
+        self.equity_curve = np.empty(0, dtype=np.float64)
+        self.equity_index = None
         self.current_capital = initial_capital
         self.current_position = None
         
@@ -48,8 +350,9 @@ class Backtester:
     
     def reset(self):
         """Reset backtester state"""
-        self.trades = []
-        self.equity_curve = []
+        self.trades = TradeBook()
+        self.equity_curve = np.empty(0, dtype=np.float64)
+        self.equity_index = None
         self.current_capital = self.initial_capital
         self.current_position = None
         self.logger.info("Backtester reset")
@@ -130,12 +433,13 @@ class Backtester:
             'stop_loss': stop_loss,
             'take_profit': take_profit,
             'commission': commission_cost,
+            'entry_capital': self.current_capital,
             'signal_data': signal_data or {}
         }
         
         self.current_capital -= commission_cost
         
-        self.logger.debug(f"Position opened: {side.upper()} {position_size:.4f} @ {actual_price:.2f}")
+        self.logger.debug("Position opened: %s %.4f @ %.2f", side.upper(), position_size, actual_price)
         return True
     
     def close_position(self, timestamp, price: float, reason: str = 'signal') -> Optional[Dict]:
@@ -187,16 +491,18 @@ class Backtester:
             'exit_price': actual_price,
             'size': position_size,
             'pnl': pnl,
-            'pnl_percent': (pnl / self.current_capital) * 100,
             'return_percent': ((actual_price - entry_price) / entry_price * 100) if side == 'long' else ((entry_price - actual_price) / entry_price * 100),
             'close_reason': reason,
             'signal_data': self.current_position.get('signal_data', {})
         }
         
-        self.trades.append(trade)
+        self.trades.append(pd.Timestamp(trade['entry_timestamp']).value,
+                           pd.Timestamp(timestamp).value, _SIDE[side], entry_price,
+                           actual_price, position_size, pnl,
+                           self.current_position['entry_capital'], _REASON[reason])
         self.current_position = None
         
-        self.logger.debug(f"Position closed: {reason.upper()} PnL=${pnl:.2f}")
+        self.logger.debug("Position closed: %s PnL=$%.2f", reason.upper(), pnl)
         return trade
     
     def check_stop_loss_take_profit(self, timestamp, high: float, low: float) -> Optional[Dict]:
@@ -256,64 +562,246 @@ class Backtester:
         self.logger.info(f"Data: {len(data)} bars, Signals: {len(signals)} signals")
         
         # Ensure data and signals are aligned
-        data = data.loc[signals.index]
-        
-        for idx, row in data.iterrows():
-            timestamp = idx
-            close = row['close']
-            high = row['high']
-            low = row['low']
-            signal = signals.loc[idx]
-            
-            # Record equity
-            self.equity_curve.append({
-                'timestamp': timestamp,
-                'equity': self.current_capital
-            })
+        ohlc = _align(data, signals)
+        
+        if len(ohlc) == 0:
+            return self.calculate_metrics()
+        
+        self._simulate(
+            np.ascontiguousarray(ohlc[:, 1]),
+            np.ascontiguousarray(ohlc[:, 2]),
+            np.ascontiguousarray(ohlc[:, 3]),
+            _signal_array(signals),
+            pd.DatetimeIndex(signals.index).as_unit('ns').asi8,
+            stop_loss_pct, take_profit_pct
+        )
+        self.equity_index = signals.index
+        
+        # Calculate metrics
+        results = self.calculate_metrics()
+        self._log_results(results)
+        
+        return results
+    
+    def _simulate(self, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  signals: np.ndarray, ts_ns: np.ndarray,
+                  stop_loss_pct: float, take_profit_pct: float):
+        """
+        Run the backtest kernel on aligned arrays and store its output
+        
+        Args:
+            high, low, close: Contiguous float64 price arrays
+            signals: int8 signal array
+            ts_ns: int64 bar timestamps (ns since epoch)
+            stop_loss_pct: Stop loss percentage
+            take_profit_pct: Take profit percentage
+        """
+        # Stop loss / take profit levels for every bar, both sides
+        inputs = [
+            high, low, close, signals,
+            close * (1 - stop_loss_pct / 100),
+            close * (1 + take_profit_pct / 100),
+            close * (1 + stop_loss_pct / 100),
+            close * (1 - take_profit_pct / 100)
+        ]
+        
+        # Interpreted fallback: indexing Python lists is far cheaper than
+        # boxing ndarray scalars on every bar
+        if not NUMBA_AVAILABLE:
+            inputs = [arr.tolist() for arr in inputs]
+        
+        (entry_idx, exit_idx, sides, entry_px, exit_px, sizes, pnls,
+         entry_capital, close_reason, equity, final_capital) = _run_backtest_kernel(
+            *inputs,
+            float(self.initial_capital), float(self.leverage),
+            float(self.commission), float(self.slippage)
+        )
+        
+        # Store kernel output columns directly (no per-trade records)
+        self.equity_curve = equity
+        self.trades = TradeBook.from_arrays(
+            entry_ts=ts_ns[entry_idx],
+            exit_ts=ts_ns[exit_idx],
+            side=sides,
+            entry_px=entry_px,
+            exit_px=exit_px,
+            size=sizes,
+            pnl=pnls,
+            entry_capital=entry_capital,
+            close_reason_code=close_reason
+        )
+        
+        self.current_capital = final_capital
+        self.current_position = None
+    
+    def sweep(self, data: pd.DataFrame, signals: pd.Series,
+              param_grid: Dict[str, List], n_jobs: int = -1) -> pd.DataFrame:
+        """
+        Run a grid of backtests in parallel worker processes
+        
+        Prices, signals and timestamps are copied once into shared memory;
+        workers map the same buffers instead of receiving pickled data.
+        
+        Args:
+            data: DataFrame with OHLCV data
+            signals: Series with trading signals
+            param_grid: Dict of parameter name -> list of values. Supported:
+                        stop_loss_pct, take_profit_pct, initial_capital,
+                        leverage, commission, slippage. Missing parameters
+                        use this backtester's settings / run_backtest defaults.
+            n_jobs: Number of worker processes (-1 = all CPUs)
             
-            # Check if position should be closed by SL/TP
-            if self.current_position:
-                trade = self.check_stop_loss_take_profit(timestamp, high, low)
+        Returns:
+            DataFrame with one row per parameter combination and its metrics
+        """
+        unknown = set(param_grid) - set(_SWEEP_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+        
+        base = {
+            'stop_loss_pct': 2.0,
+            'take_profit_pct': 4.0,
+            'initial_capital': self.initial_capital,
+            'leverage': self.leverage,
+            'commission': self.commission,
+            'slippage': self.slippage
+        }
+        names = list(param_grid)
+        combos = [{**base, **dict(zip(names, values))}
+                  for values in itertools.product(*param_grid.values())]
+        
+        ohlc = _align(data, signals)
+        n = len(ohlc)
+        ts_ns = pd.DatetimeIndex(signals.index).as_unit('ns').asi8
+        max_workers = n_jobs if n_jobs > 0 else os.cpu_count()
+        
+        self.logger.info(f"Sweeping {len(combos)} parameter sets over {n} bars "
+                         f"with {max_workers} workers")
+        
+        # Row layout (high, low, close, signal) keeps every column contiguous
+        prices_shm = shared_memory.SharedMemory(create=True, size=max(4 * n * 8, 1))
+        ts_shm = shared_memory.SharedMemory(create=True, size=max(n * 8, 1))
+        try:
+            prices = np.ndarray((4, n), dtype=np.float64, buffer=prices_shm.buf)
+            prices[:3] = ohlc[:, 1:].T
+            prices[3] = signals.to_numpy()
+            shared_ts = np.ndarray(n, dtype=np.int64, buffer=ts_shm.buf)
+            shared_ts[:] = ts_ns
+            del prices, shared_ts
             
-            # Process signals
-            if self.current_position is None:
-                # Open new position based on signal
-                if signal == 1:  # Buy signal
-                    sl = close * (1 - stop_loss_pct / 100)
-                    tp = close * (1 + take_profit_pct / 100)
-                    self.open_position(timestamp, close, 'long', sl, tp)
-                
-                elif signal == 0:  # Sell signal (short)
-                    sl = close * (1 + stop_loss_pct / 100)
-                    tp = close * (1 - take_profit_pct / 100)
-                    self.open_position(timestamp, close, 'short', sl, tp)
-                
-                elif signal == 2:  # Buy signal (ternary classification)
-                    sl = close * (1 - stop_loss_pct / 100)
-                    tp = close * (1 + take_profit_pct / 100)
-                    self.open_position(timestamp, close, 'long', sl, tp)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_sweep_worker, prices_shm.name, ts_shm.name, n, params)
+                    for params in combos
+                ]
+                rows = [future.result() for future in futures]
+        finally:
+            prices_shm.close()
+            prices_shm.unlink()
+            ts_shm.close()
+            ts_shm.unlink()
+        
+        return pd.DataFrame(rows)
+    
+    def run_backtest_vectorized(self, data: pd.DataFrame, signals: pd.Series) -> Dict:
+        """
+        Run a stop-and-reverse backtest without stop loss / take profit using pure NumPy
+        
+        This is a different strategy from run_backtest, not a faster version
+        of it, and its results are not comparable: the position follows the
+        signal (1/2=long, 0=short, anything else=flat) and is closed, and
+        reversed on the same bar, at the close of the first bar where it
+        changes. Each trade uses the full leveraged notional of the capital at
+        entry (there is no stop to size risk against), so capital compounds
+        as a cumulative product. Call it explicitly for quick signal checks.
+        
+        Args:
+            data: DataFrame with OHLCV data
+            signals: Series with trading signals (1=buy, 0=sell/hold, 2=buy for ternary)
             
-            else:
-                # Close position if opposite signal
-                current_side = self.current_position['side']
-                if (current_side == 'long' and signal == 0) or \
-                   (current_side == 'short' and signal == 1):
-                    self.close_position(timestamp, close, 'signal')
+        Returns:
+            Backtest results dict
+        """
+        self.reset()
         
-        # Close any remaining position
-        if self.current_position:
-            self.close_position(data.index[-1], data['close'].iloc[-1], 'end_of_data')
+        self.logger.info("Running vectorized backtest (no SL/TP)...")
+        self.logger.info(f"Data: {len(data)} bars, Signals: {len(signals)} signals")
+        
+        # Ensure data and signals are aligned
+        ohlc = _align(data, signals)
+        n = len(ohlc)
+        
+        if n == 0:
+            return self.calculate_metrics()
+        
+        close = np.ascontiguousarray(ohlc[:, 3])
+        sig = _signal_array(signals)
+        pos = np.where((sig == 1) | (sig == 2), 1, np.where(sig == 0, -1, 0)).astype(np.int8)
+        
+        # Trades start where a non-flat position begins and end at the next change
+        changed = np.empty(n, dtype=bool)
+        changed[0] = True
+        np.not_equal(pos[1:], pos[:-1], out=changed[1:])
+        entry_idx = np.flatnonzero(changed & (pos != 0))
+        change_points = np.append(np.flatnonzero(changed[1:]) + 1, n)
+        exit_idx = change_points[np.searchsorted(change_points, entry_idx, side='right')]
+        end_of_data = exit_idx == n
+        exit_idx[end_of_data] = n - 1
+        
+        side = pos[entry_idx]
+        entry_px = close[entry_idx] * (1 + side * self.slippage)
+        exit_px = close[exit_idx] * (1 - side * self.slippage)
+        
+        # Capital multiplier per trade: entry commission is deducted on open
+        # and again inside pnl, matching the scalar path
+        exit_ratio = exit_px / entry_px
+        trade_return = side * (exit_ratio - 1)
+        growth = 1 + self.leverage * (trade_return - 2 * self.commission
+                                      - self.commission * exit_ratio)
+        capital_after = self.initial_capital * np.cumprod(growth)
+        entry_capital = np.concatenate(([self.initial_capital], capital_after[:-1]))
+        
+        size = entry_capital * self.leverage / entry_px
+        entry_commission = entry_capital * self.leverage * self.commission
+        pnl = capital_after - entry_capital + entry_commission
+        
+        # Realized equity before each bar's actions
+        delta = np.zeros(n, dtype=np.float64)
+        np.add.at(delta, entry_idx, -entry_commission)
+        np.add.at(delta, exit_idx, pnl)
+        equity = np.empty(n, dtype=np.float64)
+        equity[0] = self.initial_capital
+        equity[1:] = self.initial_capital + np.cumsum(delta[:-1])
+        
+        index = signals.index
+        ts_ns = pd.DatetimeIndex(index).as_unit('ns').asi8
+        self.equity_curve = equity
+        self.equity_index = index
+        self.trades = TradeBook.from_arrays(
+            entry_ts=ts_ns[entry_idx],
+            exit_ts=ts_ns[exit_idx],
+            side=side,
+            entry_px=entry_px,
+            exit_px=exit_px,
+            size=size,
+            pnl=pnl,
+            entry_capital=entry_capital,
+            close_reason_code=np.where(end_of_data, _REASON['end_of_data'], _REASON['signal'])
+        )
+        self.current_capital = capital_after[-1] if len(capital_after) else self.initial_capital
         
-        # Calculate metrics
         results = self.calculate_metrics()
+        self._log_results(results)
         
+        return results
+    
+    def _log_results(self, results: Dict):
+        """Log headline backtest results"""
         self.logger.info("Backtest complete")
         self.logger.info(f"Total trades: {results['total_trades']}")
         self.logger.info(f"Win rate: {results['win_rate']:.2%}")
         self.logger.info(f"Final capital: ${results['final_capital']:.2f}")
         self.logger.info(f"Total return: {results['total_return']:.2%}")
-        
-        return results
     
     def calculate_metrics(self) -> Dict:
         """
@@ -322,7 +810,7 @@ class Backtester:
         Returns:
             Dict with metrics
         """
-        if not self.trades:
+        if len(self.trades) == 0:
             return {
                 'total_trades': 0,
                 'final_capital': self.current_capital,
@@ -330,40 +818,51 @@ class Backtester:
                 'win_rate': 0
             }
         
-        trades_df = pd.DataFrame(self.trades)
+        pnl = self.trades.column('pnl')
         
-        # Basic metrics
-        total_trades = len(trades_df)
-        winning_trades = len(trades_df[trades_df['pnl'] > 0])
-        losing_trades = len(trades_df[trades_df['pnl'] < 0])
+        # Basic metrics (single mask per sign, reused below)
+        pos_mask = pnl > 0
+        neg_mask = pnl < 0
+        total_trades = len(pnl)
+        winning_trades = int(pos_mask.sum())
+        losing_trades = int(neg_mask.sum())
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
         
         # PnL metrics
-        total_pnl = trades_df['pnl'].sum()
-        avg_pnl = trades_df['pnl'].mean()
-        avg_win = trades_df[trades_df['pnl'] > 0]['pnl'].mean() if winning_trades > 0 else 0
-        avg_loss = trades_df[trades_df['pnl'] < 0]['pnl'].mean() if losing_trades > 0 else 0
+        wins = pnl[pos_mask]
+        losses = pnl[neg_mask]
+        total_pnl = pnl.sum()
+        avg_pnl = pnl.mean()
+        avg_win = wins.mean() if winning_trades > 0 else 0
+        avg_loss = losses.mean() if losing_trades > 0 else 0
         
         # Return metrics
         total_return = ((self.current_capital - self.initial_capital) / self.initial_capital) * 100
         
         # Profit factor
-        gross_profit = trades_df[trades_df['pnl'] > 0]['pnl'].sum() if winning_trades > 0 else 0
-        gross_loss = abs(trades_df[trades_df['pnl'] < 0]['pnl'].sum()) if losing_trades > 0 else 0
+        gross_profit = wins.sum()
+        gross_loss = -losses.sum()
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else np.inf
         
         # Drawdown
-        equity_df = pd.DataFrame(self.equity_curve)
-        equity_df['peak'] = equity_df['equity'].cummax()
-        equity_df['drawdown'] = (equity_df['equity'] - equity_df['peak']) / equity_df['peak'] * 100
-        max_drawdown = equity_df['drawdown'].min()
+        equity = self.equity_curve
+        peak = np.maximum.accumulate(equity)
+        drawdown = (equity - peak) / peak * 100
+        max_drawdown = drawdown.min() if len(drawdown) else 0.0
         
-        # Sharpe ratio (assuming daily data)
-        returns = trades_df['return_percent'].values
-        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if len(returns) > 1 else 0
+        # Sharpe ratio (assuming daily data), sample std
+        returns = self.trades.return_percent()
+        sharpe_ratio = 0
+        if len(returns) > 1:
+            std = np.std(returns, ddof=1)
+            if std > 0:
+                sharpe_ratio = (np.mean(returns) / std) * np.sqrt(252)
         
-        # Average duration
-        avg_duration = trades_df['duration'].mean()
+        # Average duration (int64 ns reduction, converted once)
+        duration_ns = self.trades.column('exit_ts') - self.trades.column('entry_ts')
+        avg_duration = pd.Timedelta(int(duration_ns.mean()))
+        
+        trades_df = self.trades.to_frame()
         
         return {
             'total_trades': total_trades,
@@ -374,8 +873,8 @@ class Backtester:
             'avg_pnl': avg_pnl,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
-            'best_trade': trades_df['pnl'].max(),
-            'worst_trade': trades_df['pnl'].min(),
+            'best_trade': pnl.max(),
+            'worst_trade': pnl.min(),
             'profit_factor': profit_factor,
             'initial_capital': self.initial_capital,
             'final_capital': self.current_capital,
@@ -384,7 +883,12 @@ class Backtester:
             'sharpe_ratio': sharpe_ratio,
             'avg_duration': avg_duration,
             'trades_df': trades_df,
-            'equity_df': equity_df
+            'equity_curve': {
+                'timestamp': self.equity_index,
+                'equity': equity,
+                'peak': peak,
+                'drawdown': drawdown
+            }
         }
     
     def plot_results(self, results: Dict, save_path: Optional[str] = None):
@@ -395,10 +899,12 @@ class Backtester:
             results: Results dict from calculate_metrics
             save_path: Path to save plot (optional)
         """
+        import matplotlib.pyplot as plt
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         
         # Equity curve
-        equity_df = results['equity_df']
+        equity_df = pd.DataFrame(results['equity_curve'])
         axes[0, 0].plot(equity_df['timestamp'], equity_df['equity'], label='Equity')
         axes[0, 0].plot(equity_df['timestamp'], equity_df['peak'], 'r--', alpha=0.5, label='Peak')
         axes[0, 0].set_title('Equity Curve')
@@ -475,6 +981,38 @@ class Backtester:
         print("=" * 60)
 
 
+# Parameters accepted by Backtester.sweep and the metrics each worker returns
+_SWEEP_PARAMS = ('stop_loss_pct', 'take_profit_pct', 'initial_capital',
+                 'leverage', 'commission', 'slippage')
+_SWEEP_METRICS = ('total_trades', 'win_rate', 'total_pnl', 'profit_factor',
+                  'final_capital', 'total_return', 'max_drawdown', 'sharpe_ratio')
+
+
+def _sweep_worker(prices_name: str, ts_name: str, n: int, params: Dict) -> Dict:
+    """Run one sweep backtest against the shared price / timestamp buffers"""
+    prices_shm = shared_memory.SharedMemory(name=prices_name)
+    ts_shm = shared_memory.SharedMemory(name=ts_name)
+    try:
+        prices = np.ndarray((4, n), dtype=np.float64, buffer=prices_shm.buf)
+        ts_ns = np.ndarray(n, dtype=np.int64, buffer=ts_shm.buf)
+        
+        backtester = Backtester(
+            initial_capital=params['initial_capital'],
+            leverage=params['leverage'],
+            commission=params['commission'],
+            slippage=params['slippage']
+        )
+        backtester._simulate(prices[0], prices[1], prices[2], prices[3].astype(np.int8),
+                             ts_ns, params['stop_loss_pct'], params['take_profit_pct'])
+        results = backtester.calculate_metrics()
+        del prices, ts_ns
+        
+        return {**params, **{key: results.get(key) for key in _SWEEP_METRICS}}
+    finally:
+        prices_shm.close()
+        ts_shm.close()
+
+
 if __name__ == "__main__":
     # Test backtester
     logging.basicConfig(level=logging.INFO)
@@ -483,25 +1021,40 @@ if __name__ == "__main__":
     from utils.feature_engineering import FeatureEngineer
     from model.ai_model import TradingModel
     import os
+    from pathlib import Path
     from dotenv import load_dotenv
     
     load_dotenv()
     
-    # Collect data
-    collector = DataCollector(
-        api_key=os.getenv('BITGET_API_KEY', ''),
-        api_secret=os.getenv('BITGET_API_SECRET', ''),
-        password=os.getenv('BITGET_PASSWORD', ''),
-        testnet=True
-    )
+    symbol, timeframe, limit = 'SOL/USDT:USDT', '5m', 2000
     
-    df = collector.fetch_ohlcv('SOL/USDT:USDT', '5m', 2000)
+    # Feature-engineered data is cached per symbol/timeframe/count so repeated
+    # runs only pay for the backtest itself
+    cache_path = Path('.cache') / f"{symbol.replace('/', '_').replace(':', '_')}_{timeframe}_{limit}.parquet"
     
-    # Extract features
-    engineer = FeatureEngineer()
-    df = engineer.extract_all_features(df)
+    if cache_path.exists():
+        df = pd.read_parquet(cache_path)
+    else:
+        # Collect data
+        collector = DataCollector(
+            api_key=os.getenv('BITGET_API_KEY', ''),
+            api_secret=os.getenv('BITGET_API_SECRET', ''),
+            password=os.getenv('BITGET_PASSWORD', ''),
+            testnet=True
+        )
+        
+        df = collector.fetch_ohlcv(symbol, timeframe, limit)
+        
+        # Extract features
+        engineer = FeatureEngineer()
+        df = engineer.extract_all_features(df)
+        
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache_path)
     
     # Generate signals (dummy for testing - use actual model in production)
+    # Fixed seed keeps runs comparable
+    np.random.seed(0)
     signals = pd.Series(np.random.choice([0, 1], size=len(df)), index=df.index)
     
     # Run backtest
@@ -10,17 +10,30 @@ import subprocess
 import signal
 from multiprocessing import Process
 
+def bot_command():
+    """Command line for the trading bot"""
+    return [sys.executable, "main.py"]
+
+def dashboard_command():
+    """Command line for the dashboard"""
+    host = os.getenv('DASHBOARD_HOST', '0.0.0.0')
+    port = os.getenv('DASHBOARD_PORT', '5000')
+    return [sys.executable, "run_dashboard.py", "--host", host, "--port", port]
+
+def exec_service(command):
+    """Replace this process with the service (it becomes PID 1 and receives signals directly)"""
+    sys.stdout.flush()
+    os.execvp(command[0], command)
+
 def run_bot():
     """Run the trading bot"""
     print("Starting Trading Bot...")
-    subprocess.run([sys.executable, "main.py"])
+    subprocess.run(bot_command())
 
 def run_dashboard():
     """Run the dashboard"""
     print("Starting Dashboard...")
-    host = os.getenv('DASHBOARD_HOST', '0.0.0.0')
-    port = os.getenv('DASHBOARD_PORT', '5000')
-    subprocess.run([sys.executable, "run_dashboard.py", "--host", host, "--port", port])
+    subprocess.run(dashboard_command())
 
 def run_all():
     """Run both bot and dashboard"""
@@ -62,9 +75,12 @@ def run_all():
 if __name__ == "__main__":
     mode = os.getenv('RUN_MODE', 'all')
     
+    # Single service: exec so no supervising interpreter stays resident
     if mode == 'bot':
-        run_bot()
+        print("Starting Trading Bot...")
+        exec_service(bot_command())
     elif mode == 'dashboard':
-        run_dashboard()
+        print("Starting Dashboard...")
+        exec_service(dashboard_command())
     else:
         run_all()
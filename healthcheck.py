@@ -5,18 +5,21 @@ Returns 0 if healthy, 1 if unhealthy
 """
 
 import sys
-import requests
-from datetime import datetime
+import json
+import socket
+from http.client import HTTPConnection
 
 def check_health():
     """Check if the application is healthy"""
+    conn = HTTPConnection('localhost', 5000, timeout=5)
     try:
         # Check dashboard API
-        response = requests.get('http://localhost:5000/api/status', timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
+        conn.request('GET', '/api/status')
+        response = conn.getresponse()
+
+        if response.status == 200:
+            data = json.loads(response.read())
+
             # Check if bot status is available
             if 'bot_status' in data:
                 print(f"✓ Health check passed - Status: {data['bot_status']}")
@@ -25,18 +28,20 @@ def check_health():
                 print("✗ Health check failed - Invalid response format")
                 return 1
         else:
-            print(f"✗ Health check failed - HTTP {response.status_code}")
+            print(f"✗ Health check failed - HTTP {response.status}")
             return 1
-            
-    except requests.exceptions.ConnectionError:
-        print("✗ Health check failed - Cannot connect to dashboard")
-        return 1
-    except requests.exceptions.Timeout:
+
+    except socket.timeout:
         print("✗ Health check failed - Request timeout")
         return 1
+    except ConnectionError:
+        print("✗ Health check failed - Cannot connect to dashboard")
+        return 1
     except Exception as e:
         print(f"✗ Health check failed - {str(e)}")
         return 1
+    finally:
+        conn.close()
 
 if __name__ == '__main__':
     sys.exit(check_health())
@@ -5,15 +5,32 @@ Combines all modules into a complete trading system
 
 import os
 import sys
+import copy
 import time
+import asyncio
 import logging
+import traceback
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import yaml
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
-from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import signal
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import uvloop  # optional: libuv event loop for the scheduler and candle stream
+except ImportError:
+    uvloop = None
+
 # Import bot modules
 from utils.data_collector import DataCollector
 from utils.feature_engineering import FeatureEngineer
@@ -22,6 +39,22 @@ from utils.risk_manager import RiskManager
 from utils.trade_executor import TradeExecutor
 from utils.logger import setup_logger, log_trade, log_signal, log_pnl
 from utils.notifier import TelegramNotifier
+from utils.trade import Trade
+from utils.settings import BotConfig
+
+# Number of candles kept in the rolling OHLCV window
+OHLCV_WINDOW = 500
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Seconds after a candle close before polling, so the exchange has published it
+CANDLE_CLOSE_DELAY = 1.0
+
+
+@functools.cache
+def _load_yaml(path: str, mtime: float) -> Dict:
+    """Parse a YAML file once per (path, mtime); edits invalidate the cache"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 
 class TradingBot:
@@ -39,6 +72,7 @@ class TradingBot:
         """
         # Load configuration
         self.config = self.load_config(config_path)
+        self.cfg = BotConfig.from_dict(self.config)
         self.dry_run = dry_run
         
         # Setup logger
@@ -65,19 +99,45 @@ class TradingBot:
         self.dashboard_data = None
         
         self.setup_components()
+        self._timeframe_seconds = self.data_collector.exchange.parse_timeframe(self.cfg.data.timeframe)
         
         # Bot state
         self.is_running = False
         self.scheduler = None
+        self.loop = None
+        
+        # Rolling OHLCV window (only new candles are fetched each tick)
+        self._ohlcv_cache: Optional[pd.DataFrame] = None
+        self._last_ts: Optional[int] = None
+        self._last_candle_ts = 0  # latest candle already run through the model
+        self._online_ts = None  # latest closed candle committed to the online features
+        
+        # Websocket candle stream (ticks are driven by candle closes)
+        self.use_candle_stream = self.cfg.data.candle_stream
+        self._stream_task: Optional[asyncio.Task] = None
+        self._last_stream_candle = 0.0
+        self._tick_lock = asyncio.Lock()
+        
+        # Repeated identical signals are only notified once per interval
+        telegram_config = self.config.get('notifications', {}).get('telegram', {})
+        self.signal_notify_interval = telegram_config.get('min_interval_s', 0)
+        self._last_signal_sent: Optional[tuple] = None
+        self._last_signal_time = 0.0
+        
+        # Notifications/dashboard updates run off the trading path
+        self._post_trade_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._post_trade_task: Optional[asyncio.Task] = None
+        
+        # Independent REST calls of a tick run concurrently on this pool
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bot-io')
         
         self.logger.info("Trading Bot initialized successfully")
     
     def load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            return config
+            config = _load_yaml(config_path, os.path.getmtime(config_path))
+            return copy.deepcopy(config)
         except Exception as e:
             print(f"Error loading config: {e}")
             sys.exit(1)
@@ -91,7 +151,7 @@ class TradingBot:
                 api_key=os.getenv('BITGET_API_KEY'),
                 api_secret=os.getenv('BITGET_API_SECRET'),
                 password=os.getenv('BITGET_PASSWORD'),
-                testnet=self.config['exchange']['testnet']
+                testnet=self.cfg.testnet
             )
             
             # Feature Engineer
@@ -99,14 +159,16 @@ class TradingBot:
             self.feature_engineer = FeatureEngineer(
                 config=self.config.get('indicators', {})
             )
+            self._feature_cols = self.feature_engineer.feature_columns()
+            self._X_buf = np.empty((1, len(self._feature_cols)), dtype=np.float32)
             
             # AI Model
             self.logger.info("Loading AI Model...")
-            model_type = self.config['ai_model']['type']
+            model_type = self.cfg.ai.type
             self.model = TradingModel(model_type=model_type)
             
             # Try to load pre-trained model
-            model_path = self.config['ai_model'].get('model_path')
+            model_path = self.cfg.ai.model_path
             if model_path and os.path.exists(model_path):
                 self.model.load_model(model_path)
                 self.logger.info(f"Loaded model from {model_path}")
@@ -117,17 +179,17 @@ class TradingBot:
             self.logger.info("Setting up Risk Manager...")
             self.risk_manager = RiskManager(
                 config={
-                    'initial_capital': self.config['trading']['initial_capital'],
-                    'leverage': self.config['trading']['leverage'],
-                    'risk_per_trade': self.config['risk_management']['risk_per_trade'],
-                    'max_loss_per_day': self.config['risk_management']['max_loss_per_day'],
-                    'max_open_positions': self.config['risk_management']['max_open_positions'],
-                    'stop_loss_percent': self.config['risk_management']['stop_loss_percent'],
-                    'take_profit_percent': self.config['risk_management']['take_profit_percent'],
-                    'trailing_stop': self.config['risk_management']['trailing_stop'],
-                    'trailing_stop_percent': self.config['risk_management']['trailing_stop_percent'],
-                    'cooldown_period': self.config['risk_management']['cooldown_period'],
-                    'confidence_threshold': self.config['ai_model']['confidence_threshold']
+                    'initial_capital': self.cfg.trading.initial_capital,
+                    'leverage': self.cfg.trading.leverage,
+                    'risk_per_trade': self.cfg.risk.risk_per_trade,
+                    'max_loss_per_day': self.cfg.risk.max_loss_per_day,
+                    'max_open_positions': self.cfg.risk.max_open_positions,
+                    'stop_loss_percent': self.cfg.risk.stop_loss_percent,
+                    'take_profit_percent': self.cfg.risk.take_profit_percent,
+                    'trailing_stop': self.cfg.risk.trailing_stop,
+                    'trailing_stop_percent': self.cfg.risk.trailing_stop_percent,
+                    'cooldown_period': self.cfg.risk.cooldown_period,
+                    'confidence_threshold': self.cfg.ai.confidence_threshold
                 }
             )
             
@@ -137,13 +199,14 @@ class TradingBot:
                 api_key=os.getenv('BITGET_API_KEY'),
                 api_secret=os.getenv('BITGET_API_SECRET'),
                 password=os.getenv('BITGET_PASSWORD'),
-                testnet=self.config['exchange']['testnet'],
-                dry_run=self.dry_run
+                testnet=self.cfg.testnet,
+                dry_run=self.dry_run,
+                exchange=self.data_collector.exchange
             )
             
             # Set leverage
-            symbol = self.config['trading']['pair']
-            leverage = self.config['trading']['leverage']
+            symbol = self.cfg.trading.pair
+            leverage = self.cfg.trading.leverage
             self.trade_executor.set_leverage(symbol, leverage)
             
             # Telegram Notifier
@@ -152,7 +215,9 @@ class TradingBot:
             self.notifier = TelegramNotifier(
                 bot_token=os.getenv('TELEGRAM_BOT_TOKEN'),
                 chat_id=os.getenv('TELEGRAM_CHAT_ID'),
-                enabled=telegram_config.get('enabled', False)
+                enabled=telegram_config.get('enabled', False),
+                connection_pool_size=telegram_config.get('connection_pool_size', 8),
+                http_version=str(telegram_config.get('http_version', '1.1'))
             )
             
             # Dashboard Data Manager (optional)
@@ -170,33 +235,55 @@ class TradingBot:
             self.logger.error(f"Error setting up components: {e}", exc_info=True)
             raise
     
-    def trading_loop(self):
-        """Main trading loop - runs on schedule"""
+    async def trading_loop(self, candles: Optional[pd.DataFrame] = None):
+        """
+        Main trading loop - runs on schedule or on candle close
+        
+        Args:
+            candles: Newly closed candles from the websocket stream (None = fetch via REST)
+        """
+        async with self._tick_lock:
+            await self._trading_tick(candles)
+    
+    async def _trading_tick(self, candles: Optional[pd.DataFrame] = None):
+        """Run one trading iteration"""
         try:
             self.logger.info("-" * 60)
-            self.logger.info(f"Trading Loop - {datetime.now()}")
+            now = datetime.now()  # single wall-clock read per tick
+            self.logger.info(f"Trading Loop - {now}")
             
-            symbol = self.config['trading']['pair']
-            timeframe = self.config['data_collection']['ohlcv_timeframe']
+            symbol = self.cfg.trading.pair
+            timeframe = self.cfg.data.timeframe
             
-            # 1. Fetch latest data
+            # 1. Fetch latest data (candles + positions in one snapshot)
             self.logger.info(f"Fetching data for {symbol}...")
-            df = self.data_collector.fetch_ohlcv(symbol, timeframe, limit=500)
+            snapshot = await asyncio.to_thread(self.fetch_market_snapshot, symbol, timeframe, candles)
+            df = snapshot['ohlcv']
+            
+            # Check existing positions (also on ticks that skip inference)
+            self.check_open_positions(snapshot['positions'])
+            
+            # Nothing to do until a new closed candle appears (the window holds closed candles only)
+            if self._last_ts == self._last_candle_ts:
+                self.logger.debug("No new candle since last run, skipping")
+                return
+            self._last_candle_ts = self._last_ts
             
-            # 2. Extract features
+            # 2. Extract features (latest candle only, from rolling indicator state)
             self.logger.info("Extracting features...")
-            df = self.feature_engineer.extract_all_features(df)
+            features = self.update_online_features(df)
             
-            # 3. Get latest features for prediction
-            latest_features = df.iloc[-1:]
-            feature_cols = self.feature_engineer.get_feature_columns(df)
-            X = latest_features[feature_cols]
+            # 3. Get latest features for prediction (column set is fixed by the config)
+            self._X_buf[0] = [features[col] for col in self._feature_cols]
+            if np.isnan(self._X_buf).any():
+                self.logger.warning("Not enough candle history for all indicators yet, skipping")
+                return
             
             # 4. Get AI prediction
             self.logger.info("Getting AI prediction...")
-            signal = self.model.get_signal(
-                X, 
-                confidence_threshold=self.config['ai_model']['confidence_threshold']
+            signal = self.model.get_signal_ndarray(
+                self._X_buf, 
+                confidence_threshold=self.cfg.ai.confidence_threshold
             )
             
             log_signal(self.logger, signal)
@@ -206,7 +293,7 @@ class TradingBot:
                 self.dashboard_data.update_signal(signal)
             
             # Send signal notification
-            if self.notifier and signal['signal'] != 'HOLD':
+            if self.notifier and signal['signal'] != 'HOLD' and self._should_notify_signal(signal):
                 self.notifier.notify_signal(signal)
             
             # 5. Check if should execute trade
@@ -221,101 +308,138 @@ class TradingBot:
             
             # 6. Execute trade
             if signal['signal'] == 'BUY':
-                self.execute_long_trade(symbol, current_price, signal)
+                await self.execute_trade('long', symbol, current_price, signal, now)
             elif signal['signal'] == 'SELL':
-                self.execute_short_trade(symbol, current_price, signal)
-            
-            # 7. Check existing positions
-            self.check_open_positions()
+                await self.execute_trade('short', symbol, current_price, signal, now)
             
         except Exception as e:
-            self.logger.error(f"Error in trading loop: {e}", exc_info=True)
+            self._log_exception(e, {'action': 'trading_loop'})
             if self.notifier:
-                self.notifier.notify_error(e, context={'action': 'trading_loop'})
+                self.notifier.notify_error(e, {'action': 'trading_loop'})
     
-    def execute_long_trade(self, symbol: str, current_price: float, signal: Dict):
-        """Execute long position"""
-        try:
-            self.logger.info("Executing LONG trade...")
+    def _should_notify_signal(self, signal: Dict) -> bool:
+        """
+        Suppress a signal notification identical to one sent within the last interval
+        
+        Args:
+            signal: Signal dict
             
-            # Calculate SL and TP
-            stop_loss = self.risk_manager.calculate_stop_loss(current_price, 'long')
-            take_profit = self.risk_manager.calculate_take_profit(current_price, 'long')
+        Returns:
+            True if the notification should be sent
+        """
+        key = (signal['signal'], round(signal['confidence'], 2))
+        now = time.monotonic()
+        
+        if key == self._last_signal_sent and now - self._last_signal_time < self.signal_notify_interval:
+            self.logger.debug(f"Skipping repeated {key[0]} signal notification")
+            return False
+        
+        self._last_signal_sent = key
+        self._last_signal_time = now
+        return True
+    
+    def fetch_market_snapshot(self, symbol: str, timeframe: str,
+                              candles: Optional[pd.DataFrame] = None) -> Dict:
+        """
+        Fetch new candles and open positions, merging candles into the rolling window
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            candles: Candles already received from the stream (skips the REST candle fetch)
             
-            # Calculate position size
-            position_size, position_value = self.risk_manager.calculate_position_size(
-                current_price, stop_loss, 'long'
+        Returns:
+            Snapshot dict with 'ohlcv' holding the latest OHLCV_WINDOW candles
+        """
+        if candles is not None and self._ohlcv_cache is not None:
+            snapshot = {
+                'ohlcv': candles,
+                'positions': self.data_collector.get_positions(symbol),
+                'balance': None
+            }
+        else:
+            # Re-fetch from the last known candle, it may still have been forming
+            snapshot = self.data_collector.fetch_snapshot(
+                symbol, timeframe, limit=OHLCV_WINDOW, since=self._last_ts,
+                executor=self._io_pool
             )
+            # Keep closed candles only, so a tick acts on the candle that just
+            # closed (as with the stream) rather than on the one that just opened
+            ohlcv = snapshot['ohlcv']
+            cutoff = pd.Timestamp(time.time() - self._timeframe_seconds, unit='s')
+            snapshot['ohlcv'] = ohlcv[ohlcv.index <= cutoff]
+        snapshot['ohlcv'] = self.update_ohlcv_cache(snapshot['ohlcv'])
+        return snapshot
+    
+    def update_ohlcv_cache(self, new: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merge freshly fetched candles into the rolling OHLCV window
+        
+        Args:
+            new: Candles since the last fetch
             
-            if position_size <= 0:
-                self.logger.warning("Invalid position size, trade cancelled")
-                return
-            
-            # Open position with SL/TP
-            result = self.trade_executor.open_position_with_sl_tp(
-                symbol=symbol,
-                side='long',
-                amount=position_size,
-                stop_loss=stop_loss,
-                take_profit=take_profit
-            )
+        Returns:
+            DataFrame with the latest OHLCV_WINDOW candles
+        """
+        if self._ohlcv_cache is None:
+            df = new.tail(OHLCV_WINDOW)
+        else:
+            df = pd.concat([self._ohlcv_cache, new])
+            df = df[~df.index.duplicated(keep='last')].tail(OHLCV_WINDOW)
+        
+        self._ohlcv_cache = df
+        self._last_ts = int(df.index[-1].timestamp() * 1000)
+        return df
+    
+    def update_online_features(self, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Commit newly closed candles to the online features and compute the latest one
+        
+        The window only holds closed candles. The last one is evaluated without
+        being committed; it is committed on a later tick once newer candles
+        follow it.
+        
+        Args:
+            df: Rolling OHLCV window
             
-            if result['success']:
-                trade_info = {
-                    'symbol': symbol,
-                    'side': 'LONG',
-                    'amount': position_size,
-                    'entry_price': current_price,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'confidence': signal['confidence'],
-                    'timestamp': datetime.now()
-                }
-                
-                # Log and notify
-                log_trade(self.logger, trade_info)
-                if self.notifier:
-                    self.notifier.notify_trade(trade_info)
-                
-                # Update dashboard
-                if self.dashboard_data:
-                    self.dashboard_data.add_trade({
-                        'side': 'long',
-                        'entry_price': current_price,
-                        'entry_timestamp': datetime.now().isoformat(),
-                        'size': position_size
-                    })
-                    current_capital = self.risk_manager.current_capital
-                    self.dashboard_data.update_capital(current_capital)
-                    self.dashboard_data.update_equity(current_capital)
-                
-                # Update risk manager
-                self.risk_manager.add_position({
-                    'id': result['entry_order']['id'],
-                    'side': 'long',
-                    'entry_price': current_price,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'size': position_size
-                })
-            else:
-                self.logger.error(f"Failed to open position: {result.get('error')}")
-                
-        except Exception as e:
-            self.logger.error(f"Error executing long trade: {e}", exc_info=True)
+        Returns:
+            Feature dict for the last candle
+        """
+        closed = df.iloc[:-1]
+        # First run, or the window no longer overlaps the committed history
+        if self._online_ts is None or len(closed) == 0 or self._online_ts < closed.index[0]:
+            self.feature_engineer.prime(closed)
+        else:
+            new = closed[closed.index > self._online_ts]
+            for bar in new[OHLCV_COLUMNS].to_numpy(dtype=np.float64):
+                self.feature_engineer.update(bar)
+        if len(closed):
+            self._online_ts = closed.index[-1]
+        
+        return self.feature_engineer.update(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)[-1], commit=False)
     
-    def execute_short_trade(self, symbol: str, current_price: float, signal: Dict):
-        """Execute short position"""
+    async def execute_trade(self, side: str, symbol: str, current_price: float, signal: Dict,
+                            now: Optional[datetime] = None):
+        """
+        Open a position with SL/TP
+        
+        Args:
+            side: 'long' or 'short'
+            symbol: Trading pair
+            current_price: Current market price
+            signal: Signal dict that triggered the trade
+            now: Tick time recorded as the trade timestamp (default: current time)
+        """
         try:
-            self.logger.info("Executing SHORT trade...")
+            self.logger.info(f"Executing {side.upper()} trade...")
             
             # Calculate SL and TP
-            stop_loss = self.risk_manager.calculate_stop_loss(current_price, 'short')
-            take_profit = self.risk_manager.calculate_take_profit(current_price, 'short')
+            stop_loss = self.risk_manager.calculate_stop_loss(current_price, side)
+            take_profit = self.risk_manager.calculate_take_profit(current_price, side)
             
             # Calculate position size
             position_size, position_value = self.risk_manager.calculate_position_size(
-                current_price, stop_loss, 'short'
+                current_price, stop_loss, side
             )
             
             if position_size <= 0:
@@ -323,64 +447,94 @@ class TradingBot:
                 return
             
             # Open position with SL/TP
-            result = self.trade_executor.open_position_with_sl_tp(
+            result = await asyncio.to_thread(
+                self.trade_executor.open_position_with_sl_tp,
                 symbol=symbol,
-                side='short',
+                side=side,
                 amount=position_size,
                 stop_loss=stop_loss,
                 take_profit=take_profit
             )
             
             if result['success']:
-                trade_info = {
-                    'symbol': symbol,
-                    'side': 'SHORT',
-                    'amount': position_size,
-                    'entry_price': current_price,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'confidence': signal['confidence'],
-                    'timestamp': datetime.now()
-                }
+                trade = Trade(
+                    symbol=symbol,
+                    side=side,
+                    amount=position_size,
+                    entry_price=current_price,
+                    stop_loss=stop_loss,
+                    take_profit=take_profit,
+                    confidence=signal['confidence'],
+                    timestamp=now or datetime.now(),
+                    order_id=result['entry_order']['id']
+                )
                 
-                # Log and notify
-                log_trade(self.logger, trade_info)
-                if self.notifier:
-                    self.notifier.notify_trade(trade_info)
+                # Log and update risk manager
+                log_trade(self.logger, trade)
+                self.risk_manager.add_position(trade)
                 
-                # Update dashboard
-                if self.dashboard_data:
-                    self.dashboard_data.add_trade({
-                        'side': 'short',
-                        'entry_price': current_price,
-                        'entry_timestamp': datetime.now().isoformat(),
-                        'size': position_size
-                    })
-                    current_capital = self.risk_manager.current_capital
-                    self.dashboard_data.update_capital(current_capital)
-                    self.dashboard_data.update_equity(current_capital)
-                
-                # Update risk manager
-                self.risk_manager.add_position({
-                    'id': result['entry_order']['id'],
-                    'side': 'short',
-                    'entry_price': current_price,
-                    'stop_loss': stop_loss,
-                    'take_profit': take_profit,
-                    'size': position_size
-                })
+                # Notify and update dashboard in the background
+                try:
+                    self._post_trade_queue.put_nowait(trade)
+                except asyncio.QueueFull:
+                    self.logger.warning("Post-trade queue full, skipping notification/dashboard update")
             else:
                 self.logger.error(f"Failed to open position: {result.get('error')}")
                 
         except Exception as e:
-            self.logger.error(f"Error executing short trade: {e}", exc_info=True)
+            self._log_exception(e, {'action': f'execute_{side}_trade'})
     
-    def check_open_positions(self):
-        """Check and manage open positions"""
+    def _log_exception(self, exc: Exception, context: Dict):
+        """
+        Log an exception now and format its traceback on the I/O pool
+        
+        Args:
+            exc: Exception that was caught
+            context: Dict describing where it happened (e.g. {'action': 'trading_loop'})
+        """
+        action = context.get('action', 'unknown')
+        self.logger.error(f"Error in {action}: {exc!r}")
+        
+        def log_traceback():
+            tb = ''.join(traceback.format_exception(exc))
+            self.logger.error(f"Traceback for error in {action}:\n{tb}")
+        
+        try:
+            self._io_pool.submit(log_traceback)
+        except RuntimeError:  # pool already shut down
+            log_traceback()
+    
+    async def _drain_post_trade(self):
+        """Send notifications and dashboard updates for executed trades"""
+        while True:
+            trade = await self._post_trade_queue.get()
+            try:
+                # The notifier only queues the message, so it needs no worker thread
+                if self.notifier:
+                    self.notifier.notify_trade(trade)
+                if self.dashboard_data:
+                    await asyncio.to_thread(self._record_trade_on_dashboard, trade)
+            except Exception as e:
+                self.logger.error(f"Error in post-trade update: {e}")
+            finally:
+                self._post_trade_queue.task_done()
+    
+    def _record_trade_on_dashboard(self, trade: Trade):
+        """Add an executed trade and the current capital to the dashboard"""
+        self.dashboard_data.add_trade(trade)
+        current_capital = self.risk_manager.current_capital
+        pnl = current_capital - self.risk_manager.initial_capital
+        self.dashboard_data.update_capital(current_capital, pnl)
+        self.dashboard_data.update_equity(current_capital)
+    
+    def check_open_positions(self, positions: List[Dict]):
+        """
+        Check and manage open positions
+        
+        Args:
+            positions: Open positions from the tick's market snapshot
+        """
         try:
-            symbol = self.config['trading']['pair']
-            positions = self.trade_executor.get_positions(symbol)
-            
             if positions:
                 self.logger.info(f"Open positions: {len(positions)}")
                 
@@ -393,7 +547,47 @@ class TradingBot:
                     self.dashboard_data.update_risk_metrics(risk_metrics)
                 
         except Exception as e:
-            self.logger.error(f"Error checking positions: {e}", exc_info=True)
+            self._log_exception(e, {'action': 'check_open_positions'})
+    
+    async def on_candle_close(self, candles: pd.DataFrame):
+        """Run a trading iteration as soon as the stream reports a closed candle"""
+        self._last_stream_candle = time.monotonic()
+        await self.trading_loop(candles)
+    
+    async def stream_watchdog(self):
+        """Restart a dead candle stream and fall back to REST if it goes quiet"""
+        symbol = self.cfg.trading.pair
+        timeframe = self.cfg.data.timeframe
+        
+        if self._stream_task is None or self._stream_task.done():
+            self.logger.warning("Candle stream not running, restarting it")
+            self._stream_task = asyncio.create_task(
+                self.data_collector.start_candle_stream(symbol, timeframe, self.on_candle_close)
+            )
+        
+        stale_after = 2 * self._timeframe_seconds
+        if time.monotonic() - self._last_stream_candle > stale_after:
+            self.logger.warning("No closed candle from stream recently, polling via REST")
+            await self.trading_loop()
+    
+    async def scheduled_tick(self):
+        """Run a trading iteration, then schedule the next one just after the next candle close"""
+        try:
+            await self.trading_loop()
+        finally:
+            if self.scheduler and self.scheduler.running:
+                tf = self._timeframe_seconds
+                next_close = (time.time() // tf + 1) * tf
+                next_run = datetime.fromtimestamp(next_close + CANDLE_CLOSE_DELAY)
+                self.scheduler.add_job(
+                    self.scheduled_tick,
+                    'date',
+                    run_date=next_run,
+                    id='trading_loop',
+                    replace_existing=True,
+                    misfire_grace_time=tf
+                )
+                self.logger.debug(f"Next trading loop at {next_run}")
     
     def start(self):
         """Start the trading bot"""
@@ -405,8 +599,9 @@ class TradingBot:
             # Update dashboard status
             if self.dashboard_data:
                 self.dashboard_data.update_bot_status('running')
-                initial_capital = self.config['trading']['initial_capital']
-                self.dashboard_data.update_capital(initial_capital)
+                initial_capital = self.cfg.trading.initial_capital
+                self.dashboard_data.set_initial_capital(initial_capital)
+                self.dashboard_data.update_capital(initial_capital, 0.0)
                 self.dashboard_data.update_equity(initial_capital)
             
             # Send start notification
@@ -415,31 +610,61 @@ class TradingBot:
             
             self.is_running = True
             
-            # Setup scheduler
-            self.scheduler = BlockingScheduler()
-            
-            # Schedule trading loop
-            interval = self.config['trading']['interval']  # seconds
-            self.scheduler.add_job(
-                self.trading_loop,
-                'interval',
-                seconds=interval,
-                id='trading_loop'
-            )
-            
-            self.logger.info(f"Bot scheduled to run every {interval} seconds")
+            # Setup event loop and scheduler
+            self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self.scheduler = AsyncIOScheduler(event_loop=self.loop)
+            
+            # With the candle stream enabled ticks are event-driven and an
+            # interval job only watches over the stream. Otherwise each tick
+            # schedules the next one right after the following candle close.
+            if self.use_candle_stream:
+                interval = self.cfg.trading.interval  # seconds
+                self.scheduler.add_job(
+                    self.stream_watchdog,
+                    'interval',
+                    seconds=interval,
+                    id='stream_watchdog',
+                    max_instances=1,
+                    coalesce=True,
+                    misfire_grace_time=interval
+                )
+                self.logger.info(f"Bot runs on candle close (watchdog every {interval} seconds)")
+            else:
+                self.logger.info(f"Bot scheduled to run after every {self.cfg.data.timeframe} candle close")
             
-            # Run immediately
-            self.trading_loop()
+            # Handle graceful shutdown
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                self.loop.add_signal_handler(sig, self.stop)
             
-            # Start scheduler
+            # Start scheduler and run immediately (seeds the OHLCV window via REST)
             self.scheduler.start()
+            self._post_trade_task = self.loop.create_task(self._drain_post_trade())
+            if self.use_candle_stream:
+                self.loop.create_task(self.trading_loop())
+                self._last_stream_candle = time.monotonic()
+                self._stream_task = self.loop.create_task(
+                    self.data_collector.start_candle_stream(
+                        self.cfg.trading.pair,
+                        self.cfg.data.timeframe,
+                        self.on_candle_close
+                    )
+                )
+            else:
+                self.loop.create_task(self.scheduled_tick())
+            self.loop.run_forever()
             
         except (KeyboardInterrupt, SystemExit):
             self.stop()
+        finally:
+            if self.loop:
+                self.loop.close()
     
     def stop(self):
         """Stop the trading bot"""
+        if not self.is_running:
+            return
+        
         self.logger.info("=" * 60)
         self.logger.info("STOPPING TRADING BOT")
         self.logger.info("=" * 60)
@@ -450,12 +675,22 @@ class TradingBot:
         if self.dashboard_data:
             self.dashboard_data.update_bot_status('stopped')
         
-        if self.scheduler:
-            self.scheduler.shutdown()
+        if self.scheduler and self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        
+        for task in (self._stream_task, self._post_trade_task):
+            if task and not task.done():
+                task.cancel()
+        
+        self._io_pool.shutdown(wait=False)
         
         # Send stop notification
         if self.notifier:
             self.notifier.notify_stop("User stopped")
+            self.notifier.close()
+        
+        if self.loop and self.loop.is_running():
+            self.loop.stop()
         
         self.logger.info("Bot stopped successfully")
 
@@ -473,16 +708,7 @@ def main():
     # Create bot instance
     bot = TradingBot(config_path=args.config, dry_run=args.dry_run)
     
-    # Handle graceful shutdown
-    def signal_handler(sig, frame):
-        print("\nShutdown signal received...")
-        bot.stop()
-        sys.exit(0)
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
-    # Start bot
+    # Start bot (shutdown signals are handled by the bot's event loop)
     bot.start()
 
 
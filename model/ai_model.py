@@ -5,19 +5,145 @@ Machine learning models for trading signal prediction
 
 import pandas as pd
 import numpy as np
+import os
 import logging
-from typing import Dict, Tuple, Optional
+import functools
+from typing import Dict, Tuple, Optional, Union
 import joblib
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
 import xgboost as xgb
 
+from utils._njit import njit
+
+# Optional ONNX Runtime inference (export also needs skl2onnx / onnxmltools)
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    _HAS_ORT = True
+except ImportError:
+    _HAS_ORT = False
+
+
+# (prediction, confident) -> signal; class 2 is the ternary buy label
+_SIGNAL_TABLE = {
+    (0, True): 'SELL', (0, False): 'HOLD',
+    (1, True): 'BUY', (1, False): 'HOLD',
+    (2, True): 'BUY', (2, False): 'BUY',
+}
+
+# XGBoost's own serialization: compact and loaded without unpickling
+_XGB_NATIVE_EXTS = ('.ubj', '.json')
+
+
+@functools.lru_cache(maxsize=None)
+def _cuda_available() -> bool:
+    """
+    Whether a CUDA device is present (XGBoost then trains on the GPU)
+    
+    Probed on first use when training, not at import, so inference-only
+    processes never initialize the CUDA runtime (which must not happen
+    before a fork).
+    """
+    try:
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cuml():
+    """(cudf, cuML RandomForestClassifier) when RAPIDS and a CUDA device are available, else None"""
+    if not _cuda_available():
+        return None
+    try:
+        import cudf
+        from cuml.ensemble import RandomForestClassifier as cuRF
+    except ImportError:
+        return None
+    return cudf, cuRF
+
+
+def _drop_feature_names(model):
+    """
+    Forget the column names a scikit-learn estimator was fitted with
+    
+    Predictions pass bare ndarrays, which scikit-learn would otherwise warn
+    about on every call for models fitted on DataFrames.
+    """
+    if 'feature_names_in_' in vars(model):
+        del model.feature_names_in_
+    return model
+
+
+@functools.lru_cache(maxsize=8)
+def _load_estimator(filepath: str, mtime: float):
+    """
+    Load a saved estimator once per (path, mtime)
+    
+    XGBoost models in the native UBJ/JSON format are parsed straight into a
+    booster. For pickles, numpy arrays (e.g. tree node tables) are
+    memory-mapped read-only, so they are paged in on demand and shared
+    through the OS page cache with any other process loading the same file.
+    """
+    if filepath.endswith(_XGB_NATIVE_EXTS):
+        model = xgb.XGBClassifier()
+        model.load_model(filepath)
+        return model
+    return _drop_feature_names(joblib.load(filepath, mmap_mode='r'))
+
+
+@njit(cache=True)
+def _ternary_labels(close, future_bars, threshold):
+    """0 = sell, 1 = hold, 2 = buy from the forward price change in one scan"""
+    n = len(close) - future_bars
+    labels = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        change = (close[i + future_bars] - close[i]) / close[i]
+        labels[i] = 2 if change > threshold else (0 if change < -threshold else 1)
+    return labels
+
+
+def prepare_labels(df: pd.DataFrame, method: str = 'binary',
+                   future_bars: int = 1, threshold: float = 0.001) -> pd.Series:
+    """
+    Prepare target labels for training
+    
+    Args:
+        df: DataFrame with price data
+        method: 'binary' (up/down) or 'ternary' (buy/sell/hold)
+        future_bars: How many bars ahead to predict
+        threshold: Minimum price change to consider (for ternary)
+        
+    Returns:
+        Series with labels (0, 1) or (0, 1, 2)
+    """
+    # Last bars have no future data and get no label
+    close = df['close'].to_numpy(dtype=np.float64)
+    n = len(close) - future_bars
+    
+    if method == 'binary':
+        # 0: down, 1: up
+        price_change = (close[future_bars:] - close[:n]) / close[:n]
+        labels = (price_change > 0).view(np.int8)
+        
+    elif method == 'ternary':
+        # 0: sell (down), 1: hold (neutral), 2: buy (up)
+        labels = _ternary_labels(close, future_bars, threshold)
+        
+    else:
+        raise ValueError(f"Unknown label method: {method}")
+    
+    return pd.Series(labels, index=df.index[:n])
+
 
 class TradingModel:
     """
     Base class for trading AI models
-    Supports multiple model types: Logistic Regression, Random Forest, XGBoost
+    Supports multiple model types: Logistic Regression, Random Forest, XGBoost,
+    Histogram Gradient Boosting
     """
     
     def __init__(self, model_type: str = 'xgboost', config: Optional[Dict] = None):
@@ -25,7 +151,7 @@ class TradingModel:
         Initialize trading model
         
         Args:
-            model_type: 'logistic', 'random_forest', or 'xgboost'
+            model_type: 'logistic', 'random_forest', 'xgboost', or 'hist_gbm'
             config: Model configuration parameters
         """
         self.logger = logging.getLogger(__name__)
@@ -33,6 +159,8 @@ class TradingModel:
         self.config = config or self._default_config()
         self.model = None
         self.feature_importance = None
+        self.on_gpu = False
+        self._ort_session = None
         
         self._init_model()
     
@@ -48,35 +176,61 @@ class TradingModel:
                 'n_estimators': 100,
                 'max_depth': 10,
                 'random_state': 42,
-                'n_jobs': -1
+                'n_jobs': -1,
+                'use_gpu_rf': False
             },
             'xgboost': {
                 'n_estimators': 100,
                 'max_depth': 6,
                 'learning_rate': 0.1,
                 'objective': 'binary:logistic',
+                'tree_method': 'hist',
+                'max_bin': 256,
                 'random_state': 42,
-                'n_jobs': -1
+                'n_jobs': -1  # 'device' unset: CUDA is used if present when training
+            },
+            'hist_gbm': {
+                'max_iter': 200,
+                'max_depth': 8,
+                'learning_rate': 0.1,
+                'early_stopping': True,
+                'validation_fraction': 0.1,
+                'random_state': 42
             }
         }
     
     def _init_model(self):
         """Initialize the selected model"""
         try:
-            config = self.config.get(self.model_type, {})
+            config = dict(self.config.get(self.model_type, {}))
             
             if self.model_type == 'logistic':
                 self.model = LogisticRegression(**config)
                 self.logger.info("Initialized Logistic Regression model")
                 
             elif self.model_type == 'random_forest':
-                self.model = RandomForestClassifier(**config)
-                self.logger.info("Initialized Random Forest model")
+                use_gpu = config.pop('use_gpu_rf', False)
+                cuml = _load_cuml() if use_gpu else None
+                if cuml is not None:
+                    config.pop('n_jobs', None)
+                    self.model = cuml[1](n_streams=4, **config)
+                    self.on_gpu = True
+                    self.logger.info("Initialized Random Forest model (cuML, GPU)")
+                else:
+                    if use_gpu:
+                        self.logger.warning("cuML/CUDA not available, using CPU Random Forest")
+                    self.model = RandomForestClassifier(**config)
+                    self.logger.info("Initialized Random Forest model")
                 
             elif self.model_type == 'xgboost':
                 self.model = xgb.XGBClassifier(**config)
                 self.logger.info("Initialized XGBoost model")
                 
+            elif self.model_type == 'hist_gbm':
+                # Multithreaded via OpenMP (OMP_NUM_THREADS), no GPU needed
+                self.model = HistGradientBoostingClassifier(**config)
+                self.logger.info("Initialized Histogram Gradient Boosting model")
+                
             else:
                 raise ValueError(f"Unknown model type: {self.model_type}")
                 
@@ -86,65 +240,62 @@ class TradingModel:
     
     def prepare_labels(self, df: pd.DataFrame, method: str = 'binary', 
                       future_bars: int = 1, threshold: float = 0.001) -> pd.Series:
-        """
-        Prepare target labels for training
-        
-        Args:
-            df: DataFrame with price data
-            method: 'binary' (up/down) or 'ternary' (buy/sell/hold)
-            future_bars: How many bars ahead to predict
-            threshold: Minimum price change to consider (for ternary)
-            
-        Returns:
-            Series with labels (0, 1) or (0, 1, 2)
-        """
+        """Prepare target labels for training (see module-level prepare_labels)"""
         try:
-            future_price = df['close'].shift(-future_bars)
-            price_change = (future_price - df['close']) / df['close']
-            
-            if method == 'binary':
-                # 0: down, 1: up
-                labels = (price_change > 0).astype(int)
-                
-            elif method == 'ternary':
-                # 0: sell (down), 1: hold (neutral), 2: buy (up)
-                labels = pd.Series(1, index=df.index)  # Default: hold
-                labels[price_change > threshold] = 2  # Buy
-                labels[price_change < -threshold] = 0  # Sell
-                
-            else:
-                raise ValueError(f"Unknown label method: {method}")
-            
-            # Remove last bars (no future data)
-            labels = labels[:-future_bars]
-            
-            self.logger.debug(f"Prepared {method} labels: {labels.value_counts().to_dict()}")
+            labels = prepare_labels(df, method, future_bars, threshold)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Prepared {method} labels: {labels.value_counts().to_dict()}")
             return labels
             
         except Exception as e:
             self.logger.error(f"Error preparing labels: {e}")
             raise
     
-    def train(self, X_train: pd.DataFrame, y_train: pd.Series) -> Dict:
+    def train(self, X_train: Union[pd.DataFrame, np.ndarray], y_train: Union[pd.Series, np.ndarray],
+              feature_names: Optional[list] = None, eval_set: Optional[Tuple] = None,
+              early_stopping_rounds: int = 50) -> Dict:
         """
         Train the model
         
         Args:
-            X_train: Training features
+            X_train: Training features (DataFrame or array)
             y_train: Training labels
+            feature_names: Column names when X_train is an array
+            eval_set: Optional (X_val, y_val); XGBoost stops boosting once the
+                validation loss hasn't improved for early_stopping_rounds
+            early_stopping_rounds: Patience for XGBoost early stopping
             
         Returns:
-            Training metrics dict
+            Training metrics dict (with 'best_iteration' and 'val_<metric>'
+            when XGBoost was early-stopped)
         """
         try:
             self.logger.info(f"Training {self.model_type} model...")
             self.logger.info(f"Training data shape: X={X_train.shape}, y={y_train.shape}")
             
-            # Train model
-            self.model.fit(X_train, y_train)
-            
-            # Get predictions
-            y_pred = self.model.predict(X_train)
+            # Train XGBoost on the GPU unless the config pins a device
+            if (self.model_type == 'xgboost' and 'device' not in self.config.get('xgboost', {})
+                    and _cuda_available()):
+                self.model.set_params(device='cuda')
+            
+            # Train model (cuML wants device-resident float32 data)
+            if self.on_gpu:
+                cudf = _load_cuml()[0]
+                X_fit = cudf.DataFrame(np.asarray(X_train, dtype=np.float32))
+                y_fit = cudf.Series(np.asarray(y_train))
+                self.model.fit(X_fit, y_fit)
+                y_pred = self.model.predict(X_fit).to_numpy()
+            elif self.model_type == 'xgboost' and eval_set is not None:
+                # Only for this fit: a later fit without eval_set would fail with it set
+                self.model.set_params(early_stopping_rounds=early_stopping_rounds)
+                try:
+                    self.model.fit(X_train, y_train, eval_set=[eval_set], verbose=False)
+                finally:
+                    self.model.set_params(early_stopping_rounds=None)
+                y_pred = self.predict_batch(self._as_array(X_train))
+            else:
+                _drop_feature_names(self.model.fit(X_train, y_train))
+                y_pred = self.predict_batch(self._as_array(X_train))
             
             # Calculate metrics
             metrics = {
@@ -154,12 +305,18 @@ class TradingModel:
                 'f1': f1_score(y_train, y_pred, average='weighted', zero_division=0)
             }
             
-            # Feature importance
+            if self.model_type == 'xgboost' and eval_set is not None:
+                best = self.model.best_iteration
+                metrics['best_iteration'] = best
+                for name, values in self.model.evals_result()['validation_0'].items():
+                    metrics[f'val_{name}'] = values[best]
+            
+            # Feature importance (training column order; ranked on demand)
             if hasattr(self.model, 'feature_importances_'):
                 self.feature_importance = pd.DataFrame({
-                    'feature': X_train.columns,
+                    'feature': X_train.columns if feature_names is None else feature_names,
                     'importance': self.model.feature_importances_
-                }).sort_values('importance', ascending=False)
+                })
             
             self.logger.info(f"Training complete. Metrics: {metrics}")
             return metrics
@@ -182,7 +339,7 @@ class TradingModel:
         try:
             self.logger.info("Evaluating model...")
             
-            y_pred = self.model.predict(X_test)
+            y_pred = self.predict_batch(self._as_array(X_test))
             
             metrics = {
                 'accuracy': accuracy_score(y_test, y_pred),
@@ -201,6 +358,46 @@ class TradingModel:
             self.logger.error(f"Error evaluating model: {e}")
             raise
     
+    @staticmethod
+    def _as_array(X) -> np.ndarray:
+        """Convert a feature row/frame to a C-contiguous float32 (n_samples, n_features) array"""
+        if isinstance(X, pd.Series):
+            return np.ascontiguousarray(X.to_numpy(dtype=np.float32)).reshape(1, -1)
+        if isinstance(X, pd.DataFrame):
+            return np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+        return X
+    
+    def predict_batch(self, X_np: np.ndarray) -> np.ndarray:
+        """
+        Predict classes for a pre-converted feature array
+        
+        Dense float32 arrays let XGBoost predict in place from the booster
+        without building a DMatrix per call.
+        
+        Args:
+            X_np: float32 C-contiguous array of shape (n_samples, n_features)
+            
+        Returns:
+            Array of predicted classes
+        """
+        if self._ort_session is not None:
+            return self._ort_session.run([self._ort_label], {self._ort_input: X_np})[0]
+        return self.model.predict(X_np)
+    
+    def predict_proba_batch(self, X_np: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a pre-converted feature array
+        
+        Args:
+            X_np: float32 C-contiguous array of shape (n_samples, n_features)
+            
+        Returns:
+            Array of shape (n_samples, n_classes)
+        """
+        if self._ort_session is not None:
+            return self._ort_session.run([self._ort_proba], {self._ort_input: X_np})[0]
+        return self.model.predict_proba(X_np)
+    
     def predict(self, X: pd.DataFrame) -> int:
         """
         Make prediction for single sample
@@ -212,11 +409,7 @@ class TradingModel:
             Predicted class (0 or 1 or 2)
         """
         try:
-            if isinstance(X, pd.Series):
-                X = X.to_frame().T
-            
-            prediction = self.model.predict(X)[0]
-            return int(prediction)
+            return int(self.predict_batch(self._as_array(X))[0])
             
         except Exception as e:
             self.logger.error(f"Error making prediction: {e}")
@@ -233,11 +426,7 @@ class TradingModel:
             Array of probabilities for each class
         """
         try:
-            if isinstance(X, pd.Series):
-                X = X.to_frame().T
-            
-            probas = self.model.predict_proba(X)[0]
-            return probas
+            return self.predict_proba_batch(self._as_array(X))[0]
             
         except Exception as e:
             self.logger.error(f"Error getting prediction probabilities: {e}")
@@ -255,41 +444,71 @@ class TradingModel:
             Dict with signal, confidence, and probabilities
         """
         try:
+            # Labels are 0..n_classes-1, so the predicted class is the argmax
             probas = self.predict_proba(X)
-            prediction = self.predict(X)
-            confidence = probas[prediction]
-            
-            # Map prediction to signal
-            if prediction == 1:
-                signal = 'BUY' if confidence >= confidence_threshold else 'HOLD'
-            elif prediction == 0:
-                signal = 'SELL' if confidence >= confidence_threshold else 'HOLD'
-            elif prediction == 2:  # Ternary classification
-                signal = 'BUY'
-            else:
-                signal = 'HOLD'
+            prediction = int(probas.argmax())
+            return self._build_signal(probas, prediction, confidence_threshold)
             
-            return {
-                'signal': signal,
-                'confidence': float(confidence),
-                'probabilities': probas.tolist(),
-                'prediction': int(prediction)
-            }
+        except Exception as e:
+            self.logger.error(f"Error getting signal: {e}")
+            raise
+    
+    def get_signal_ndarray(self, x: np.ndarray, confidence_threshold: float = 0.6) -> Dict:
+        """
+        Get trading signal for a raw feature array, skipping pandas conversion
+        
+        Args:
+            x: Features as a (1, n_features) array, columns in training order
+            confidence_threshold: Minimum confidence to generate signal
+            
+        Returns:
+            Dict with signal, confidence, and probabilities
+        """
+        try:
+            probas = self.predict_proba_batch(x)[0]
+            prediction = int(probas.argmax())
+            return self._build_signal(probas, prediction, confidence_threshold)
             
         except Exception as e:
             self.logger.error(f"Error getting signal: {e}")
             raise
     
-    def save_model(self, filepath: str):
+    def _build_signal(self, probas: np.ndarray, prediction: int, confidence_threshold: float) -> Dict:
+        """Map class probabilities and prediction to a signal dict"""
+        confidence = probas[prediction]
+        signal = _SIGNAL_TABLE.get((prediction, bool(confidence >= confidence_threshold)), 'HOLD')
+        
+        return {
+            'signal': signal,
+            'confidence': float(confidence),
+            'probabilities': probas.tolist(),
+            'prediction': int(prediction)
+        }
+    
+    def save_model(self, filepath: str) -> str:
         """
         Save trained model to file
         
+        XGBoost models are written in XGBoost's native UBJ format (the
+        extension is switched to .ubj unless .ubj/.json is given); other
+        models are pickled with joblib.
+        
         Args:
             filepath: Path to save model
+            
+        Returns:
+            Path the model was written to
         """
         try:
-            joblib.dump(self.model, filepath)
+            if self.model_type == 'xgboost':
+                if not filepath.endswith(_XGB_NATIVE_EXTS):
+                    filepath = os.path.splitext(filepath)[0] + '.ubj'
+                self.model.save_model(filepath)
+            else:
+                # Uncompressed so the arrays can be memory-mapped on load
+                joblib.dump(self.model, filepath, compress=0)
             self.logger.info(f"Model saved to {filepath}")
+            return filepath
             
         except Exception as e:
             self.logger.error(f"Error saving model: {e}")
@@ -299,17 +518,90 @@ class TradingModel:
         """
         Load trained model from file
         
+        The loaded estimator is shared by all TradingModel instances in this
+        process that load the same file; train a fresh instance rather than
+        refitting a loaded one.
+        
         Args:
             filepath: Path to load model from
         """
         try:
-            self.model = joblib.load(filepath)
+            if filepath.endswith('.onnx'):
+                self.load_onnx(filepath)
+                return
+            
+            self.model = _load_estimator(filepath, os.path.getmtime(filepath))
             self.logger.info(f"Model loaded from {filepath}")
             
         except Exception as e:
             self.logger.error(f"Error loading model: {e}")
             raise
     
+    def export_quantized_onnx(self, filepath: str) -> str:
+        """
+        Export the trained model to ONNX with int8 dynamic quantization
+        
+        Linear/MatMul weights (logistic regression) are quantized to int8;
+        tree ensemble operators are exported as-is.
+        
+        Args:
+            filepath: Path of the quantized .onnx file
+            
+        Returns:
+            Path the model was written to
+        """
+        try:
+            if not _HAS_ORT:
+                raise ImportError("onnxruntime is required for ONNX export")
+            
+            n_features = self.model.n_features_in_
+            if self.model_type == 'xgboost':
+                from onnxmltools import convert_xgboost
+                from onnxmltools.convert.common.data_types import FloatTensorType
+                onnx_model = convert_xgboost(
+                    self.model, initial_types=[('input', FloatTensorType([None, n_features]))]
+                )
+            else:
+                from skl2onnx import convert_sklearn
+                from skl2onnx.common.data_types import FloatTensorType
+                onnx_model = convert_sklearn(
+                    self.model, initial_types=[('input', FloatTensorType([None, n_features]))],
+                    options={id(self.model): {'zipmap': False}}
+                )
+            
+            fp32_path = os.path.splitext(filepath)[0] + '_fp32.onnx'
+            with open(fp32_path, 'wb') as f:
+                f.write(onnx_model.SerializeToString())
+            quantize_dynamic(fp32_path, filepath, weight_type=QuantType.QInt8)
+            
+            self.logger.info(f"Quantized ONNX model saved to {filepath}")
+            return filepath
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting ONNX model: {e}")
+            raise
+    
+    def load_onnx(self, filepath: str):
+        """
+        Serve predictions from an ONNX Runtime session instead of the estimator
+        
+        Args:
+            filepath: Path to the .onnx model (see export_quantized_onnx)
+        """
+        try:
+            if not _HAS_ORT:
+                raise ImportError("onnxruntime is required to load ONNX models")
+            
+            session = ort.InferenceSession(filepath, providers=['CPUExecutionProvider'])
+            self._ort_input = session.get_inputs()[0].name
+            self._ort_label, self._ort_proba = (o.name for o in session.get_outputs()[:2])
+            self._ort_session = session
+            self.logger.info(f"ONNX model loaded from {filepath}")
+            
+        except Exception as e:
+            self.logger.error(f"Error loading ONNX model: {e}")
+            raise
+    
     def get_feature_importance(self, top_n: int = 20) -> pd.DataFrame:
         """
         Get top N most important features
@@ -321,12 +613,27 @@ class TradingModel:
             DataFrame with feature importance
         """
         if self.feature_importance is not None:
-            return self.feature_importance.head(top_n)
+            # Select the top N in O(n), then sort only those
+            imp = self.feature_importance['importance'].to_numpy()
+            k = min(top_n, len(imp))
+            if k == 0:
+                return self.feature_importance.iloc[:0]
+            idx = np.argpartition(-imp, k - 1)[:k]
+            idx = idx[np.argsort(-imp[idx], kind='stable')]
+            return self.feature_importance.iloc[idx]
         else:
             self.logger.warning("Feature importance not available for this model")
             return pd.DataFrame()
 
 
+def _train_one(name: str, model: 'TradingModel', X_train: Union[pd.DataFrame, np.ndarray],
+               y_train: Union[pd.Series, np.ndarray],
+               feature_names: Optional[list] = None) -> Tuple[str, 'TradingModel', Dict]:
+    """Train one ensemble member (runs in a joblib worker)"""
+    metrics = model.train(X_train, y_train, feature_names)
+    return name, model, metrics
+
+
 class ModelEnsemble:
     """
     Ensemble of multiple models for more robust predictions
@@ -347,14 +654,50 @@ class ModelEnsemble:
         
         self.logger.info(f"Initialized ensemble with {len(self.models)} models")
     
-    def train_all(self, X_train: pd.DataFrame, y_train: pd.Series):
-        """Train all models in ensemble"""
+    def train_all(self, X_train: Union[pd.DataFrame, np.ndarray], y_train: Union[pd.Series, np.ndarray],
+                  feature_names: Optional[list] = None):
+        """
+        Train all models in ensemble, one worker process per model
+        
+        Args:
+            X_train: Training features (DataFrame or array, e.g. from split_data)
+            y_train: Training labels
+            feature_names: Column names when X_train is an array
+        """
+        # Split the cores between members so the workers don't oversubscribe
+        n_workers = len(self.models)
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+        for model in self.models.values():
+            if not model.on_gpu and 'n_jobs' in model.model.get_params():
+                model.model.set_params(n_jobs=threads)
+        
+        self.logger.info(f"Training {', '.join(self.models)} in parallel ({threads} threads each)...")
+        trained = joblib.Parallel(n_jobs=n_workers, backend='loky')(
+            joblib.delayed(_train_one)(name, model, X_train, y_train, feature_names)
+            for name, model in self.models.items()
+        )
+        
+        # Workers train copies; keep the fitted ones
         results = {}
-        for name, model in self.models.items():
-            self.logger.info(f"Training {name}...")
-            results[name] = model.train(X_train, y_train)
+        for name, model, metrics in trained:
+            self.models[name] = model
+            results[name] = metrics
         return results
     
+    def predict_proba_stack(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Class probabilities of every model, converting the input only once
+        
+        Args:
+            X: Features (single row or DataFrame)
+            
+        Returns:
+            Array of shape (n_models, n_samples, n_classes)
+        """
+        x = TradingModel._as_array(X)
+        
+        return np.stack([model.model.predict_proba(x) for model in self.models.values()])
+    
     def predict(self, X: pd.DataFrame, method: str = 'majority') -> int:
         """
         Get ensemble prediction
@@ -366,20 +709,24 @@ class ModelEnsemble:
         Returns:
             Ensemble prediction
         """
+        probas = self.predict_proba_stack(X)
+        
         if method == 'majority':
             # Majority voting
-            predictions = [model.predict(X) for model in self.models.values()]
+            predictions = probas[:, 0].argmax(axis=1)
             return int(np.bincount(predictions).argmax())
             
         elif method == 'average':
             # Average probabilities
-            probas = [model.predict_proba(X) for model in self.models.values()]
-            avg_probas = np.mean(probas, axis=0)
-            return int(avg_probas.argmax())
+            return int(probas[:, 0].mean(axis=0).argmax())
     
     def get_signal(self, X: pd.DataFrame, confidence_threshold: float = 0.6) -> Dict:
         """Get ensemble trading signal"""
-        signals = [model.get_signal(X, confidence_threshold) for model in self.models.values()]
+        probas = self.predict_proba_stack(X)[:, 0]
+        signals = [
+            model._build_signal(p, int(p.argmax()), confidence_threshold)
+            for model, p in zip(self.models.values(), probas)
+        ]
         
         # Average confidence
         avg_confidence = np.mean([s['confidence'] for s in signals])
@@ -394,7 +741,6 @@ class ModelEnsemble:
             'individual_signals': signals
         }
 
-
 if __name__ == "__main__":
     # Test the model
     logging.basicConfig(level=logging.INFO)
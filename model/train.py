@@ -7,14 +7,18 @@ import pandas as pd
 import numpy as np
 import logging
 import os
+import hashlib
 from datetime import datetime
 from typing import Dict, Optional
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
 import joblib
 
 from utils.data_collector import DataCollector
-from utils.feature_engineering import FeatureEngineer
-from model.ai_model import TradingModel, ModelEnsemble
+from utils.feature_engineering import FeatureEngineer, FEATURE_VERSION
+from model.ai_model import TradingModel, ModelEnsemble, prepare_labels
+
+# Cached feature frames kept in data/; the least recently written are removed
+MAX_FEATURE_CACHE_FILES = 4
 
 
 class ModelTrainer:
@@ -41,6 +45,7 @@ class ModelTrainer:
         self.data_collector = None
         self.feature_engineer = FeatureEngineer(config.get('indicators'))
         self.model = None
+        self.feature_names = None
         
     def setup_data_collector(self, api_key: str, api_secret: str, password: str, testnet: bool = True):
         """Setup data collector with API credentials"""
@@ -64,8 +69,8 @@ class ModelTrainer:
             df = self.data_collector.fetch_historical_data(symbol, timeframe, days)
             
             # Save raw data
-            raw_data_path = f"data/raw_data_{symbol.replace('/', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
-            df.to_csv(raw_data_path)
+            raw_data_path = f"data/raw_data_{symbol.replace('/', '_')}_{datetime.now().strftime('%Y%m%d')}.parquet"
+            df.to_parquet(raw_data_path, compression='zstd', index=True)
             self.logger.info(f"Raw data saved to {raw_data_path}")
             
             return df
@@ -78,6 +83,11 @@ class ModelTrainer:
         """
         Extract all features from raw data
         
+        Results are cached on disk, keyed by a hash of the raw data, the
+        indicator config and the feature schema (column names plus
+        FEATURE_VERSION), so re-runs over the same data skip the indicator pass
+        and a changed feature set is never served from a stale cache.
+        
         Args:
             df: Raw OHLCV DataFrame
             
@@ -85,13 +95,22 @@ class ModelTrainer:
             DataFrame with features
         """
         try:
+            digest = hashlib.blake2b(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+            digest.update(repr(sorted(self.feature_engineer.config.items())).encode())
+            digest.update(repr((FEATURE_VERSION, self.feature_engineer.feature_columns())).encode())
+            cache_path = f"data/features_{digest.hexdigest()[:16]}.parquet"
+            
+            if os.path.exists(cache_path):
+                self.logger.info(f"Loading cached features from {cache_path}")
+                return pd.read_parquet(cache_path)
+            
             self.logger.info("Extracting features...")
             df = self.feature_engineer.extract_all_features(df)
             
             # Save processed data
-            processed_data_path = f"data/processed_data_{datetime.now().strftime('%Y%m%d')}.csv"
-            df.to_csv(processed_data_path)
-            self.logger.info(f"Processed data saved to {processed_data_path}")
+            df.to_parquet(cache_path, compression='zstd', index=True)
+            self.logger.info(f"Processed data saved to {cache_path}")
+            self._evict_feature_cache()
             
             return df
             
@@ -99,6 +118,18 @@ class ModelTrainer:
             self.logger.error(f"Error preparing features: {e}")
             raise
     
+    def _evict_feature_cache(self, cache_dir: str = 'data'):
+        """Remove all but the newest MAX_FEATURE_CACHE_FILES cached feature frames"""
+        paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                 if name.startswith('features_') and name.endswith('.parquet')]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[MAX_FEATURE_CACHE_FILES:]:
+            try:
+                os.remove(path)
+                self.logger.info(f"Removed old feature cache {path}")
+            except OSError as e:
+                self.logger.warning(f"Could not remove feature cache {path}: {e}")
+    
     def prepare_labels(self, df: pd.DataFrame, method: str = 'binary', 
                       future_bars: int = 1) -> pd.Series:
         """
@@ -113,9 +144,7 @@ class ModelTrainer:
             Series with labels
         """
         try:
-            # Initialize temporary model just for label preparation
-            temp_model = TradingModel(self.config.get('model_type', 'xgboost'))
-            labels = temp_model.prepare_labels(df, method, future_bars)
+            labels = prepare_labels(df, method, future_bars)
             
             self.logger.info(f"Labels prepared. Distribution: {labels.value_counts().to_dict()}")
             return labels
@@ -130,6 +159,9 @@ class ModelTrainer:
         Split data into train, validation, and test sets
         Uses time-based split (no shuffle) to prevent look-ahead bias
         
+        The features are converted once to a contiguous float32 array and the
+        splits are views into it; column names are kept in self.feature_names.
+        
         Args:
             X: Features
             y: Labels
@@ -137,23 +169,27 @@ class ModelTrainer:
             validation_size: Validation set proportion
             
         Returns:
-            (X_train, X_val, X_test, y_train, y_val, y_test)
+            (X_train, X_val, X_test, y_train, y_val, y_test) as numpy arrays
         """
         try:
+            self.feature_names = list(X.columns)
+            Xn = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+            yn = y.to_numpy(dtype=np.int8)
+            
             # Calculate split indices
-            n = len(X)
+            n = len(Xn)
             test_idx = int(n * (1 - test_size))
             val_idx = int(test_idx * (1 - validation_size))
             
             # Split without shuffling (time series)
-            X_train = X.iloc[:val_idx]
-            y_train = y.iloc[:val_idx]
+            X_train = Xn[:val_idx]
+            y_train = yn[:val_idx]
             
-            X_val = X.iloc[val_idx:test_idx]
-            y_val = y.iloc[val_idx:test_idx]
+            X_val = Xn[val_idx:test_idx]
+            y_val = yn[val_idx:test_idx]
             
-            X_test = X.iloc[test_idx:]
-            y_test = y.iloc[test_idx:]
+            X_test = Xn[test_idx:]
+            y_test = yn[test_idx:]
             
             self.logger.info(f"Data split: Train={len(X_train)}, Val={len(X_val)}, Test={len(X_test)}")
             
@@ -185,8 +221,17 @@ class ModelTrainer:
             # Initialize model
             self.model = TradingModel(model_type, self.config.get('model_config'))
             
+            # float32 halves the bytes the tree builders stream through
+            X_train = X_train.astype(np.float32, copy=False)
+            if X_val is not None:
+                X_val = X_val.astype(np.float32, copy=False)
+            
+            # XGBoost scores the validation set while boosting (early stopping)
+            has_val = X_val is not None and y_val is not None
+            eval_set = (X_val, y_val) if has_val and model_type == 'xgboost' else None
+            
             # Train
-            train_metrics = self.model.train(X_train, y_train)
+            train_metrics = self.model.train(X_train, y_train, self.feature_names, eval_set=eval_set)
             
             results = {
                 'model_type': model_type,
@@ -194,9 +239,13 @@ class ModelTrainer:
                 'feature_importance': self.model.get_feature_importance().to_dict()
             }
             
-            # Validate if validation set provided
-            if X_val is not None and y_val is not None:
+            # Validate if validation set provided (plus XGBoost's early-stopping results)
+            if has_val:
                 val_metrics = self.model.evaluate(X_val, y_val)
+                val_metrics.update(
+                    (k, v) for k, v in train_metrics.items()
+                    if k == 'best_iteration' or k.startswith('val_')
+                )
                 results['val_metrics'] = val_metrics
             
             return results
@@ -242,12 +291,12 @@ class ModelTrainer:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filepath = f"model/{self.config.get('model_type', 'model')}_{timestamp}.pkl"
             
-            self.model.save_model(filepath)
+            filepath = self.model.save_model(filepath)
             
-            # Also save feature columns
-            feature_cols_path = filepath.replace('.pkl', '_features.txt')
+            # Also save feature columns (training order)
+            feature_cols_path = os.path.splitext(filepath)[0] + '_features.txt'
             with open(feature_cols_path, 'w') as f:
-                for col in self.model.feature_importance['feature']:
+                for col in self.feature_names:
                     f.write(f"{col}\n")
             
             self.logger.info(f"Model and features saved")
@@ -292,8 +341,9 @@ class ModelTrainer:
             X = df[feature_cols].iloc[:-self.config.get('future_bars', 1)]
             y = labels
             
-            # Align X and y
-            X = X.loc[y.index]
+            # Labels come from the same rows minus the last future_bars, so X and y
+            # are already aligned positionally
+            assert X.index.equals(y.index), "features and labels are misaligned"
             
             # 5. Split data
             X_train, X_val, X_test, y_train, y_val, y_test = self.split_data(X, y)
@@ -3,122 +3,482 @@ Web Dashboard for Trading Bot Monitoring
 Real-time monitoring with Flask
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, request
+from flask_caching import Cache
 import logging
 import os
-import json
+import copy
+import orjson
+import numpy as np
+import time
+import queue
+import atexit
+import threading
 from datetime import datetime, timedelta
-import pandas as pd
 from typing import Dict, List
 
+from utils.trade import Trade
+
 app = Flask(__name__)
+# Browsers poll every second or two; serve them from a short-lived cache
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 2})
 logger = logging.getLogger(__name__)
 
+# numpy scalars/arrays and non-string keys can reach the dashboard state
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+MAX_TRADES = 100
+MAX_EQUITY_POINTS = 1000
+
+# Each open SSE stream holds a waitress worker thread: cap them below the pool
+# size so polling and healthchecks always get a thread, and end every stream
+# after STREAM_LIFETIME seconds so the browser reconnects (after STREAM_RETRY_MS)
+MAX_STREAMS = 4
+STREAM_LIFETIME = 60.0
+STREAM_RETRY_MS = 3000
+_stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+
+# Columns kept for trade / equity records; other keys are not stored
+TRADE_FLOAT_FIELDS = ('entry_price', 'exit_price', 'size', 'pnl', 'return_percent')
+TRADE_STR_FIELDS = ('side', 'entry_timestamp', 'exit_timestamp')
+EQUITY_FLOAT_FIELDS = ('equity',)
+EQUITY_STR_FIELDS = ('timestamp',)
+
+DEFAULT_STATE = {
+    'bot_status': 'stopped',
+    'capital': 100,
+    'pnl': 0,
+    'pnl_percent': 0,
+    'last_update': 'N/A',
+    'trades': [],
+    'equity_history': [],
+    'positions': [],
+    'last_signal': None,
+    'risk_metrics': {}
+}
+
+# One file per shard so an update only re-serializes the part that changed
+SHARDS = {
+    'bot_status': ('bot_status', 'capital', 'pnl', 'pnl_percent', 'last_update',
+                   'positions', 'last_signal', 'risk_metrics'),
+    'trades': ('trades',),
+    'equity': ('equity_history',),
+}
+_KEY_SHARD = {key: shard for shard, keys in SHARDS.items() for key in keys}
+
+# Updates accepted by DashboardData.submit (each has an _apply_<type> handler)
+UPDATE_TYPES = ('bot_status', 'capital', 'trade', 'equity', 'positions', 'signal', 'risk_metrics')
+
+
+def _defaults(keys: tuple) -> Dict:
+    """Fresh copy of the default values for keys"""
+    return copy.deepcopy({key: DEFAULT_STATE[key] for key in keys})
+
+
+class RecordRing:
+    """
+    Fixed-capacity ring buffer of records stored column-wise
+    
+    Numeric fields live in float64 arrays (NaN = missing), strings in object
+    arrays (None = missing). Appending overwrites the oldest record once full.
+    """
+    
+    def __init__(self, capacity: int, float_fields: tuple, str_fields: tuple, records: List[Dict] = ()):
+        self.capacity = capacity
+        self._floats = {f: np.full(capacity, np.nan) for f in float_fields}
+        self._strs = {f: np.full(capacity, None, dtype=object) for f in str_fields}
+        self._start = 0
+        self._len = 0
+        for record in list(records)[-capacity:]:
+            self.append(record)
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def append(self, record: Dict) -> bool:
+        """Add a record; returns True if the oldest one was evicted"""
+        evicted = self._len == self.capacity
+        i = (self._start + self._len) % self.capacity
+        for field, col in self._floats.items():
+            value = record.get(field)
+            col[i] = np.nan if value is None else value
+        for field, col in self._strs.items():
+            value = record.get(field)
+            col[i] = None if value is None else str(value)
+        if evicted:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._len += 1
+        return evicted
+    
+    def _order(self, n: int) -> np.ndarray:
+        """Physical indices of the last n records, oldest first"""
+        n = min(n, self._len)
+        return (self._start + self._len - n + np.arange(n)) % self.capacity
+    
+    def column(self, field: str) -> np.ndarray:
+        """A numeric field for all records, oldest first"""
+        return self._floats[field][self._order(self._len)]
+    
+    def tail(self, n: int) -> List[Dict]:
+        """Last n records as dicts (missing fields omitted)"""
+        idx = self._order(n)
+        floats = {f: col[idx].tolist() for f, col in self._floats.items()}
+        strs = {f: col[idx].tolist() for f, col in self._strs.items()}
+        records = []
+        for k in range(len(idx)):
+            record = {f: v[k] for f, v in strs.items() if v[k] is not None}
+            record.update((f, v[k]) for f, v in floats.items() if v[k] == v[k])
+            records.append(record)
+        return records
+    
+    def to_records(self) -> List[Dict]:
+        """All records as dicts, oldest first"""
+        return self.tail(self._len)
+
+
+def _tail(items, n: int) -> list:
+    """Last n records of a RecordRing or list"""
+    return items.tail(n) if isinstance(items, RecordRing) else list(items[-n:])
+
+
+def ojson(obj) -> Response:
+    """Compact JSON response serialized with orjson"""
+    return Response(orjson.dumps(obj, default=str, option=_ORJSON_OPTS), mimetype='application/json')
+
 
 class DashboardData:
-    """Manages data for dashboard display"""
-    
-    def __init__(self, data_file: str = 'monitoring/dashboard_data.json'):
-        self.data_file = data_file
-        self.ensure_data_file()
-    
-    def ensure_data_file(self):
-        """Create data file if not exists"""
-        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-        if not os.path.exists(self.data_file):
-            self.save_data({
-                'bot_status': 'stopped',
-                'capital': 100,
-                'pnl': 0,
-                'trades': [],
-                'equity_history': [],
-                'positions': [],
-                'last_signal': None,
-                'risk_metrics': {}
-            })
+    """
+    Manages data for dashboard display
     
-    def load_data(self) -> Dict:
-        """Load dashboard data from file"""
+    State lives in memory; updates mutate it under a lock and a background
+    thread flushes the changed shards (bot_status.json, trades.json,
+    equity.json in data_dir) at most once per flush_interval. A shard is
+    re-read only when another process (the bot) has rewritten it.
+    """
+    
+    def __init__(self, data_dir: str = 'monitoring/dashboard_data', flush_interval: float = 1.0):
+        self.data_dir = data_dir
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._dirty = set()
+        self._mtimes = {}
+        self._queue = queue.Queue()
+        self._writer = None
+        self._rev = 0
+        self._changed = threading.Condition()
+        self._state = self._bounded(self.ensure_data_dir())
+        # PnL baseline, fixed until the bot restarts with a new initial capital
+        self._initial_capital = (self._state.get('capital', DEFAULT_STATE['capital'])
+                                 - self._state.get('pnl', 0)) or DEFAULT_STATE['capital']
+        self._reset_stats()
+    
+    def ensure_data_dir(self) -> Dict:
+        """Create missing shard files and return the merged contents"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        for shard, keys in SHARDS.items():
+            if not os.path.exists(self._shard_path(shard)):
+                self._write_shard(shard, _defaults(keys))
+        return self.load_data()
+    
+    def _shard_path(self, shard: str) -> str:
+        return os.path.join(self.data_dir, f"{shard}.json")
+    
+    def _shard_mtime(self, shard: str):
         try:
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading data: {e}")
-            return {}
+            return os.stat(self._shard_path(shard)).st_mtime_ns
+        except OSError:
+            return None
     
-    def save_data(self, data: Dict):
-        """Save dashboard data to file"""
+    def _load_shard(self, shard: str) -> Dict:
+        """Read one shard, falling back to defaults for missing keys"""
+        data = _defaults(SHARDS[shard])
+        # Stat before reading so a rewrite racing the read is picked up next time
+        self._mtimes[shard] = self._shard_mtime(shard)
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(self._shard_path(shard), 'rb') as f:
+                data.update(orjson.loads(f.read()))
+        except FileNotFoundError:
+            # Writes are atomic renames, so the file is either complete or absent
+            logger.warning(f"Dashboard {shard} data not found, using defaults")
+        return data
+    
+    def _write_shard(self, shard: str, data: Dict):
+        """Write one shard atomically: readers see the old file or the new one, never a partial write"""
+        path = self._shard_path(shard)
+        # Per-process temp name so the bot and dashboard never share one
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data, default=str, option=_ORJSON_OPTS))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._mtimes[shard] = self._shard_mtime(shard)
         except Exception as e:
-            logger.error(f"Error saving data: {e}")
+            logger.error(f"Error saving {shard} data: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def load_data(self) -> Dict:
+        """Load dashboard data from all shard files"""
+        data = {}
+        for shard in SHARDS:
+            data.update(self._load_shard(shard))
+        return data
+    
+    def save_data(self, data: Dict):
+        """Save dashboard data, one file per shard"""
+        for shard, keys in SHARDS.items():
+            self._write_shard(shard, {key: data[key] for key in keys if key in data})
+    
+    @staticmethod
+    def _bounded(data: Dict) -> Dict:
+        """Hold trades and equity in column-wise ring buffers (O(1) append with eviction)"""
+        if 'trades' in data:
+            data['trades'] = RecordRing(MAX_TRADES, TRADE_FLOAT_FIELDS, TRADE_STR_FIELDS,
+                                        data['trades'])
+        if 'equity_history' in data:
+            data['equity_history'] = RecordRing(MAX_EQUITY_POINTS, EQUITY_FLOAT_FIELDS, EQUITY_STR_FIELDS,
+                                                data['equity_history'])
+        return data
+    
+    def snapshot(self) -> Dict:
+        """Current state, reloading any shard another process has rewritten"""
+        with self._lock:
+            self._apply_pending()
+            for shard in SHARDS:
+                if shard in self._dirty or self._shard_mtime(shard) == self._mtimes.get(shard):
+                    continue
+                self._state.update(self._bounded(self._load_shard(shard)))
+                self._rev += 1
+                if shard == 'trades':
+                    self._reset_stats()
+            return self._state
+    
+    @property
+    def revision(self) -> str:
+        """Opaque version of the state, changes whenever the state does"""
+        return '-'.join(str(self._mtimes.get(shard)) for shard in SHARDS) + f"-{self._rev}"
+    
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every in-process update (see wait_for_change)"""
+        return self._rev
+    
+    def wait_for_change(self, seen: int, timeout: float) -> int:
+        """
+        Block until the generation moves past seen or the timeout expires
+        
+        Every waiter compares against its own last-seen generation, so one
+        update wakes all of them.
+        
+        Args:
+            seen: Generation the caller has already handled
+            timeout: Seconds to wait at most (then re-check revision)
+            
+        Returns:
+            Current generation
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._rev != seen, timeout)
+            return self._rev
+    
+    def flush(self):
+        """Apply queued updates and write the shards with pending changes"""
+        with self._lock:
+            self._apply_pending()
+        # Wait for an update the writer has dequeued but not applied yet
+        self._queue.join()
+        self._write_dirty()
+    
+    def _write_dirty(self):
+        with self._lock:
+            for shard in self._dirty:
+                data = {}
+                for key in SHARDS[shard]:
+                    value = self._state.get(key)
+                    data[key] = value.to_records() if isinstance(value, RecordRing) else value
+                self._write_shard(shard, data)
+            self._dirty.clear()
+    
+    def submit(self, update_type: str, payload):
+        """
+        Queue an update for the writer thread
+        
+        Updates submitted back-to-back (e.g. capital, equity and positions after
+        a trade) are applied together and written in a single flush.
+        
+        Args:
+            update_type: One of UPDATE_TYPES
+            payload: Update value, as built by the matching update_* method
+        """
+        if update_type not in UPDATE_TYPES:
+            raise ValueError(f"Unknown dashboard update type: {update_type}")
+        self._queue.put((update_type, payload))
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name='dashboard-writer',
+                                                    daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush)
+    
+    def _apply_pending(self):
+        """Apply every queued update to the state (caller holds the lock)"""
+        while True:
+            try:
+                update_type, payload = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                getattr(self, f"_apply_{update_type}")(payload)
+            finally:
+                self._queue.task_done()
+    
+    def _write_loop(self):
+        while True:
+            update_type, payload = self._queue.get()
+            try:
+                with self._lock:
+                    try:
+                        getattr(self, f"_apply_{update_type}")(payload)
+                    finally:
+                        self._queue.task_done()
+                    # Picks up everything queued behind it, then writes once
+                    self._apply_pending()
+                    self._write_dirty()
+            except Exception as e:
+                logger.error(f"Error writing dashboard data: {e}")
+            # Cap the write rate; updates arriving meanwhile go out in the next flush
+            time.sleep(self.flush_interval)
+    
+    def _mark_dirty(self, *keys: str):
+        """Schedule a flush of the shards holding keys"""
+        self._dirty.update(_KEY_SHARD[key] for key in keys)
+        self._rev += 1
+        with self._changed:
+            self._changed.notify_all()
     
     def update_bot_status(self, status: str):
         """Update bot status"""
-        data = self.load_data()
-        data['bot_status'] = status
-        data['last_update'] = datetime.now().isoformat()
-        self.save_data(data)
+        self.submit('bot_status', {'bot_status': status, 'last_update': datetime.now().isoformat()})
+    
+    def set_initial_capital(self, capital: float):
+        """Set the baseline that pnl_percent is measured against"""
+        if capital <= 0:
+            raise ValueError(f"Initial capital must be positive, got {capital}")
+        with self._lock:
+            self._initial_capital = float(capital)
     
     def update_capital(self, capital: float, pnl: float):
         """Update capital and PnL"""
-        data = self.load_data()
-        data['capital'] = capital
-        data['pnl'] = pnl
-        data['pnl_percent'] = (pnl / (capital - pnl)) * 100 if capital > pnl else 0
-        self.save_data(data)
+        self.submit('capital', (capital, pnl))
     
-    def add_trade(self, trade: Dict):
+    def add_trade(self, trade: Trade):
         """Add trade to history"""
-        data = self.load_data()
-        if 'trades' not in data:
-            data['trades'] = []
-        data['trades'].append(trade)
-        # Keep only last 100 trades
-        data['trades'] = data['trades'][-100:]
-        self.save_data(data)
+        self.submit('trade', {
+            'side': trade.side,
+            'entry_price': trade.entry_price,
+            'entry_timestamp': trade.timestamp.isoformat(),
+            'size': trade.amount
+        })
     
     def update_equity(self, equity: float):
         """Update equity curve"""
-        data = self.load_data()
-        if 'equity_history' not in data:
-            data['equity_history'] = []
-        
-        data['equity_history'].append({
-            'timestamp': datetime.now().isoformat(),
-            'equity': equity
-        })
-        
-        # Keep only last 1000 points
-        data['equity_history'] = data['equity_history'][-1000:]
-        self.save_data(data)
+        self.submit('equity', {'timestamp': datetime.now().isoformat(), 'equity': equity})
     
     def update_positions(self, positions: List[Dict]):
         """Update open positions"""
-        data = self.load_data()
-        data['positions'] = positions
-        self.save_data(data)
+        self.submit('positions', positions)
     
     def update_signal(self, signal: Dict):
         """Update last signal"""
-        data = self.load_data()
-        data['last_signal'] = signal
-        data['last_signal']['timestamp'] = datetime.now().isoformat()
-        self.save_data(data)
+        self.submit('signal', {**signal, 'timestamp': datetime.now().isoformat()})
     
     def update_risk_metrics(self, metrics: Dict):
         """Update risk metrics"""
-        data = self.load_data()
-        data['risk_metrics'] = metrics
-        self.save_data(data)
+        self.submit('risk_metrics', metrics)
+    
+    def _apply_bot_status(self, payload: Dict):
+        self._state.update(payload)
+        self._mark_dirty('bot_status', 'last_update')
+    
+    def _apply_capital(self, payload: tuple):
+        capital, pnl = payload
+        self._state['capital'] = capital
+        self._state['pnl'] = pnl
+        self._state['pnl_percent'] = pnl / self._initial_capital * 100.0
+        self._mark_dirty('capital')
+    
+    def _apply_trade(self, record: Dict):
+        # Keep only last 100 trades (best/worst can't be un-folded, so rebuild on eviction)
+        if self._state['trades'].append(record):
+            self._reset_stats()
+        else:
+            self._add_to_stats(record)
+        self._mark_dirty('trades')
+    
+    def _apply_equity(self, point: Dict):
+        # Keep only last 1000 points (the ring overwrites the oldest)
+        self._state['equity_history'].append(point)
+        self._mark_dirty('equity_history')
+    
+    def _apply_positions(self, positions: List[Dict]):
+        self._state['positions'] = positions
+        self._mark_dirty('positions')
+    
+    def _apply_signal(self, signal: Dict):
+        self._state['last_signal'] = signal
+        self._mark_dirty('last_signal')
+    
+    def _apply_risk_metrics(self, metrics: Dict):
+        self._state['risk_metrics'] = metrics
+        self._mark_dirty('risk_metrics')
+    
+    def _reset_stats(self):
+        """Rebuild the running trade aggregates from the current trade window"""
+        # Trades without a PnL yet count as flat
+        pnls = np.nan_to_num(self._state['trades'].column('pnl'))
+        
+        # One pass buckets trades into loss/flat/win (0/1/2) with their PnL sums
+        bucket = np.sign(pnls).astype(np.intp) + 1
+        counts = np.bincount(bucket, minlength=3)
+        sums = np.bincount(bucket, weights=pnls, minlength=3)
+        self._stats = {
+            'total': len(pnls),
+            'wins': int(counts[2]),
+            'sum_pnl': float(sums.sum()),
+            'gross_profit': float(sums[2]),
+            'gross_loss': 0.0 - float(sums[0]),  # 0.0 - x never yields -0.0
+            'best': float(pnls.max()) if len(pnls) else float('-inf'),
+            'worst': float(pnls.min()) if len(pnls) else float('inf')
+        }
+    
+    def _add_to_stats(self, trade: Dict):
+        """Fold one trade into the running aggregates (open trades count with zero PnL)"""
+        pnl = trade.get('pnl') or 0.0
+        stats = self._stats
+        stats['total'] += 1
+        stats['sum_pnl'] += pnl
+        if pnl > 0:
+            stats['wins'] += 1
+            stats['gross_profit'] += pnl
+        elif pnl < 0:
+            stats['gross_loss'] -= pnl
+        stats['best'] = max(stats['best'], pnl)
+        stats['worst'] = min(stats['worst'], pnl)
     
     def get_statistics(self) -> Dict:
         """Calculate trading statistics"""
-        data = self.load_data()
-        trades = data.get('trades', [])
+        with self._lock:
+            self.snapshot()
+            stats = dict(self._stats)
         
-        if not trades:
+        total_trades = stats['total']
+        if not total_trades:
             return {
                 'total_trades': 0,
                 'win_rate': 0,
@@ -128,29 +488,18 @@ class DashboardData:
                 'profit_factor': 0
             }
         
-        trades_df = pd.DataFrame(trades)
-        
-        total_trades = len(trades_df)
-        winning_trades = len(trades_df[trades_df['pnl'] > 0])
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        avg_pnl = trades_df['pnl'].mean()
-        best_trade = trades_df['pnl'].max()
-        worst_trade = trades_df['pnl'].min()
-        
-        gross_profit = trades_df[trades_df['pnl'] > 0]['pnl'].sum() if winning_trades > 0 else 0
-        gross_loss = abs(trades_df[trades_df['pnl'] < 0]['pnl'].sum()) if (total_trades - winning_trades) > 0 else 0
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+        winning_trades = stats['wins']
+        gross_loss = stats['gross_loss']
         
         return {
             'total_trades': total_trades,
             'winning_trades': winning_trades,
             'losing_trades': total_trades - winning_trades,
-            'win_rate': win_rate,
-            'avg_pnl': avg_pnl,
-            'best_trade': best_trade,
-            'worst_trade': worst_trade,
-            'profit_factor': profit_factor
+            'win_rate': winning_trades / total_trades * 100,
+            'avg_pnl': stats['sum_pnl'] / total_trades,
+            'best_trade': stats['best'],
+            'worst_trade': stats['worst'],
+            'profit_factor': stats['gross_profit'] / gross_loss if gross_loss > 0 else 0
         }
 
 
@@ -158,80 +507,163 @@ class DashboardData:
 dashboard = DashboardData()
 
 
+def _versioned(response: Response) -> Response:
+    """Tag a response with the state revision so unchanged polls get a 304"""
+    response.set_etag(dashboard.revision, weak=True)
+    response.cache_control.max_age = 1
+    return response
+
+
+@app.after_request
+def _conditional(response: Response) -> Response:
+    # Runs after the view cache, so each client gets its own 304/200
+    if response.get_etag()[0] is not None:
+        response.make_conditional(request)
+    return response
+
+
 @app.route('/')
 def index():
     """Main dashboard page"""
     return render_template('dashboard.html')
 
 
-@app.route('/api/status')
-def get_status():
-    """Get current bot status"""
-    data = dashboard.load_data()
-    stats = dashboard.get_statistics()
-    
-    return jsonify({
+def _status_payload(data: Dict) -> Dict:
+    """Bot status summary served by /api/status and /api/stream"""
+    return {
         'bot_status': data.get('bot_status', 'unknown'),
         'capital': data.get('capital', 0),
         'pnl': data.get('pnl', 0),
         'pnl_percent': data.get('pnl_percent', 0),
         'positions': len(data.get('positions', [])),
         'last_update': data.get('last_update', 'N/A'),
-        'statistics': stats
-    })
+        'statistics': dashboard.get_statistics()
+    }
+
+
+@app.route('/api/status')
+@cache.cached(timeout=2)
+def get_status():
+    """Get current bot status"""
+    data = dashboard.snapshot()
+    
+    return ojson(_status_payload(data))
+
+
+@app.route('/api/stream')
+def stream():
+    """Push the full dashboard state as Server-Sent Events whenever it changes"""
+    # Out of stream slots: the page falls back to polling on a non-200 response
+    if not _stream_slots.acquire(blocking=False):
+        return Response('Too many open streams', status=503, headers={'Retry-After': '30'})
+    
+    def events():
+        yield f"retry: {STREAM_RETRY_MS}\n\n".encode()
+        last_rev = None
+        idle = 0.0
+        seen = dashboard.generation
+        end = time.monotonic() + STREAM_LIFETIME
+        while time.monotonic() < end:
+            data = dashboard.snapshot()
+            rev = dashboard.revision
+            if rev != last_rev:
+                last_rev = rev
+                idle = 0.0
+                payload = {
+                    'status': _status_payload(data),
+                    'equity': _tail(data.get('equity_history', []), 500),
+                    'trades': _tail(data.get('trades', []), 50),
+                    'signal': data.get('last_signal') or {}
+                }
+                yield b'data: ' + orjson.dumps(payload, default=str, option=_ORJSON_OPTS) + b'\n\n'
+            elif idle >= 15:
+                # Comment line keeps proxies from closing an idle stream
+                idle = 0.0
+                yield b': keep-alive\n\n'
+            
+            seen = dashboard.wait_for_change(seen, timeout=1.0)
+            idle += 1.0
+    
+    response = Response(events(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Runs when the server closes the response, even if the generator never started
+    response.call_on_close(_stream_slots.release)
+    return response
 
 
 @app.route('/api/trades')
+@cache.cached(timeout=2)
 def get_trades():
     """Get trade history"""
-    data = dashboard.load_data()
+    data = dashboard.snapshot()
     trades = data.get('trades', [])
     
     # Return last 50 trades
-    return jsonify(trades[-50:])
+    return _versioned(ojson(_tail(trades, 50)))
 
 
 @app.route('/api/equity')
+@cache.cached(timeout=2)
 def get_equity():
     """Get equity curve data"""
-    data = dashboard.load_data()
+    data = dashboard.snapshot()
     equity_history = data.get('equity_history', [])
     
     # Return last 500 points
-    return jsonify(equity_history[-500:])
+    return _versioned(ojson(_tail(equity_history, 500)))
 
 
 @app.route('/api/positions')
+@cache.cached(timeout=2)
 def get_positions():
     """Get open positions"""
-    data = dashboard.load_data()
+    data = dashboard.snapshot()
     positions = data.get('positions', [])
     
-    return jsonify(positions)
+    return ojson(positions)
 
 
 @app.route('/api/signal')
+@cache.cached(timeout=2)
 def get_signal():
     """Get last trading signal"""
-    data = dashboard.load_data()
+    data = dashboard.snapshot()
     signal = data.get('last_signal', {})
     
-    return jsonify(signal)
+    return ojson(signal)
 
 
 @app.route('/api/risk')
+@cache.cached(timeout=2)
 def get_risk_metrics():
     """Get risk metrics"""
-    data = dashboard.load_data()
+    data = dashboard.snapshot()
     risk_metrics = data.get('risk_metrics', {})
     
-    return jsonify(risk_metrics)
+    return ojson(risk_metrics)
 
 
-def run_dashboard(host='0.0.0.0', port=5000, debug=False):
-    """Run the dashboard server"""
+def run_dashboard(host='0.0.0.0', port=5000, debug=False, threads=8):
+    """
+    Run the dashboard server
+    
+    Uses the waitress WSGI server (one thread per concurrent request,
+    including open /api/stream connections); debug mode keeps Flask's
+    reloading development server.
+    
+    Args:
+        host: Interface to bind
+        port: Port to listen on
+        debug: Run Flask's development server with the debugger
+        threads: waitress worker threads
+    """
     logger.info(f"Starting dashboard on http://{host}:{port}")
-    app.run(host=host, port=port, debug=debug)
+    if debug:
+        app.run(host=host, port=port, debug=True, threaded=True)
+        return
+    
+    from waitress import serve
+    serve(app, host=host, port=port, threads=threads)
 
 
 if __name__ == '__main__':
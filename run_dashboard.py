@@ -18,6 +18,7 @@ if __name__ == '__main__':
     parser.add_argument('--host', default='0.0.0.0', help='Dashboard host (default: 0.0.0.0)')
     parser.add_argument('--port', type=int, default=5000, help='Dashboard port (default: 5000)')
     parser.add_argument('--debug', action='store_true', help='Run in debug mode')
+    parser.add_argument('--threads', type=int, default=8, help='Server worker threads (default: 8)')
     
     args = parser.parse_args()
     
@@ -28,4 +29,4 @@ if __name__ == '__main__':
     print("Press Ctrl+C to stop")
     print("=" * 60)
     
-    run_dashboard(host=args.host, port=args.port, debug=args.debug)
+    run_dashboard(host=args.host, port=args.port, debug=args.debug, threads=args.threads)
@@ -173,9 +173,9 @@ fi
 # Check for trained model
 echo ""
 echo "10. Checking for trained model..."
-if ls model/*.pkl 1> /dev/null 2>&1; then
+if ls model/*.pkl model/*.ubj 2> /dev/null | grep -q .; then
     echo "✓ Trained model found:"
-    ls -lh model/*.pkl | tail -1
+    ls -lht model/*.pkl model/*.ubj 2> /dev/null | head -1
 else
     echo "✗ No trained model found. Run: python model/train.py"
 fi
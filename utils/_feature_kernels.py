@@ -0,0 +1,99 @@
+"""
+Derived Feature Kernels
+Numba-compiled single-pass kernels for the per-bar features FeatureEngineer
+derives from indicator outputs (MACD crossovers, Bollinger position/width,
+candle shape and gaps)
+
+Each kernel walks its inputs once and writes every output in the same loop,
+instead of chaining pandas/NumPy expressions that allocate a temporary per
+step. Divisions follow NumPy semantics (inf/NaN, no ZeroDivisionError) and
+NaN comparisons are False, so results match the vectorized expressions.
+"""
+
+import numpy as np
+
+from utils._njit import njit
+
+
+@njit(cache=True, nogil=True)
+def crossovers(diff):
+    """
+    Bars where a line crosses above / below its signal line
+
+    Args:
+        diff: float64 line minus signal (e.g. the MACD histogram)
+
+    Returns:
+        (bullish, bearish) int8 0/1 arrays; the first bar is always 0
+    """
+    n = len(diff)
+    bullish = np.zeros(n, dtype=np.int8)
+    bearish = np.zeros(n, dtype=np.int8)
+    for i in range(1, n):
+        if diff[i] > 0 and diff[i - 1] <= 0:
+            bullish[i] = 1
+        if diff[i] < 0 and diff[i - 1] >= 0:
+            bearish[i] = 1
+    return bullish, bearish
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def band_position(x, upper, middle, lower):
+    """
+    Relative band width and position of x inside the bands
+
+    Args:
+        x: float64 close prices
+        upper: float64 upper band
+        middle: float64 middle band
+        lower: float64 lower band
+
+    Returns:
+        (width, position) float64 arrays
+    """
+    n = len(x)
+    width = np.empty(n)
+    position = np.empty(n)
+    for i in range(n):
+        span = upper[i] - lower[i]
+        width[i] = span / middle[i]
+        position[i] = (x[i] - lower[i]) / span
+    return width, position
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def candle_shape(o, h, l, c):
+    """
+    Range, body, shadows and opening gap of each candle
+
+    Args:
+        o: float64 open prices
+        h: float64 high prices
+        l: float64 low prices
+        c: float64 close prices
+
+    Returns:
+        (hl_range, body_size, upper_shadow, lower_shadow, gap, gap_pct) float64
+        arrays; gap and gap_pct are NaN on the first bar
+    """
+    n = len(c)
+    hl_range = np.empty(n)
+    body_size = np.empty(n)
+    upper_shadow = np.empty(n)
+    lower_shadow = np.empty(n)
+    gap = np.empty(n)
+    gap_pct = np.empty(n)
+    for i in range(n):
+        top = max(o[i], c[i])
+        bottom = min(o[i], c[i])
+        hl_range[i] = (h[i] - l[i]) / c[i]
+        body_size[i] = abs(o[i] - c[i]) / c[i]
+        upper_shadow[i] = (h[i] - top) / c[i]
+        lower_shadow[i] = (bottom - l[i]) / c[i]
+        if i == 0:
+            gap[i] = np.nan
+            gap_pct[i] = np.nan
+        else:
+            gap[i] = o[i] - c[i - 1]
+            gap_pct[i] = gap[i] / c[i - 1]
+    return hl_range, body_size, upper_shadow, lower_shadow, gap, gap_pct
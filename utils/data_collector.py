@@ -4,13 +4,159 @@ Fetches real-time and historical data from Bitget Futures API
 """
 
 import ccxt
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+import asyncio
+import functools
+import numpy as np
 import pandas as pd
 import logging
-from typing import Optional, Dict, List
-from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Callable, Awaitable
+from concurrent.futures import Executor, ThreadPoolExecutor
+import threading
 import time
 
 
+def _ttl_cache(ttl: float, fallback: Optional[Callable[[], object]] = None):
+    """
+    Memoize a DataCollector method per (symbol, args) for ttl seconds
+    
+    The cache lives on the instance, so it goes away with the collector.
+    Only successful results are cached: if the method raises and a fallback
+    is given, the fallback's value is returned for that call alone.
+    Cached results are shared between callers and must not be mutated.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, symbol, *args, **kwargs):
+            cache = self.__dict__.setdefault('_ttl_cache_store', {})
+            key = (fn.__name__, symbol, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            try:
+                result = fn(self, symbol, *args, **kwargs)
+            except Exception:
+                if fallback is None:
+                    raise
+                return fallback()
+            cache[key] = (now, result)
+            return result
+        
+        return wrapper
+    return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def timeframe_ms(timeframe: str) -> int:
+    """Candle length in milliseconds (e.g. '5m' -> 300000), parsed once per timeframe"""
+    return int(ccxt.Exchange.parse_timeframe(timeframe)) * 1000
+
+
+def configure_session(exchange: ccxt.Exchange, pool_maxsize: int = 16):
+    """
+    Give a sync ccxt exchange a keep-alive session sized for concurrent use
+    
+    Idempotent requests (GET) that fail to connect or hit a 5xx are retried
+    twice with backoff; orders (POST) are never retried here.
+    
+    Args:
+        exchange: ccxt exchange to configure
+        pool_maxsize: Keep-alive connections kept per host
+    """
+    # raise_on_status=False hands the last 5xx back to ccxt, which maps it to
+    # ExchangeNotAvailable (a NetworkError) rather than a generic ExchangeError
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    exchange.session = session
+
+
+def prewarm_session(exchange: ccxt.Exchange, connections: int = 3):
+    """
+    Open keep-alive connections ahead of the first burst of requests
+    
+    Fires concurrent fetch_time() calls on background threads and returns
+    without waiting, so an entry + SL + TP burst finds its TLS connections
+    already established.
+    
+    Args:
+        exchange: ccxt exchange configured with configure_session()
+        connections: Connections to open (concurrent requests)
+    """
+    def ping():
+        try:
+            exchange.fetch_time()
+        except Exception as e:
+            logging.getLogger(__name__).debug("Connection pre-warm failed: %s", e)
+    
+    pool = ThreadPoolExecutor(max_workers=connections, thread_name_prefix='prewarm')
+    for _ in range(connections):
+        pool.submit(ping)
+    pool.shutdown(wait=False)
+
+
+MARKETS_CACHE_DIR = os.path.expanduser('~/.cache/tradebot')
+
+# cache path -> (markets, currencies) already loaded in this process
+_MARKETS_MEMO = {}
+
+
+def load_markets_cached(exchange: ccxt.Exchange, testnet: bool,
+                        cache_dir: str = MARKETS_CACHE_DIR) -> Dict:
+    """
+    Load exchange markets, reusing an on-disk copy from the same UTC day
+    
+    Markets loaded once in this process are kept in memory too, so further
+    exchanges (e.g. a TradeExecutor next to the DataCollector) skip both the
+    request and the JSON parse.
+    
+    Args:
+        exchange: ccxt exchange to populate
+        testnet: Whether the exchange is in sandbox mode (separate cache)
+        cache_dir: Directory for the cached market metadata
+        
+    Returns:
+        Markets dict
+    """
+    network = 'testnet' if testnet else 'mainnet'
+    day = time.strftime('%Y%m%d', time.gmtime())
+    cache_path = os.path.join(cache_dir, f"{exchange.id}_{network}_markets_{day}.json")
+    
+    memo = _MARKETS_MEMO.get(cache_path)
+    if memo is not None:
+        exchange.set_markets(*memo)
+        return exchange.markets
+    
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        exchange.set_markets(cached['markets'], cached.get('currencies'))
+        _MARKETS_MEMO[cache_path] = (cached['markets'], cached.get('currencies'))
+        return exchange.markets
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    markets = exchange.load_markets()
+    _MARKETS_MEMO[cache_path] = (markets, exchange.currencies)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'markets': markets, 'currencies': exchange.currencies}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not cache markets: {e}")
+    return markets
+
+
 class DataCollector:
     """
     Handles data collection from Bitget exchange
@@ -31,6 +177,11 @@ class DataCollector:
             testnet: Use testnet or mainnet
         """
         self.logger = logging.getLogger(__name__)
+        self.testnet = testnet
+        self.stream_exchange = None
+        self._market_info = {}
+        self._raw_candle_params = {}
+        self._fast_ohlcv = True
         
         # Initialize Bitget exchange
         try:
@@ -44,21 +195,24 @@ class DataCollector:
                 }
             })
             
+            configure_session(self.exchange)
+            
             if testnet:
                 self.exchange.set_sandbox_mode(True)
                 self.logger.info("Using Bitget TESTNET")
             else:
                 self.logger.info("Using Bitget MAINNET")
                 
-            # Test connection
-            self.exchange.load_markets()
+            # Market metadata (cached on disk for the day)
+            load_markets_cached(self.exchange, testnet)
             self.logger.info("Successfully connected to Bitget")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize Bitget: {e}")
             raise
     
-    def fetch_ohlcv(self, symbol: str, timeframe: str = '5m', limit: int = 100) -> pd.DataFrame:
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '5m', limit: int = 100,
+                    since: Optional[int] = None) -> pd.DataFrame:
         """
         Fetch OHLCV (candlestick) data
         
@@ -66,26 +220,155 @@ class DataCollector:
             symbol: Trading pair (e.g., 'SOL/USDT:USDT')
             timeframe: Timeframe (1m, 5m, 15m, 1h, 4h, 1d)
             limit: Number of candles to fetch
+            since: Only fetch candles from this timestamp on (ms since epoch)
             
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
         """
         try:
-            self.logger.debug(f"Fetching OHLCV for {symbol} {timeframe} (limit: {limit})")
-            
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            self.logger.debug("Fetching OHLCV for %s %s (limit: %s, since: %s)", symbol, timeframe, limit, since)
             
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+            df = self._ohlcv_to_frame(ohlcv)
             
-            self.logger.debug(f"Fetched {len(df)} candles")
+            self.logger.debug("Fetched %d candles", len(df))
             return df
             
         except Exception as e:
             self.logger.error(f"Error fetching OHLCV: {e}")
             raise
     
+    def fetch_ohlcv_fast(self, symbol: str, timeframe: str = '5m', limit: int = 100,
+                         since: Optional[int] = None) -> pd.DataFrame:
+        """
+        Fetch OHLCV straight from Bitget's candles endpoint, skipping ccxt's
+        per-candle parsing; falls back to fetch_ohlcv if the raw call fails
+        (for that call on network errors, for good on any other error)
+        
+        Args:
+            symbol: Trading pair (e.g., 'SOL/USDT:USDT')
+            timeframe: Timeframe (1m, 5m, 15m, 1h, 4h, 1d)
+            limit: Number of candles to fetch
+            since: Only fetch candles from this timestamp on (ms since epoch)
+            
+        Returns:
+            DataFrame with columns: timestamp, open, high, low, close, volume
+        """
+        if not self._fast_ohlcv:
+            return self.fetch_ohlcv(symbol, timeframe, limit=limit, since=since)
+        
+        try:
+            # Market id, product type and granularity resolved once per (symbol, timeframe)
+            params = self._raw_candle_params.get((symbol, timeframe))
+            if params is None:
+                market = self.exchange.market(symbol)
+                product_type, _ = self.exchange.handle_product_type_and_params(market, {})
+                granularity = self.exchange.options['timeframes']['swap'].get(timeframe, timeframe)
+                params = self._raw_candle_params[(symbol, timeframe)] = {
+                    'symbol': market['id'],
+                    'productType': product_type,
+                    'granularity': granularity
+                }
+            
+            request = {**params, 'limit': limit}
+            if since is not None:
+                request['startTime'] = since
+            response = self.exchange.publicMixGetV2MixMarketCandles(request)
+            
+            # Rows are [ts, open, high, low, close, base volume, quote volume] as strings
+            arr = np.asarray(response['data'], dtype=np.float64).reshape(-1, 7)[:, :6]
+            if len(arr) > 1 and arr[0, 0] > arr[-1, 0]:
+                arr = arr[::-1]
+            return self._array_to_frame(arr)
+            
+        except ccxt.NetworkError as e:
+            # Timeouts, rate limits and connection errors: fall back for this call only
+            self.logger.warning(f"Raw candle request failed ({e}), using ccxt fetch_ohlcv for this call")
+            return self.fetch_ohlcv(symbol, timeframe, limit=limit, since=since)
+        except Exception as e:
+            # Rejected request or unexpected response shape: the raw endpoint is unusable here
+            self.logger.warning(f"Raw candle endpoint failed ({e}), using ccxt fetch_ohlcv from now on")
+            self._fast_ohlcv = False
+            return self.fetch_ohlcv(symbol, timeframe, limit=limit, since=since)
+    
+    @staticmethod
+    def _ohlcv_to_frame(ohlcv: List[List]) -> pd.DataFrame:
+        """Convert raw ccxt OHLCV rows into a DataFrame indexed by timestamp"""
+        arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        return DataCollector._array_to_frame(arr)
+    
+    @staticmethod
+    def _array_to_frame(arr: np.ndarray) -> pd.DataFrame:
+        """Build the OHLCV frame from an (n, 6) float64 array in one pass"""
+        index = pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms')
+        index.name = 'timestamp'
+        return pd.DataFrame({
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5]
+        }, index=index)
+    
+    async def start_candle_stream(self, symbol: str, timeframe: str,
+                                  on_close: Callable[[pd.DataFrame], Awaitable[None]],
+                                  retry_delay: float = 5.0):
+        """
+        Stream candles over websocket and report each candle once it closes
+        
+        Runs until cancelled. A candle counts as closed as soon as an update
+        for a newer candle arrives.
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            on_close: Coroutine called with a DataFrame of newly closed candles
+            retry_delay: Seconds to wait before resubscribing after an error
+        """
+        import ccxt.pro as ccxtpro
+        
+        self.stream_exchange = ccxtpro.bitget({
+            'enableRateLimit': True,
+            'options': {
+                'defaultType': 'swap',
+            }
+        })
+        if self.testnet:
+            self.stream_exchange.set_sandbox_mode(True)
+        
+        self.logger.info(f"Starting candle stream for {symbol} {timeframe}")
+        forming = None
+        
+        try:
+            while True:
+                try:
+                    ohlcv = await self.stream_exchange.watch_ohlcv(symbol, timeframe)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.error(f"Candle stream error: {e}")
+                    await asyncio.sleep(retry_delay)
+                    continue
+                
+                # First update only tells us which candle is forming
+                if forming is None:
+                    forming = ohlcv[-1]
+                    continue
+                
+                closed = []
+                for candle in ohlcv:
+                    if candle[0] > forming[0]:
+                        closed.append(forming)
+                    if candle[0] >= forming[0]:
+                        forming = candle
+                
+                if closed:
+                    await on_close(self._ohlcv_to_frame(closed))
+        finally:
+            await self.stream_exchange.close()
+            self.stream_exchange = None
+            self.logger.info("Candle stream stopped")
+    
     def fetch_orderbook(self, symbol: str, limit: int = 20) -> Dict:
         """
         Fetch orderbook (bids and asks)
@@ -113,6 +396,7 @@ class DataCollector:
             self.logger.error(f"Error fetching orderbook: {e}")
             raise
     
+    @_ttl_cache(60, fallback=lambda: {'funding_rate': 0, 'funding_timestamp': None, 'next_funding_time': None})
     def fetch_funding_rate(self, symbol: str) -> Dict:
         """
         Fetch current funding rate for futures
@@ -136,8 +420,9 @@ class DataCollector:
             
         except Exception as e:
             self.logger.error(f"Error fetching funding rate: {e}")
-            return {'funding_rate': 0, 'funding_timestamp': None, 'next_funding_time': None}
+            raise
     
+    @_ttl_cache(60, fallback=lambda: None)
     def fetch_open_interest(self, symbol: str) -> Optional[float]:
         """
         Fetch open interest for futures
@@ -162,8 +447,9 @@ class DataCollector:
             
         except Exception as e:
             self.logger.error(f"Error fetching open interest: {e}")
-            return None
+            raise
     
+    @_ttl_cache(0.5)
     def fetch_ticker(self, symbol: str) -> Dict:
         """
         Fetch current ticker (price, volume, etc.)
@@ -188,14 +474,18 @@ class DataCollector:
             raise
     
     def fetch_historical_data(self, symbol: str, timeframe: str = '5m', 
-                             days: int = 30) -> pd.DataFrame:
+                             days: int = 30, max_workers: int = 4) -> pd.DataFrame:
         """
         Fetch historical data for multiple days (for training)
         
+        The chunk start times are known up front, so chunks are requested
+        concurrently; request starts are still spaced by the exchange rate limit.
+        
         Args:
             symbol: Trading pair
             timeframe: Timeframe
             days: Number of days to fetch
+            max_workers: Concurrent chunk requests
             
         Returns:
             DataFrame with historical OHLCV data
@@ -204,43 +494,40 @@ class DataCollector:
             self.logger.info(f"Fetching {days} days of historical data for {symbol}")
             
             # Calculate how many candles we need
-            timeframe_map = {
-                '1m': 1, '5m': 5, '15m': 15, '30m': 30,
-                '1h': 60, '4h': 240, '1d': 1440
-            }
-            minutes_per_candle = timeframe_map.get(timeframe, 5)
-            candles_per_day = (24 * 60) // minutes_per_candle
-            total_candles = candles_per_day * days
+            candle_ms = timeframe_ms(timeframe)
+            total_candles = days * 24 * 60 * 60 * 1000 // candle_ms
             
             # Fetch in chunks (exchange limits per request)
             chunk_size = 1000
-            all_data = []
-            
-            since = self.exchange.parse8601(
-                (datetime.utcnow() - timedelta(days=days)).isoformat()
-            )
-            
-            while len(all_data) < total_candles:
-                ohlcv = self.exchange.fetch_ohlcv(
-                    symbol, timeframe, since=since, limit=chunk_size
-                )
-                
-                if not ohlcv:
-                    break
-                
-                all_data.extend(ohlcv)
-                since = ohlcv[-1][0] + 1  # Next timestamp
-                
-                self.logger.debug(f"Fetched {len(all_data)} / {total_candles} candles")
-                time.sleep(self.exchange.rateLimit / 1000)  # Respect rate limit
-                
+            since = int(time.time() * 1000) - days * 86_400_000
+            starts = [since + i * chunk_size * candle_ms for i in range(-(-total_candles // chunk_size))]
+            
+            # Shared pacer: one request start per rateLimit across all workers
+            pace_lock = threading.Lock()
+            next_slot = [time.monotonic()]
+            interval = self.exchange.rateLimit / 1000
+            
+            def fetch_chunk(start: int) -> List[List]:
+                with pace_lock:
+                    wait = next_slot[0] - time.monotonic()
+                    next_slot[0] = max(next_slot[0], time.monotonic()) + interval
+                if wait > 0:
+                    time.sleep(wait)
+                return self.exchange.fetch_ohlcv(symbol, timeframe, since=start, limit=chunk_size)
+            
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ohlcv-history') as pool:
+                chunks = list(pool.map(fetch_chunk, starts))
+            
+            for start, ohlcv in zip(starts[:-1], chunks[:-1]):
                 if len(ohlcv) < chunk_size:
-                    break  # No more data
+                    self.logger.warning(f"Chunk at {start} returned {len(ohlcv)} / {chunk_size} candles, data may have gaps")
+            arr = np.asarray([candle for ohlcv in chunks for candle in ohlcv], dtype=np.float64).reshape(-1, 6)
+            
+            self.logger.debug(f"Fetched {len(arr)} / {total_candles} candles in {len(starts)} chunks")
             
-            df = pd.DataFrame(all_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            df = df[~df.index.duplicated(keep='first')]  # Remove duplicates
+            # Sorted, duplicate-free timestamps (first occurrence wins)
+            _, first = np.unique(arr[:, 0], return_index=True)
+            df = self._array_to_frame(arr[first])
             
             self.logger.info(f"Successfully fetched {len(df)} candles")
             return df
@@ -260,15 +547,19 @@ class DataCollector:
             Market info dict
         """
         try:
-            market = self.exchange.market(symbol)
-            return {
-                'min_amount': market['limits']['amount']['min'],
-                'max_amount': market['limits']['amount']['max'],
-                'min_cost': market['limits']['cost']['min'],
-                'price_precision': market['precision']['price'],
-                'amount_precision': market['precision']['amount'],
-                'contract_size': market.get('contractSize', 1)
-            }
+            # Market metadata doesn't change within a session
+            info = self._market_info.get(symbol)
+            if info is None:
+                market = self.exchange.market(symbol)
+                info = self._market_info[symbol] = {
+                    'min_amount': market['limits']['amount']['min'],
+                    'max_amount': market['limits']['amount']['max'],
+                    'min_cost': market['limits']['cost']['min'],
+                    'price_precision': market['precision']['price'],
+                    'amount_precision': market['precision']['amount'],
+                    'contract_size': market.get('contractSize', 1)
+                }
+            return dict(info)
         except Exception as e:
             self.logger.error(f"Error fetching market info: {e}")
             raise
@@ -316,6 +607,40 @@ class DataCollector:
             self.logger.error(f"Error fetching positions: {e}")
             raise
 
+    
+    def fetch_snapshot(self, symbol: str, timeframe: str = '5m', limit: int = 100,
+                       since: Optional[int] = None, include_balance: bool = False,
+                       executor: Optional[Executor] = None) -> Dict:
+        """
+        Fetch everything the trading loop needs for one tick in a single call
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            limit: Number of candles to fetch
+            since: Only fetch candles from this timestamp on (ms since epoch)
+            include_balance: Also fetch the account balance
+            executor: Run the independent requests concurrently on this executor
+            
+        Returns:
+            Dict with 'ohlcv' DataFrame, 'positions' list and 'balance' (or None)
+        """
+        if executor is None:
+            return {
+                'ohlcv': self.fetch_ohlcv_fast(symbol, timeframe, limit=limit, since=since),
+                'positions': self.get_positions(symbol),
+                'balance': self.get_balance() if include_balance else None
+            }
+        
+        f_ohlcv = executor.submit(self.fetch_ohlcv_fast, symbol, timeframe, limit, since)
+        f_positions = executor.submit(self.get_positions, symbol)
+        f_balance = executor.submit(self.get_balance) if include_balance else None
+        
+        return {
+            'ohlcv': f_ohlcv.result(),
+            'positions': f_positions.result(),
+            'balance': f_balance.result() if f_balance else None
+        }
 
 if __name__ == "__main__":
     # Test the data collector
@@ -3,13 +3,40 @@ Feature Engineering Module
 Extracts technical indicators and prepares features for AI model
 """
 
+import os
+import hashlib
+import joblib
 import pandas as pd
 import numpy as np
 import talib as ta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import logging
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 
+from utils import indicators
+from utils import _feature_kernels as kernels
+from utils.online_features import OnlineFeatures
+
+# Feature frames kept per FeatureEngineer for repeated calls on the same candles
+FEATURE_CACHE_SIZE = 16
+
+# Bump whenever a feature's computation changes without its column name changing;
+# part of the on-disk feature cache key, so stale cached frames are not reused
+FEATURE_VERSION = 1
+
+# Frames at least this long compute the indicator groups concurrently; the
+# Numba kernels release the GIL (TA-Lib's bindings don't, so those still serialize)
+PARALLEL_MIN_BARS = 20_000
+_indicator_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                     thread_name_prefix='indicators')
+
+
+def _flag(condition: np.ndarray) -> np.ndarray:
+    """0/1 int8 column from a boolean array (a reinterpreting view, no copy)"""
+    return np.asarray(condition, dtype=bool).view(np.int8)
+
 
 class FeatureEngineer:
     """
@@ -28,8 +55,13 @@ class FeatureEngineer:
             config: Configuration dict with indicator parameters
         """
         self.logger = logging.getLogger(__name__)
-        self.config = config or self._default_config()
+        # Missing keys fall back to the defaults the models are trained with
+        self.config = {**self._default_config(), **(config or {})}
         self.scaler = StandardScaler()
+        self.scaler_cols = []
+        self._online = None
+        self._warmup = self.warmup_bars()
+        self._cache = OrderedDict()
         
     def _default_config(self) -> Dict:
         """Default indicator configuration"""
@@ -46,359 +78,576 @@ class FeatureEngineer:
             'atr_period': 14
         }
     
-    def add_moving_averages(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _extract_arrays(df: pd.DataFrame) -> tuple:
         """
-        Add Simple Moving Averages (SMA) and Exponential Moving Averages (EMA)
+        Pull the OHLCV columns out once as float64 arrays
+        
+        Inputs stay float64 because the indicator kernels keep running sums
+        (SMA, Bollinger variance) that drift in single precision; outputs are
+        narrowed to float32 once, in _feature_frame.
         
         Args:
             df: DataFrame with OHLCV data
             
         Returns:
-            DataFrame with MA/EMA columns added
+            (open, high, low, close, volume) tuple of float64 ndarrays
         """
-        try:
-            # Simple Moving Averages
-            for period in self.config['ma_periods']:
-                df[f'SMA_{period}'] = ta.SMA(df['close'], timeperiod=period)
-            
-            # Exponential Moving Averages
-            for period in self.config['ema_periods']:
-                df[f'EMA_{period}'] = ta.EMA(df['close'], timeperiod=period)
-            
-            # Price relative to MAs
-            df['price_above_sma_7'] = (df['close'] > df['SMA_7']).astype(int)
-            df['price_above_ema_25'] = (df['close'] > df['EMA_25']).astype(int)
-            
-            self.logger.debug("Added moving averages")
-            return df
+        return tuple(df[col].to_numpy(dtype=np.float64) for col in ('open', 'high', 'low', 'close', 'volume'))
+    
+    def add_moving_averages(self, c: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Add Simple Moving Averages (SMA) and Exponential Moving Averages (EMA)
+        
+        Args:
+            c: Close prices
             
-        except Exception as e:
-            self.logger.error(f"Error adding moving averages: {e}")
-            raise
+        Returns:
+            Dict of MA/EMA feature columns
+        """
+        features = {}
+        
+        # Simple Moving Averages
+        for period in self.config['ma_periods']:
+            features[f'SMA_{period}'] = indicators.sma(c, period)
+        
+        # Exponential Moving Averages
+        for period in self.config['ema_periods']:
+            features[f'EMA_{period}'] = indicators.ema(c, period)
+        
+        # Price relative to MAs
+        features['price_above_sma_7'] = _flag(c > features['SMA_7'])
+        features['price_above_ema_25'] = _flag(c > features['EMA_25'])
+        
+        return features
     
-    def add_rsi(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_rsi(self, c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add Relative Strength Index (RSI)
         
         Args:
-            df: DataFrame with OHLCV data
+            c: Close prices
             
         Returns:
-            DataFrame with RSI column added
+            Dict of RSI feature columns
         """
-        try:
-            period = self.config['rsi_period']
-            df['RSI'] = ta.RSI(df['close'], timeperiod=period)
-            
-            # RSI zones
-            df['RSI_oversold'] = (df['RSI'] < 30).astype(int)
-            df['RSI_overbought'] = (df['RSI'] > 70).astype(int)
-            
-            self.logger.debug("Added RSI")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding RSI: {e}")
-            raise
+        rsi = indicators.rsi(c, self.config['rsi_period'])
+        
+        # RSI zones
+        features = {
+            'RSI': rsi,
+            'RSI_oversold': _flag(rsi < 30),
+            'RSI_overbought': _flag(rsi > 70)
+        }
+        
+        return features
     
-    def add_macd(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_macd(self, c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add MACD (Moving Average Convergence Divergence)
         
         Args:
-            df: DataFrame with OHLCV data
+            c: Close prices
             
         Returns:
-            DataFrame with MACD columns added
+            Dict of MACD feature columns
         """
-        try:
-            macd, signal, hist = ta.MACD(
-                df['close'],
-                fastperiod=self.config['macd_fast'],
-                slowperiod=self.config['macd_slow'],
-                signalperiod=self.config['macd_signal']
-            )
-            
-            df['MACD'] = macd
-            df['MACD_signal'] = signal
-            df['MACD_hist'] = hist
-            
-            # MACD crossovers
-            df['MACD_bullish'] = ((df['MACD'] > df['MACD_signal']) & 
-                                   (df['MACD'].shift(1) <= df['MACD_signal'].shift(1))).astype(int)
-            df['MACD_bearish'] = ((df['MACD'] < df['MACD_signal']) & 
-                                   (df['MACD'].shift(1) >= df['MACD_signal'].shift(1))).astype(int)
-            
-            self.logger.debug("Added MACD")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding MACD: {e}")
-            raise
+        macd, signal, hist = indicators.macd(
+            c,
+            self.config['macd_fast'],
+            self.config['macd_slow'],
+            self.config['macd_signal']
+        )
+        
+        # MACD crossovers (the histogram is macd - signal)
+        bullish, bearish = kernels.crossovers(hist)
+        features = {
+            'MACD': macd,
+            'MACD_signal': signal,
+            'MACD_hist': hist,
+            'MACD_bullish': bullish,
+            'MACD_bearish': bearish
+        }
+        
+        return features
     
-    def add_bollinger_bands(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_bollinger_bands(self, c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add Bollinger Bands
         
         Args:
-            df: DataFrame with OHLCV data
+            c: Close prices
             
         Returns:
-            DataFrame with Bollinger Bands columns added
+            Dict of Bollinger Bands feature columns
         """
-        try:
-            upper, middle, lower = ta.BBANDS(
-                df['close'],
-                timeperiod=self.config['bb_period'],
-                nbdevup=self.config['bb_std'],
-                nbdevdn=self.config['bb_std']
-            )
-            
-            df['BB_upper'] = upper
-            df['BB_middle'] = middle
-            df['BB_lower'] = lower
-            df['BB_width'] = (upper - lower) / middle
-            
+        upper, middle, lower = indicators.bbands(
+            c,
+            self.config['bb_period'],
+            float(self.config['bb_std'])
+        )
+        
+        width, position = kernels.band_position(c, upper, middle, lower)
+        features = {
+            'BB_upper': upper,
+            'BB_middle': middle,
+            'BB_lower': lower,
+            'BB_width': width,
             # Price position in BB
-            df['BB_position'] = (df['close'] - lower) / (upper - lower)
-            df['price_below_bb_lower'] = (df['close'] < lower).astype(int)
-            df['price_above_bb_upper'] = (df['close'] > upper).astype(int)
-            
-            self.logger.debug("Added Bollinger Bands")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding Bollinger Bands: {e}")
-            raise
+            'BB_position': position,
+            'price_below_bb_lower': _flag(c < lower),
+            'price_above_bb_upper': _flag(c > upper)
+        }
+        
+        return features
     
-    def add_volume_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_volume_indicators(self, c: np.ndarray, v: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add volume-based indicators
         
         Args:
-            df: DataFrame with OHLCV data
+            c: Close prices
+            v: Volumes
             
         Returns:
-            DataFrame with volume indicators added
+            Dict of volume feature columns
         """
-        try:
-            # Volume MA
-            df['volume_MA'] = ta.SMA(df['volume'], timeperiod=self.config['volume_ma_period'])
-            df['volume_ratio'] = df['volume'] / df['volume_MA']
-            
-            # OBV (On-Balance Volume)
-            df['OBV'] = ta.OBV(df['close'], df['volume'])
-            
-            # Volume spike
-            df['volume_spike'] = (df['volume'] > df['volume_MA'] * 2).astype(int)
-            
-            self.logger.debug("Added volume indicators")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding volume indicators: {e}")
-            raise
+        # Volume MA
+        volume_ma = indicators.sma(v, self.config['volume_ma_period'])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features = {
+                'volume_MA': volume_ma,
+                'volume_ratio': v / volume_ma,
+                # OBV (On-Balance Volume)
+                'OBV': ta.OBV(c, v),
+                # Volume spike
+                'volume_spike': _flag(v > volume_ma * 2)
+            }
+        
+        return features
     
-    def add_atr(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_atr(self, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add Average True Range (ATR) for volatility
         
         Args:
-            df: DataFrame with OHLCV data
+            h: High prices
+            l: Low prices
+            c: Close prices
             
         Returns:
-            DataFrame with ATR column added
+            Dict of ATR feature columns
         """
-        try:
-            df['ATR'] = ta.ATR(
-                df['high'], 
-                df['low'], 
-                df['close'], 
-                timeperiod=self.config['atr_period']
-            )
-            
-            # ATR percentage
-            df['ATR_pct'] = (df['ATR'] / df['close']) * 100
-            
-            self.logger.debug("Added ATR")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding ATR: {e}")
-            raise
+        atr = indicators.atr(h, l, c, self.config['atr_period'])
+        
+        # ATR percentage
+        features = {
+            'ATR': atr,
+            'ATR_pct': (atr / c) * 100
+        }
+        
+        return features
     
-    def add_candlestick_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_candlestick_patterns(self, o: np.ndarray, h: np.ndarray, l: np.ndarray,
+                                 c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add candlestick pattern recognition
         
         Args:
-            df: DataFrame with OHLCV data
+            o: Open prices
+            h: High prices
+            l: Low prices
+            c: Close prices
             
         Returns:
-            DataFrame with candlestick pattern columns added
+            Dict of candlestick pattern feature columns
         """
-        try:
+        names = (
             # Bullish patterns
-            df['pattern_hammer'] = ta.CDLHAMMER(df['open'], df['high'], df['low'], df['close'])
-            df['pattern_engulfing_bull'] = ta.CDLENGULFING(df['open'], df['high'], df['low'], df['close'])
-            df['pattern_morning_star'] = ta.CDLMORNINGSTAR(df['open'], df['high'], df['low'], df['close'])
-            
+            'pattern_hammer', 'pattern_engulfing_bull', 'pattern_morning_star',
             # Bearish patterns
-            df['pattern_shooting_star'] = ta.CDLSHOOTINGSTAR(df['open'], df['high'], df['low'], df['close'])
-            df['pattern_engulfing_bear'] = ta.CDLEVENINGSTAR(df['open'], df['high'], df['low'], df['close'])
-            
+            'pattern_shooting_star', 'pattern_engulfing_bear',
             # Doji (indecision)
-            df['pattern_doji'] = ta.CDLDOJI(df['open'], df['high'], df['low'], df['close'])
-            
-            # Normalize pattern values to 0/1/-1
-            pattern_cols = [col for col in df.columns if col.startswith('pattern_')]
-            for col in pattern_cols:
-                df[col] = df[col] / 100  # TA-Lib returns -100, 0, or 100
-            
-            self.logger.debug("Added candlestick patterns")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding candlestick patterns: {e}")
-            raise
+            'pattern_doji'
+        )
+        recognizers = (
+            ta.CDLHAMMER, ta.CDLENGULFING, ta.CDLMORNINGSTAR,
+            ta.CDLSHOOTINGSTAR, ta.CDLEVENINGSTAR,
+            ta.CDLDOJI
+        )
+        
+        # One pattern per row, so each column below is a contiguous slice;
+        # TA-Lib's int32 output is cast straight into the float32 block
+        patterns = np.empty((len(recognizers), len(c)), dtype=np.float32)
+        for row, recognize in zip(patterns, recognizers):
+            row[:] = recognize(o, h, l, c)
+        
+        # Normalize pattern values to 0/1/-1 in a single pass over the block
+        patterns /= np.float32(100)  # TA-Lib returns -100, 0, or 100
+        features = dict(zip(names, patterns))
+        
+        return features
     
-    def add_momentum_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_momentum_indicators(self, h: np.ndarray, l: np.ndarray, c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add momentum indicators
         
         Args:
-            df: DataFrame with OHLCV data
+            h: High prices
+            l: Low prices
+            c: Close prices
             
         Returns:
-            DataFrame with momentum indicators added
+            Dict of momentum feature columns
         """
-        try:
-            # Stochastic
-            slowk, slowd = ta.STOCH(
-                df['high'], 
-                df['low'], 
-                df['close'],
-                fastk_period=14,
-                slowk_period=3,
-                slowd_period=3
-            )
-            df['STOCH_K'] = slowk
-            df['STOCH_D'] = slowd
-            
+        # Stochastic
+        slowk, slowd = ta.STOCH(
+            h,
+            l,
+            c,
+            fastk_period=14,
+            slowk_period=3,
+            slowd_period=3
+        )
+        
+        features = {
+            'STOCH_K': slowk,
+            'STOCH_D': slowd,
             # ADX (Average Directional Index)
-            df['ADX'] = ta.ADX(df['high'], df['low'], df['close'], timeperiod=14)
-            
+            'ADX': ta.ADX(h, l, c, timeperiod=14),
             # CCI (Commodity Channel Index)
-            df['CCI'] = ta.CCI(df['high'], df['low'], df['close'], timeperiod=20)
-            
+            'CCI': ta.CCI(h, l, c, timeperiod=20),
             # Williams %R
-            df['WILLR'] = ta.WILLR(df['high'], df['low'], df['close'], timeperiod=14)
-            
-            self.logger.debug("Added momentum indicators")
-            return df
-            
-        except Exception as e:
-            self.logger.error(f"Error adding momentum indicators: {e}")
-            raise
+            'WILLR': ta.WILLR(h, l, c, timeperiod=14)
+        }
+        
+        return features
+    
+    @staticmethod
+    def _pct_change(x: np.ndarray, periods: int) -> np.ndarray:
+        """Relative change over `periods` bars (like Series.pct_change), written into one buffer"""
+        # Only the undefined prefix is filled; the rest is written by the divide
+        out = np.empty(len(x))
+        out[:periods] = np.nan
+        if periods < len(x):
+            np.divide(x[periods:], x[:-periods], out=out[periods:])
+            out[periods:] -= 1
+        return out
     
-    def add_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_price_features(self, o: np.ndarray, h: np.ndarray, l: np.ndarray,
+                           c: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Add price-based features
         
+        Args:
+            o: Open prices
+            h: High prices
+            l: Low prices
+            c: Close prices
+            
+        Returns:
+            Dict of price feature columns
+        """
+        # Range, body, shadows and gap in one pass
+        hl_range, body_size, upper_shadow, lower_shadow, gap, gap_pct = kernels.candle_shape(o, h, l, c)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features = {
+                # Price changes
+                'price_change': self._pct_change(c, 1),
+                'price_change_2': self._pct_change(c, 2),
+                'price_change_5': self._pct_change(c, 5),
+                'hl_range': hl_range,
+                'body_size': body_size,
+                'upper_shadow': upper_shadow,
+                'lower_shadow': lower_shadow,
+                'gap': gap,
+                'gap_pct': gap_pct
+            }
+        
+        return features
+    
+    def extract_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Extract all technical indicators and features
+        
+        The OHLCV columns are read into arrays once and every indicator works
+        on those; the feature columns are then joined to the input in a
+        single frame construction (see _feature_frame).
+        
+        Results for the last FEATURE_CACHE_SIZE inputs are kept, keyed by a
+        content hash of the frame, so backtests and parameter searches that
+        revisit the same candles skip the indicator work.
+        
         Args:
             df: DataFrame with OHLCV data
             
         Returns:
-            DataFrame with price features added
+            DataFrame with all features added
         """
         try:
-            # Price changes
-            df['price_change'] = df['close'].pct_change()
-            df['price_change_2'] = df['close'].pct_change(periods=2)
-            df['price_change_5'] = df['close'].pct_change(periods=5)
-            
-            # High-Low range
-            df['hl_range'] = (df['high'] - df['low']) / df['close']
-            
-            # Body size (open-close)
-            df['body_size'] = abs(df['open'] - df['close']) / df['close']
+            key = hashlib.blake2b(pd.util.hash_pandas_object(df, index=True).to_numpy(), digest_size=16)
+            key.update(repr(list(df.columns)).encode())
+            key = key.digest()
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.logger.debug("Feature cache hit")
+                return cached.copy(deep=False)
+            
+            o, h, l, c, v = self._extract_arrays(df)
+            warmup = min(self._warmup, len(df))
+            groups = (
+                (self.add_moving_averages, c),
+                (self.add_rsi, c),
+                (self.add_macd, c),
+                (self.add_bollinger_bands, c),
+                (self.add_volume_indicators, c, v),
+                (self.add_atr, h, l, c),
+                (self.add_candlestick_patterns, o, h, l, c),
+                (self.add_momentum_indicators, h, l, c),
+                (self.add_price_features, o, h, l, c)
+            )
+            if len(df) >= PARALLEL_MIN_BARS:
+                # Groups only read the shared arrays; merge in the fixed order
+                futures = [_indicator_pool.submit(*group) for group in groups]
+                parts = [future.result() for future in futures]
+            else:
+                parts = [fn(*args) for fn, *args in groups]
+            features = {name: col for part in parts for name, col in part.items()}
+            df = pd.concat([df, self._feature_frame(features, df.index)], axis=1)
             
-            # Upper/lower shadows
-            df['upper_shadow'] = (df['high'] - df[['open', 'close']].max(axis=1)) / df['close']
-            df['lower_shadow'] = (df[['open', 'close']].min(axis=1) - df['low']) / df['close']
+            # Drop NaN rows (from indicator calculations): the warm-up prefix is
+            # known up front, only degenerate bars (e.g. 0/0 on a flat band) can follow it
+            initial_rows = len(df)
+            df = df.iloc[warmup:]
+            if any(np.isnan(col[warmup:]).any() for col in features.values() if col.dtype != np.int8):
+                df = df.dropna()
+            dropped_rows = initial_rows - len(df)
             
-            # Gap
-            df['gap'] = df['open'] - df['close'].shift(1)
-            df['gap_pct'] = df['gap'] / df['close'].shift(1)
+            self.logger.info(f"Feature extraction complete. Dropped {dropped_rows} NaN rows, "
+                             f"total features: {len(df.columns)}")
             
-            self.logger.debug("Added price features")
-            return df
+            self._cache[key] = df
+            if len(self._cache) > FEATURE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return df.copy(deep=False)
             
         except Exception as e:
-            self.logger.error(f"Error adding price features: {e}")
+            self.logger.error(f"Error extracting features: {e}")
             raise
     
-    def extract_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _feature_frame(features: Dict[str, np.ndarray], index: pd.Index) -> pd.DataFrame:
         """
-        Extract all technical indicators and features
+        Wrap feature columns as a DataFrame backed by two preallocated blocks
+        
+        Values go into one float32 block and 0/1 flags into one int8 block,
+        each filled column by column and handed to pandas without a further
+        copy or consolidation. Models consume float32, so the values they see
+        are unchanged.
+        
+        Args:
+            features: Feature name -> column, in output order
+            index: Row index
+            
+        Returns:
+            DataFrame with the feature columns in the order given
+        """
+        frames = []
+        for dtype in (np.float32, np.int8):
+            names = [name for name, col in features.items() if (col.dtype == np.int8) == (dtype is np.int8)]
+            # (columns, rows) layout is what pandas stores a block as
+            block = np.empty((len(names), len(index)), dtype=dtype)
+            for row, name in zip(block, names):
+                row[:] = features[name]
+            frames.append(pd.DataFrame(block.T, index=index, columns=names, copy=False))
+        return pd.concat(frames, axis=1)[list(features)]
+    
+    def max_window(self) -> int:
+        """
+        Longest lookback (in bars) needed by any configured indicator
+        
+        Returns:
+            Number of bars
+        """
+        periods = list(self.config['ma_periods']) + list(self.config['ema_periods'])
+        periods += [
+            self.config['rsi_period'],
+            self.config['macd_slow'] + self.config['macd_signal'],
+            self.config['bb_period'],
+            self.config['volume_ma_period'],
+            self.config['atr_period'],
+            2 * 14,  # ADX
+            20  # CCI
+        ]
+        return max(periods)
+    
+    def warmup_bars(self) -> int:
+        """
+        Number of leading bars for which some indicator is still undefined (NaN)
+        
+        Returns:
+            Number of bars
+        """
+        cfg = self.config
+        return max(
+            max(cfg['ma_periods']) - 1,
+            max(cfg['ema_periods']) - 1,
+            cfg['rsi_period'],
+            max(cfg['macd_fast'], cfg['macd_slow']) + cfg['macd_signal'] - 2,
+            cfg['bb_period'] - 1,
+            cfg['volume_ma_period'] - 1,
+            cfg['atr_period'],
+            2 * 14 - 1,  # ADX
+            13 + 2 + 2,  # Stochastic (14, 3, 3)
+            20 - 1,  # CCI
+            14 - 1,  # Williams %R
+            5  # price_change_5
+        )
+    
+    def extract_tail_features(self, df: pd.DataFrame, tail: int = 1,
+                              lookback: Optional[int] = None) -> pd.DataFrame:
+        """
+        Extract features for the last rows only
+        
+        Indicators are computed on `df.tail(tail + lookback)` instead of the
+        whole frame. The default lookback is twice the longest indicator
+        window, which leaves the recursive indicators (EMA, RSI, ATR, ADX)
+        enough warm-up bars to converge.
         
         Args:
             df: DataFrame with OHLCV data
+            tail: Number of feature rows to return
+            lookback: Warm-up bars before the tail (default: 2 * max_window())
             
         Returns:
-            DataFrame with all features added
+            DataFrame with all features for the last `tail` rows
+        """
+        if lookback is None:
+            lookback = 2 * self.max_window()
+        
+        # extract_all_features leaves its input untouched, so no copy is needed
+        return self.extract_all_features(df.tail(tail + lookback)).tail(tail)
+    
+    def fit_normalizer(self, df: pd.DataFrame, feature_cols: List[str], method: str = 'standard',
+                       path: Optional[str] = None):
+        """
+        Fit the feature scaler once (on training data) and optionally persist it
+        
+        int8 flag columns are already 0/1 and are left out of the scaler.
+        
+        Args:
+            df: DataFrame with features
+            feature_cols: List of column names to normalize
+            method: 'standard' (StandardScaler) or 'minmax' (MinMaxScaler)
+            path: Where to save the fitted scaler with joblib (not saved if None)
         """
         try:
-            self.logger.info("Extracting all features...")
-            
-            df = self.add_moving_averages(df)
-            df = self.add_rsi(df)
-            df = self.add_macd(df)
-            df = self.add_bollinger_bands(df)
-            df = self.add_volume_indicators(df)
-            df = self.add_atr(df)
-            df = self.add_candlestick_patterns(df)
-            df = self.add_momentum_indicators(df)
-            df = self.add_price_features(df)
-            
-            # Drop NaN rows (from indicator calculations)
-            initial_rows = len(df)
-            df = df.dropna()
-            dropped_rows = initial_rows - len(df)
+            # copy=False lets transform scale the float32 block in place
+            if method == 'standard':
+                scaler = StandardScaler(copy=False)
+            elif method == 'minmax':
+                scaler = MinMaxScaler(copy=False)
+            else:
+                raise ValueError(f"Unknown normalization method: {method}")
             
-            self.logger.info(f"Feature extraction complete. Dropped {dropped_rows} NaN rows.")
-            self.logger.info(f"Total features: {len(df.columns)}")
+            self.scaler_cols = [col for col in feature_cols if df[col].dtype != np.int8]
+            self.scaler = scaler.fit(df[self.scaler_cols].to_numpy(dtype=np.float32))
             
-            return df
+            if path:
+                joblib.dump({'scaler': self.scaler, 'columns': self.scaler_cols}, path)
+                self.logger.info(f"Scaler saved to {path}")
             
         except Exception as e:
-            self.logger.error(f"Error extracting features: {e}")
+            self.logger.error(f"Error fitting normalizer: {e}")
             raise
     
+    def load_normalizer(self, path: str):
+        """
+        Load a scaler saved by fit_normalizer
+        
+        Args:
+            path: Path of the saved scaler
+        """
+        try:
+            saved = joblib.load(path)
+            self.scaler = saved['scaler']
+            self.scaler_cols = saved['columns']
+            self.logger.info(f"Scaler loaded from {path}")
+            
+        except Exception as e:
+            self.logger.error(f"Error loading normalizer: {e}")
+            raise
+    
+    def prime(self, df: pd.DataFrame):
+        """
+        Start online feature updates from a history of closed candles
+        
+        Args:
+            df: DataFrame with OHLCV data (closed candles only, oldest first)
+        """
+        self._online = OnlineFeatures(self.config)
+        for bar in df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64):
+            self._online.push(*bar)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Primed online features with {len(df)} candles")
+    
+    def update(self, bar, commit: bool = True) -> Dict[str, float]:
+        """
+        Features of the candle following the primed history, in O(1)
+        
+        Recursive indicators carry their state forward instead of being
+        recomputed over the whole window; values match extract_all_features
+        run on the full history.
+        
+        Args:
+            bar: Candle as (open, high, low, close, volume)
+            commit: Add the candle to the history (False for a candle still forming)
+            
+        Returns:
+            Dict of feature name -> value (NaN while indicators warm up)
+        """
+        if self._online is None:
+            raise RuntimeError("Online features not primed, call prime() first")
+        
+        features = self._online.peek(*bar)
+        if commit:
+            self._online.push(*bar)
+        return features
+    
     def normalize_features(self, df: pd.DataFrame, feature_cols: List[str], 
-                          method: str = 'standard') -> pd.DataFrame:
+                          method: str = 'standard', path: Optional[str] = None) -> pd.DataFrame:
         """
         Normalize features for ML model
         
+        Uses the statistics of the scaler fitted by fit_normalizer, so
+        inference windows are scaled like the training data instead of being
+        refitted on every call. If no scaler is fitted yet, it is loaded from
+        `path` when that exists, otherwise fitted on this frame.
+        
         Args:
             df: DataFrame with features
             feature_cols: List of column names to normalize
-            method: 'standard' (StandardScaler) or 'minmax' (MinMaxScaler)
+            method: 'standard' or 'minmax', used only when fitting here
+            path: Saved scaler to load (or save to, when fitting here)
             
         Returns:
             DataFrame with normalized features
         """
         try:
-            if method == 'standard':
-                scaler = StandardScaler()
-            elif method == 'minmax':
-                scaler = MinMaxScaler()
-            else:
-                raise ValueError(f"Unknown normalization method: {method}")
+            if not hasattr(self.scaler, 'n_features_in_'):
+                if path and os.path.exists(path):
+                    self.load_normalizer(path)
+                else:
+                    self.fit_normalizer(df, feature_cols, method, path)
             
-            df[feature_cols] = scaler.fit_transform(df[feature_cols])
+            arr = df[self.scaler_cols].to_numpy(dtype=np.float32)
+            df[self.scaler_cols] = self.scaler.transform(arr)
             
-            self.logger.debug(f"Normalized features using {method} scaling")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Normalized features using {type(self.scaler).__name__}")
             return df
             
         except Exception as e:
@@ -410,6 +659,10 @@ class FeatureEngineer:
         """
         Create windowed dataset for time series models (e.g., LSTM)
         
+        X is a read-only strided view over the float32 feature block (no
+        per-window copies); pass it through np.ascontiguousarray if the
+        consumer needs its own contiguous buffer.
+        
         Args:
             df: DataFrame with features
             feature_cols: List of feature column names
@@ -419,17 +672,18 @@ class FeatureEngineer:
             (X, y) tuple where X is (samples, timesteps, features) and y is target
         """
         try:
-            X, y = [], []
-            
-            data = df[feature_cols].values
+            data = df[feature_cols].to_numpy(dtype=np.float32)
+            close = df['close'].to_numpy()
             
-            for i in range(window_size, len(data)):
-                X.append(data[i-window_size:i])
+            if len(data) <= window_size:
+                X = np.empty((0, window_size, len(feature_cols)), dtype=np.float32)
+                y = np.empty(0, dtype=np.int8)
+            else:
+                # Window k covers rows k..k+window_size-1; the last one has no next bar
+                windows = np.lib.stride_tricks.sliding_window_view(data, (window_size, data.shape[1]))[:, 0]
+                X = windows[:-1]
                 # Target: 1 if price goes up, 0 if down
-                y.append(1 if df['close'].iloc[i] > df['close'].iloc[i-1] else 0)
-            
-            X = np.array(X)
-            y = np.array(y)
+                y = (close[window_size:] > close[window_size - 1:-1]).astype(np.int8)
             
             self.logger.info(f"Created windowed dataset: X shape {X.shape}, y shape {y.shape}")
             return X, y
@@ -438,6 +692,28 @@ class FeatureEngineer:
             self.logger.error(f"Error creating windowed dataset: {e}")
             raise
     
+    def feature_columns(self) -> List[str]:
+        """
+        Feature column names produced by extract_all_features for this config
+        
+        Runs the pipeline once on a small synthetic OHLCV frame, so the
+        result can be computed up front and reused for every prediction.
+        
+        Returns:
+            List of feature column names
+        """
+        n = 3 * self.max_window()
+        t = np.arange(n, dtype=np.float64)
+        close = 100 + np.sin(t / 7) + t / 100
+        df = pd.DataFrame({
+            'open': close - 0.1,
+            'high': close + 0.5,
+            'low': close - 0.5,
+            'close': close,
+            'volume': 1000 + 100 * np.cos(t / 5)
+        })
+        return self.get_feature_columns(self.extract_all_features(df))
+    
     def get_feature_columns(self, df: pd.DataFrame, exclude_base: bool = True) -> List[str]:
         """
         Get list of feature column names (excluding OHLCV base columns)
@@ -0,0 +1,238 @@
+"""
+Indicator Kernels
+Numba-compiled replacements for the TA-Lib indicators used by FeatureEngineer
+(SMA, EMA, RSI, MACD, Bollinger Bands, ATR)
+
+The kernels follow TA-Lib's seeding and smoothing rules (SMA-seeded EMA,
+Wilder smoothing for RSI/ATR, MACD fast EMA seeded at the slow lookback) so
+features match those a model was trained on. Leading values that TA-Lib
+leaves undefined are NaN.
+"""
+
+import numpy as np
+
+from utils._njit import njit
+
+
+@njit(cache=True, nogil=True)
+def _is_zero(value):
+    return -0.00000001 < value < 0.00000001
+
+
+@njit(cache=True, nogil=True)
+def sma(x, period):
+    """
+    Simple moving average
+
+    Args:
+        x: float64 input array
+        period: Window length
+
+    Returns:
+        float64 array, NaN for the first period-1 values
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+
+    total = 0.0
+    for i in range(period - 1):
+        total += x[i]
+    for i in range(period - 1, n):
+        total += x[i]
+        out[i] = total / period
+        total -= x[i - period + 1]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ema_into(x, period, first, out):
+    """EMA of x[first:] seeded with the SMA of its first `period` values"""
+    n = len(x)
+    seed = first + period - 1
+    if seed >= n:
+        return
+
+    total = 0.0
+    for i in range(first, seed + 1):
+        total += x[i]
+    prev = total / period
+    out[seed] = prev
+
+    k = 2.0 / (period + 1)
+    for i in range(seed + 1, n):
+        prev = (x[i] - prev) * k + prev
+        out[i] = prev
+
+
+@njit(cache=True, nogil=True)
+def ema(x, period):
+    """
+    Exponential moving average (SMA seeded)
+
+    Args:
+        x: float64 input array
+        period: Window length
+
+    Returns:
+        float64 array, NaN for the first period-1 values
+    """
+    out = np.full(len(x), np.nan)
+    _ema_into(x, period, 0, out)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi(x, period):
+    """
+    Relative Strength Index with Wilder smoothing
+
+    Args:
+        x: float64 close prices
+        period: Window length
+
+    Returns:
+        float64 array, NaN for the first `period` values
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, period + 1):
+        diff = x[i] - x[i - 1]
+        if diff < 0:
+            loss -= diff
+        else:
+            gain += diff
+    gain /= period
+    loss /= period
+
+    total = gain + loss
+    out[period] = 0.0 if _is_zero(total) else 100.0 * (gain / total)
+
+    for i in range(period + 1, n):
+        diff = x[i] - x[i - 1]
+        loss *= period - 1
+        gain *= period - 1
+        if diff < 0:
+            loss -= diff
+        else:
+            gain += diff
+        loss /= period
+        gain /= period
+
+        total = gain + loss
+        out[i] = 0.0 if _is_zero(total) else 100.0 * (gain / total)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def macd(x, fast, slow, signal):
+    """
+    Moving Average Convergence Divergence
+
+    Args:
+        x: float64 close prices
+        fast: Fast EMA period
+        slow: Slow EMA period
+        signal: Signal line EMA period
+
+    Returns:
+        (macd, signal, histogram) float64 arrays, NaN for the first slow+signal-2 values
+    """
+    if slow < fast:
+        fast, slow = slow, fast
+
+    n = len(x)
+    macd_out = np.full(n, np.nan)
+    signal_out = np.full(n, np.nan)
+    hist_out = np.full(n, np.nan)
+
+    # Both EMAs start at the slow lookback so the MACD line is defined from there
+    fast_ema = np.full(n, np.nan)
+    slow_ema = np.full(n, np.nan)
+    _ema_into(x, fast, slow - fast, fast_ema)
+    _ema_into(x, slow, 0, slow_ema)
+    line = fast_ema - slow_ema
+
+    signal_line = np.full(n, np.nan)
+    _ema_into(line, signal, slow - 1, signal_line)
+
+    for i in range(slow + signal - 2, n):
+        macd_out[i] = line[i]
+        signal_out[i] = signal_line[i]
+        hist_out[i] = line[i] - signal_line[i]
+    return macd_out, signal_out, hist_out
+
+
+@njit(cache=True, nogil=True)
+def bbands(x, period, nbdev):
+    """
+    Bollinger Bands around an SMA using the population standard deviation
+
+    Args:
+        x: float64 close prices
+        period: Window length
+        nbdev: Band width in standard deviations
+
+    Returns:
+        (upper, middle, lower) float64 arrays, NaN for the first period-1 values
+    """
+    n = len(x)
+    middle = sma(x, period)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    if n < period:
+        return upper, middle, lower
+
+    total2 = 0.0
+    for i in range(period - 1):
+        total2 += x[i] * x[i]
+    for i in range(period - 1, n):
+        total2 += x[i] * x[i]
+        variance = total2 / period - middle[i] * middle[i]
+        total2 -= x[i - period + 1] * x[i - period + 1]
+
+        std = np.sqrt(variance) if variance >= 0.00000001 else 0.0
+        upper[i] = middle[i] + std * nbdev
+        lower[i] = middle[i] - std * nbdev
+    return upper, middle, lower
+
+
+@njit(cache=True, nogil=True)
+def atr(high, low, close, period):
+    """
+    Average True Range with Wilder smoothing
+
+    Args:
+        high: float64 high prices
+        low: float64 low prices
+        close: float64 close prices
+        period: Window length
+
+    Returns:
+        float64 array, NaN for the first `period` values
+    """
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    tr = np.empty(n)
+    for i in range(1, n):
+        tr[i] = max(high[i] - low[i], abs(close[i - 1] - high[i]), abs(close[i - 1] - low[i]))
+
+    total = 0.0
+    for i in range(1, period + 1):
+        total += tr[i]
+    prev = total / period
+    out[period] = prev
+
+    for i in range(period + 1, n):
+        prev = (prev * (period - 1) + tr[i]) / period
+        out[i] = prev
+    return out
@@ -3,11 +3,41 @@ Logging Module
 Custom logger with file rotation and formatting
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from datetime import datetime
-import colorlog
+
+from utils.trade import Trade
+
+
+class ColorFormatter(logging.Formatter):
+    """
+    Console formatter with per-level ANSI colors
+    
+    Escape codes are looked up from a prebuilt table and the line is built
+    with a single f-string, instead of colorlog's per-record color parsing.
+    """
+    
+    COLORS = {
+        logging.DEBUG: '\x1b[36m',  # cyan
+        logging.INFO: '\x1b[32m',  # green
+        logging.WARNING: '\x1b[33m',  # yellow
+        logging.ERROR: '\x1b[31m',  # red
+        logging.CRITICAL: '\x1b[31m\x1b[47m'  # red on white
+    }
+    RESET = '\x1b[0m'
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        return (f"{self.COLORS.get(record.levelno, '')}{self.formatTime(record, self.datefmt)} - "
+                f"{record.name} - {record.levelname} - {message}{self.RESET}")
 
 
 def setup_logger(name: str = 'bot', level: str = 'INFO', 
@@ -15,6 +45,11 @@ def setup_logger(name: str = 'bot', level: str = 'INFO',
     """
     Setup custom logger with file and console handlers
     
+    The logger itself only enqueues records; a QueueListener thread does the
+    formatting and file/console I/O (including rotation), so logging calls
+    never block the trading loop. The listener is kept as `logger._listener`
+    and flushed at exit.
+    
     Args:
         name: Logger name
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -31,8 +66,14 @@ def setup_logger(name: str = 'bot', level: str = 'INFO',
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper()))
     
-    # Clear existing handlers
+    # Clear existing handlers (and stop the previous listener, if any)
+    previous = getattr(logger, '_listener', None)
+    if previous is not None:
+        previous.stop()
+        atexit.unregister(previous.stop)
     logger.handlers.clear()
+    logger.propagate = False
+    handlers = []
     
     # Log format
     file_format = logging.Formatter(
@@ -41,17 +82,7 @@ def setup_logger(name: str = 'bot', level: str = 'INFO',
     )
     
     # Console format with colors
-    console_format = colorlog.ColoredFormatter(
-        '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'red,bg_white',
-        }
-    )
+    console_format = ColorFormatter(datefmt='%Y-%m-%d %H:%M:%S')
     
     # File handler - Daily rotation
     log_file = os.path.join(log_dir, f'{name}.log')
@@ -64,7 +95,7 @@ def setup_logger(name: str = 'bot', level: str = 'INFO',
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_format)
-    logger.addHandler(file_handler)
+    handlers.append(file_handler)
     
     # Error file handler - Separate file for errors
     error_file = os.path.join(log_dir, f'{name}_error.log')
@@ -76,60 +107,70 @@ def setup_logger(name: str = 'bot', level: str = 'INFO',
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(file_format)
-    logger.addHandler(error_handler)
+    handlers.append(error_handler)
     
     # Console handler
     if console:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(getattr(logging, level.upper()))
         console_handler.setFormatter(console_format)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    # Hand records to a background thread for formatting and I/O
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    logger._listener = listener
+    atexit.register(listener.stop)
     
     return logger
 
 
-def log_trade(logger: logging.Logger, trade_info: dict):
+def log_trade(logger: logging.Logger, trade: Trade):
     """
-    Log trade information in structured format
+    Log trade information in structured format (one multi-line record)
     
     Args:
         logger: Logger instance
-        trade_info: Trade information dict
+        trade: Executed trade
     """
-    logger.info("=" * 60)
-    logger.info("TRADE EXECUTED")
-    logger.info(f"Symbol: {trade_info.get('symbol')}")
-    logger.info(f"Side: {trade_info.get('side')}")
-    logger.info(f"Size: {trade_info.get('amount')}")
-    logger.info(f"Entry Price: {trade_info.get('entry_price')}")
-    logger.info(f"Stop Loss: {trade_info.get('stop_loss')}")
-    logger.info(f"Take Profit: {trade_info.get('take_profit')}")
-    logger.info(f"Signal Confidence: {trade_info.get('confidence', 'N/A')}")
-    logger.info(f"Timestamp: {trade_info.get('timestamp', datetime.now())}")
-    logger.info("=" * 60)
+    logger.info("\n".join((
+        "=" * 60,
+        "TRADE EXECUTED",
+        f"Symbol: {trade.symbol}",
+        f"Side: {trade.side.upper()}",
+        f"Size: {trade.amount}",
+        f"Entry Price: {trade.entry_price}",
+        f"Stop Loss: {trade.stop_loss}",
+        f"Take Profit: {trade.take_profit}",
+        f"Signal Confidence: {trade.confidence}",
+        f"Timestamp: {trade.timestamp}",
+        "=" * 60
+    )))
 
 
 def log_signal(logger: logging.Logger, signal: dict, features: dict = None):
     """
-    Log trading signal
+    Log trading signal (one multi-line record)
     
     Args:
         logger: Logger instance
         signal: Signal dict
         features: Optional feature values
     """
-    logger.info("-" * 60)
-    logger.info(f"SIGNAL: {signal.get('signal')} | Confidence: {signal.get('confidence', 0):.2%}")
+    lines = ["-" * 60, f"SIGNAL: {signal.get('signal')} | Confidence: {signal.get('confidence', 0):.2%}"]
     if signal.get('probabilities'):
-        logger.info(f"Probabilities: {signal.get('probabilities')}")
-    if features:
-        logger.debug(f"Features: {features}")
-    logger.info("-" * 60)
+        lines.append(f"Probabilities: {signal.get('probabilities')}")
+    lines.append("-" * 60)
+    logger.info("\n".join(lines))
+    if features and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Features: %s", features)
 
 
 def log_pnl(logger: logging.Logger, pnl_info: dict):
     """
-    Log profit/loss information
+    Log profit/loss information (one multi-line record)
     
     Args:
         logger: Logger instance
@@ -138,37 +179,41 @@ def log_pnl(logger: logging.Logger, pnl_info: dict):
     pnl = pnl_info.get('pnl', 0)
     log_level = logging.INFO if pnl >= 0 else logging.WARNING
     
-    logger.log(log_level, "=" * 60)
-    logger.log(log_level, f"POSITION CLOSED - {'PROFIT' if pnl >= 0 else 'LOSS'}")
-    logger.log(log_level, f"Symbol: {pnl_info.get('symbol')}")
-    logger.log(log_level, f"Side: {pnl_info.get('side')}")
-    logger.log(log_level, f"Entry: {pnl_info.get('entry_price')}")
-    logger.log(log_level, f"Exit: {pnl_info.get('exit_price')}")
-    logger.log(log_level, f"PnL: ${pnl:.2f} ({pnl_info.get('pnl_percent', 0):.2f}%)")
-    logger.log(log_level, f"Duration: {pnl_info.get('duration', 'N/A')}")
-    logger.log(log_level, "=" * 60)
+    logger.log(log_level, "\n".join((
+        "=" * 60,
+        f"POSITION CLOSED - {'PROFIT' if pnl >= 0 else 'LOSS'}",
+        f"Symbol: {pnl_info.get('symbol')}",
+        f"Side: {pnl_info.get('side')}",
+        f"Entry: {pnl_info.get('entry_price')}",
+        f"Exit: {pnl_info.get('exit_price')}",
+        f"PnL: ${pnl:.2f} ({pnl_info.get('pnl_percent', 0):.2f}%)",
+        f"Duration: {pnl_info.get('duration', 'N/A')}",
+        "=" * 60
+    )))
 
 
 def log_daily_summary(logger: logging.Logger, summary: dict):
     """
-    Log daily trading summary
+    Log daily trading summary (one multi-line record)
     
     Args:
         logger: Logger instance
         summary: Summary dict
     """
-    logger.info("=" * 60)
-    logger.info("DAILY SUMMARY")
-    logger.info(f"Date: {summary.get('date', datetime.now().date())}")
-    logger.info(f"Total Trades: {summary.get('total_trades', 0)}")
-    logger.info(f"Wins: {summary.get('wins', 0)}")
-    logger.info(f"Losses: {summary.get('losses', 0)}")
-    logger.info(f"Win Rate: {summary.get('win_rate', 0):.2%}")
-    logger.info(f"Total PnL: ${summary.get('total_pnl', 0):.2f}")
-    logger.info(f"Best Trade: ${summary.get('best_trade', 0):.2f}")
-    logger.info(f"Worst Trade: ${summary.get('worst_trade', 0):.2f}")
-    logger.info(f"Capital: ${summary.get('current_capital', 0):.2f}")
-    logger.info("=" * 60)
+    logger.info("\n".join((
+        "=" * 60,
+        "DAILY SUMMARY",
+        f"Date: {summary.get('date', datetime.now().date())}",
+        f"Total Trades: {summary.get('total_trades', 0)}",
+        f"Wins: {summary.get('wins', 0)}",
+        f"Losses: {summary.get('losses', 0)}",
+        f"Win Rate: {summary.get('win_rate', 0):.2%}",
+        f"Total PnL: ${summary.get('total_pnl', 0):.2f}",
+        f"Best Trade: ${summary.get('best_trade', 0):.2f}",
+        f"Worst Trade: ${summary.get('worst_trade', 0):.2f}",
+        f"Capital: ${summary.get('current_capital', 0):.2f}",
+        "=" * 60
+    )))
 
 
 def log_error_with_context(logger: logging.Logger, error: Exception, context: dict = None):
@@ -198,17 +243,18 @@ if __name__ == "__main__":
     logger.error("This is an error message")
     
     # Test trade logging
-    trade_info = {
-        'symbol': 'SOL/USDT:USDT',
-        'side': 'LONG',
-        'amount': 0.5,
-        'entry_price': 100.50,
-        'stop_loss': 98.00,
-        'take_profit': 104.00,
-        'confidence': 0.75,
-        'timestamp': datetime.now()
-    }
-    log_trade(logger, trade_info)
+    trade = Trade(
+        symbol='SOL/USDT:USDT',
+        side='long',
+        amount=0.5,
+        entry_price=100.50,
+        stop_loss=98.00,
+        take_profit=104.00,
+        confidence=0.75,
+        timestamp=datetime.now(),
+        order_id='test'
+    )
+    log_trade(logger, trade)
     
     # Test signal logging
     signal = {
@@ -3,12 +3,106 @@ Notifier Module
 Send notifications via Telegram
 """
 
+import html
 import logging
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
 import asyncio
-from telegram import Bot
-from telegram.error import TelegramError
+import threading
+import time
+
+from utils.trade import Trade
+
+
+# Telegram allows about one message per second to a single chat
+MIN_SEND_INTERVAL = 1.0
+MAX_SEND_RETRIES = 3
+
+# Messages arriving within this window (seconds) are combined into one send
+COALESCE_WINDOW = 0.2
+MAX_QUEUED_MESSAGES = 256
+MAX_MESSAGE_LENGTH = 4096
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+_SIDE_EMOJI = {'long': '📈', 'short': '📉'}
+_SIGNAL_EMOJI = {'BUY': '🟢', 'SELL': '🔴'}
+
+# Message templates, filled with str.format. Only free-text fields (error
+# messages, context, stop reason) are HTML-escaped; the rest come from the bot
+_TRADE_TEMPLATE = """
+🤖 <b>TRADE EXECUTED</b>
+
+📊 Symbol: <code>{symbol}</code>
+{side_emoji} Side: <b>{side}</b>
+💰 Size: <code>{amount:.4f}</code>
+💵 Entry: <code>${entry_price:.2f}</code>
+
+🛑 Stop Loss: <code>${stop_loss:.2f}</code>
+🎯 Take Profit: <code>${take_profit:.2f}</code>
+
+📊 Confidence: <b>{confidence:.1%}</b>
+🕐 Time: {time}
+"""
+
+_SIGNAL_TEMPLATE = """
+{emoji} <b>SIGNAL: {signal}</b>
+
+📊 Confidence: <b>{confidence:.1%}</b>
+🕐 Time: {time}
+"""
+
+_PNL_TEMPLATE = """
+{emoji} <b>POSITION CLOSED - {outcome}</b>
+
+📊 Symbol: <code>{symbol}</code>
+{side_emoji} Side: <b>{side}</b>
+
+💵 Entry: <code>${entry_price:.2f}</code>
+💵 Exit: <code>${exit_price:.2f}</code>
+
+💰 PnL: <b>${pnl:.2f}</b> ({pnl_percent:+.2f}%)
+⏱ Duration: {duration}
+"""
+
+_ERROR_TEMPLATE = """
+⚠️ <b>ERROR OCCURRED</b>
+
+🔴 Type: <code>{error_type}</code>
+📝 Message: {error}
+
+🕐 Time: {time}
+"""
+
+_SUMMARY_TEMPLATE = """
+{emoji} <b>DAILY SUMMARY</b>
+
+📅 Date: {date}
+
+📊 Trades: <b>{total_trades}</b>
+✅ Wins: <b>{wins}</b>
+❌ Losses: <b>{losses}</b>
+📈 Win Rate: <b>{win_rate:.1%}</b>
+
+💰 Total PnL: <b>${pnl:+.2f}</b>
+🔼 Best Trade: <code>${best_trade:.2f}</code>
+🔽 Worst Trade: <code>${worst_trade:.2f}</code>
+
+💵 Capital: <b>${current_capital:.2f}</b>
+"""
+
+_START_TEMPLATE = """
+🚀 <b>BOT STARTED</b>
+
+🕐 Time: {time}
+✅ Status: <b>Running</b>
+"""
+
+_STOP_TEMPLATE = """
+🛑 <b>BOT STOPPED</b>
+
+📝 Reason: {reason}
+🕐 Time: {time}
+"""
 
 
 class TelegramNotifier:
@@ -16,7 +110,8 @@ class TelegramNotifier:
     Send notifications via Telegram bot
     """
     
-    def __init__(self, bot_token: str, chat_id: str, enabled: bool = True):
+    def __init__(self, bot_token: str, chat_id: str, enabled: bool = True,
+                 connection_pool_size: int = 8, http_version: str = '1.1'):
         """
         Initialize Telegram notifier
         
@@ -24,16 +119,44 @@ class TelegramNotifier:
             bot_token: Telegram bot token
             chat_id: Telegram chat ID
             enabled: Enable/disable notifications
+            connection_pool_size: Keep-alive connections kept open to the Bot API
+            http_version: '1.1' or '2' (HTTP/2 needs the h2 package)
         """
         self.logger = logging.getLogger(__name__)
         self.enabled = enabled
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.bot = None
+        self._loop = None
+        self._thread = None
+        self._queue = asyncio.Queue(maxsize=MAX_QUEUED_MESSAGES)
+        self._consumer = None
+        self._send_lock = asyncio.Lock()
+        self._next_send = 0.0
         
         if enabled and bot_token and chat_id:
             try:
-                self.bot = Bot(token=bot_token)
+                # Imported only when enabled, so disabled deployments never load telegram/httpx
+                from telegram import Bot
+                from telegram.request import HTTPXRequest
+                
+                # A single pooled HTTP client keeps the TLS connection to the Bot API alive
+                request = HTTPXRequest(
+                    connection_pool_size=connection_pool_size,
+                    pool_timeout=5.0,
+                    connect_timeout=5.0,
+                    read_timeout=10.0,
+                    http_version=http_version
+                )
+                self.bot = Bot(token=bot_token, request=request)
+                
+                # One long-lived loop owns the bot (and its httpx client), so every send reuses them
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name='telegram-notifier', daemon=True
+                )
+                self._thread.start()
+                self._consumer = asyncio.run_coroutine_threadsafe(self._consume(), self._loop)
                 self.logger.info("Telegram notifier initialized")
             except Exception as e:
                 self.logger.error(f"Failed to initialize Telegram bot: {e}")
@@ -53,12 +176,34 @@ class TelegramNotifier:
             self.logger.debug("Telegram notification skipped (disabled)")
             return
         
+        from telegram.error import RetryAfter, TelegramError
+        
         try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=parse_mode
-            )
+            # Sends are serialized and spaced out so bursts don't trip the chat flood limit
+            async with self._send_lock:
+                delay = self._next_send - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                
+                try:
+                    for attempt in range(MAX_SEND_RETRIES + 1):
+                        try:
+                            await self.bot.send_message(
+                                chat_id=self.chat_id,
+                                text=message,
+                                parse_mode=parse_mode
+                            )
+                            break
+                        except RetryAfter as e:
+                            if attempt == MAX_SEND_RETRIES:
+                                raise
+                            wait_s = e.retry_after
+                            if isinstance(wait_s, timedelta):
+                                wait_s = wait_s.total_seconds()
+                            self.logger.warning(f"Telegram rate limit hit, retrying in {wait_s}s")
+                            await asyncio.sleep(wait_s)
+                finally:
+                    self._next_send = time.monotonic() + MIN_SEND_INTERVAL
             self.logger.debug("Telegram message sent")
         except TelegramError as e:
             self.logger.error(f"Failed to send Telegram message: {e}")
@@ -67,43 +212,120 @@ class TelegramNotifier:
     
     def send_message_sync(self, message: str, parse_mode: str = 'HTML'):
         """
-        Synchronous wrapper for send_message
+        Queue a message for the notifier's event loop without waiting for it
         
         Args:
             message: Message text
             parse_mode: Parse mode
         """
+        if self._loop is None:
+            self.logger.debug("Telegram notification skipped (disabled)")
+            return
+        
+        self._loop.call_soon_threadsafe(self._enqueue, message, parse_mode)
+    
+    def _enqueue(self, message: str, parse_mode: str):
+        """Add a message to the send queue, dropping the oldest one when full (runs on the loop)"""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.logger.warning("Telegram queue full, dropped the oldest message")
+        self._queue.put_nowait((message, parse_mode))
+    
+    async def _consume(self):
+        """Send queued messages, combining those that arrive within COALESCE_WINDOW"""
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(COALESCE_WINDOW)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                for message, parse_mode in self._coalesce(batch):
+                    await self.send_message(message, parse_mode)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    @staticmethod
+    def _coalesce(batch: List[Tuple[str, str]]) -> List[List[str]]:
+        """
+        Merge a burst of messages into as few sends as possible
+        
+        Identical messages are sent once with a repeat count; the rest are
+        joined in arrival order, up to Telegram's message length limit.
+        
+        Args:
+            batch: (message, parse_mode) pairs in arrival order
+            
+        Returns:
+            [message, parse_mode] pairs to send
+        """
+        counts = {}
+        for message, parse_mode in batch:
+            key = (message.strip(), parse_mode)
+            counts[key] = counts.get(key, 0) + 1
+        
+        merged = []
+        for (message, parse_mode), count in counts.items():
+            if count > 1:
+                message += f"\n(x{count})"
+            if (merged and merged[-1][1] == parse_mode
+                    and len(merged[-1][0]) + len(message) + 2 <= MAX_MESSAGE_LENGTH):
+                merged[-1][0] += "\n\n" + message
+            else:
+                merged.append([message, parse_mode])
+        return merged
+    
+    def close(self, timeout: float = 5.0):
+        """
+        Send queued messages and stop the background event loop
+        
+        Args:
+            timeout: Seconds to wait for the queue to drain and for the loop thread
+        """
+        if self._loop is None:
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop).result(timeout)
+        except Exception:
+            self.logger.warning(f"Telegram queue not drained within {timeout}s, remaining messages dropped")
+        self._loop.call_soon_threadsafe(self._consumer.cancel)
+        
+        # Close the pooled connections on the loop that opened them
         try:
-            asyncio.run(self.send_message(message, parse_mode))
-        except RuntimeError:
-            # If event loop is already running, create a new one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.send_message(message, parse_mode))
-            loop.close()
+            asyncio.run_coroutine_threadsafe(self.bot.shutdown(), self._loop).result(timeout)
+        except Exception as e:
+            self.logger.warning(f"Error closing Telegram connection pool: {e}")
+        
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+        self._loop = None
     
-    def notify_trade(self, trade_info: dict):
+    def notify_trade(self, trade: Trade):
         """
         Send trade notification
         
         Args:
-            trade_info: Trade information dict
+            trade: Executed trade
         """
-        message = f"""
-🤖 <b>TRADE EXECUTED</b>
-
-📊 Symbol: <code>{trade_info.get('symbol')}</code>
-{'📈' if trade_info.get('side') == 'LONG' else '📉'} Side: <b>{trade_info.get('side')}</b>
-💰 Size: <code>{trade_info.get('amount'):.4f}</code>
-💵 Entry: <code>${trade_info.get('entry_price'):.2f}</code>
-
-🛑 Stop Loss: <code>${trade_info.get('stop_loss'):.2f}</code>
-🎯 Take Profit: <code>${trade_info.get('take_profit'):.2f}</code>
-
-📊 Confidence: <b>{trade_info.get('confidence', 0):.1%}</b>
-🕐 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        self.send_message_sync(message)
+        if self._loop is None:
+            return
+        
+        self.send_message_sync(_TRADE_TEMPLATE.format(
+            symbol=trade.symbol,
+            side_emoji=_SIDE_EMOJI.get(trade.side, '📉'),
+            side=trade.side.upper(),
+            amount=trade.amount,
+            entry_price=trade.entry_price,
+            stop_loss=trade.stop_loss,
+            take_profit=trade.take_profit,
+            confidence=trade.confidence,
+            time=trade.timestamp.strftime(TIME_FORMAT)
+        ))
     
     def notify_signal(self, signal: dict):
         """
@@ -112,15 +334,15 @@ class TelegramNotifier:
         Args:
             signal: Signal dict
         """
-        emoji = '🟢' if signal['signal'] == 'BUY' else '🔴' if signal['signal'] == 'SELL' else '⚪'
+        if self._loop is None:
+            return
         
-        message = f"""
-{emoji} <b>SIGNAL: {signal['signal']}</b>
-
-📊 Confidence: <b>{signal.get('confidence', 0):.1%}</b>
-🕐 Time: {datetime.now().strftime('%H:%M:%S')}
-"""
-        self.send_message_sync(message)
+        self.send_message_sync(_SIGNAL_TEMPLATE.format(
+            emoji=_SIGNAL_EMOJI.get(signal['signal'], '⚪'),
+            signal=signal['signal'],
+            confidence=signal.get('confidence', 0),
+            time=time.strftime('%H:%M:%S')
+        ))
     
     def notify_pnl(self, pnl_info: dict):
         """
@@ -129,22 +351,24 @@ class TelegramNotifier:
         Args:
             pnl_info: PnL information dict
         """
+        if self._loop is None:
+            return
+        
         pnl = pnl_info.get('pnl', 0)
-        emoji = '✅' if pnl >= 0 else '❌'
+        side = pnl_info.get('side')
         
-        message = f"""
-{emoji} <b>POSITION CLOSED - {'PROFIT' if pnl >= 0 else 'LOSS'}</b>
-
-📊 Symbol: <code>{pnl_info.get('symbol')}</code>
-{'📈' if pnl_info.get('side') == 'LONG' else '📉'} Side: <b>{pnl_info.get('side')}</b>
-
-💵 Entry: <code>${pnl_info.get('entry_price'):.2f}</code>
-💵 Exit: <code>${pnl_info.get('exit_price'):.2f}</code>
-
-💰 PnL: <b>${pnl:.2f}</b> ({pnl_info.get('pnl_percent', 0):+.2f}%)
-⏱ Duration: {pnl_info.get('duration', 'N/A')}
-"""
-        self.send_message_sync(message)
+        self.send_message_sync(_PNL_TEMPLATE.format(
+            emoji='✅' if pnl >= 0 else '❌',
+            outcome='PROFIT' if pnl >= 0 else 'LOSS',
+            symbol=pnl_info.get('symbol'),
+            side_emoji=_SIDE_EMOJI.get(str(side).lower(), '📉'),
+            side=side,
+            entry_price=pnl_info.get('entry_price'),
+            exit_price=pnl_info.get('exit_price'),
+            pnl=pnl,
+            pnl_percent=pnl_info.get('pnl_percent', 0),
+            duration=pnl_info.get('duration', 'N/A')
+        ))
     
     def notify_error(self, error: Exception, context: dict = None):
         """
@@ -154,16 +378,16 @@ class TelegramNotifier:
             error: Exception object
             context: Additional context
         """
-        message = f"""
-⚠️ <b>ERROR OCCURRED</b>
-
-🔴 Type: <code>{type(error).__name__}</code>
-📝 Message: {str(error)}
-
-🕐 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        if self._loop is None:
+            return
+        
+        message = _ERROR_TEMPLATE.format(
+            error_type=type(error).__name__,
+            error=html.escape(str(error), quote=False),
+            time=time.strftime(TIME_FORMAT)
+        )
         if context:
-            message += f"\n📋 Context: <code>{context}</code>"
+            message += f"\n📋 Context: <code>{html.escape(str(context), quote=False)}</code>"
         
         self.send_message_sync(message)
     
@@ -174,37 +398,30 @@ class TelegramNotifier:
         Args:
             summary: Summary dict
         """
-        win_rate = summary.get('win_rate', 0)
+        if self._loop is None:
+            return
+        
         pnl = summary.get('total_pnl', 0)
-        emoji = '📈' if pnl >= 0 else '📉'
         
-        message = f"""
-{emoji} <b>DAILY SUMMARY</b>
-
-📅 Date: {summary.get('date', datetime.now().date())}
-
-📊 Trades: <b>{summary.get('total_trades', 0)}</b>
-✅ Wins: <b>{summary.get('wins', 0)}</b>
-❌ Losses: <b>{summary.get('losses', 0)}</b>
-📈 Win Rate: <b>{win_rate:.1%}</b>
-
-💰 Total PnL: <b>${pnl:+.2f}</b>
-🔼 Best Trade: <code>${summary.get('best_trade', 0):.2f}</code>
-🔽 Worst Trade: <code>${summary.get('worst_trade', 0):.2f}</code>
-
-💵 Capital: <b>${summary.get('current_capital', 0):.2f}</b>
-"""
-        self.send_message_sync(message)
+        self.send_message_sync(_SUMMARY_TEMPLATE.format(
+            emoji='📈' if pnl >= 0 else '📉',
+            date=summary.get('date') or time.strftime('%Y-%m-%d'),
+            total_trades=summary.get('total_trades', 0),
+            wins=summary.get('wins', 0),
+            losses=summary.get('losses', 0),
+            win_rate=summary.get('win_rate', 0),
+            pnl=pnl,
+            best_trade=summary.get('best_trade', 0),
+            worst_trade=summary.get('worst_trade', 0),
+            current_capital=summary.get('current_capital', 0)
+        ))
     
     def notify_start(self):
         """Send bot start notification"""
-        message = f"""
-🚀 <b>BOT STARTED</b>
-
-🕐 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-✅ Status: <b>Running</b>
-"""
-        self.send_message_sync(message)
+        if self._loop is None:
+            return
+        
+        self.send_message_sync(_START_TEMPLATE.format(time=time.strftime(TIME_FORMAT)))
     
     def notify_stop(self, reason: str = "User stopped"):
         """
@@ -213,14 +430,10 @@ class TelegramNotifier:
         Args:
             reason: Stop reason
         """
-        message = f"""
-🛑 <b>BOT STOPPED</b>
-
-📝 Reason: {reason}
-🕐 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        self.send_message_sync(message)
-
+        if self._loop is None:
+            return
+        
+        self.send_message_sync(_STOP_TEMPLATE.format(reason=html.escape(reason, quote=False), time=time.strftime(TIME_FORMAT)))
 
 if __name__ == "__main__":
     # Test notifier
@@ -235,16 +448,18 @@ if __name__ == "__main__":
     )
     
     # Test trade notification
-    trade_info = {
-        'symbol': 'SOL/USDT:USDT',
-        'side': 'LONG',
-        'amount': 0.5,
-        'entry_price': 100.50,
-        'stop_loss': 98.00,
-        'take_profit': 104.00,
-        'confidence': 0.75
-    }
-    notifier.notify_trade(trade_info)
+    trade = Trade(
+        symbol='SOL/USDT:USDT',
+        side='long',
+        amount=0.5,
+        entry_price=100.50,
+        stop_loss=98.00,
+        take_profit=104.00,
+        confidence=0.75,
+        timestamp=datetime.now(),
+        order_id='test'
+    )
+    notifier.notify_trade(trade)
     
     # Test signal notification
     signal = {
@@ -264,3 +479,4 @@ if __name__ == "__main__":
         'duration': '15 minutes'
     }
     notifier.notify_pnl(pnl_info)
+    notifier.close()
@@ -0,0 +1,327 @@
+"""
+Online Feature Updates
+Per-bar feature computation for the live loop, producing the same columns as
+FeatureEngineer.extract_all_features one candle at a time
+
+Recursive indicators (SMA/BB running sums, EMA, RSI, MACD, ATR, ADX, OBV)
+carry their state from bar to bar with the same seeding and arithmetic as
+the batch kernels and TA-Lib, so a new candle costs the same no matter how
+much history has been seen. Finite-window indicators (Stochastic, CCI,
+Williams %R, candlestick patterns) run TA-Lib on a short ring of recent bars.
+"""
+
+import math
+from typing import Dict
+
+import numpy as np
+import talib as ta
+
+# Bars handed to the finite-window TA-Lib indicators (longest lookback is 19, CCI)
+WINDOW_BARS = 32
+
+# Momentum indicator periods (fixed in FeatureEngineer.add_momentum_indicators)
+ADX_PERIOD = 14
+
+PATTERNS = (
+    ('pattern_hammer', ta.CDLHAMMER),
+    ('pattern_engulfing_bull', ta.CDLENGULFING),
+    ('pattern_morning_star', ta.CDLMORNINGSTAR),
+    ('pattern_shooting_star', ta.CDLSHOOTINGSTAR),
+    ('pattern_engulfing_bear', ta.CDLEVENINGSTAR),
+    ('pattern_doji', ta.CDLDOJI)
+)
+
+NAN = float('nan')
+
+
+def _is_zero(value: float) -> bool:
+    return -0.00000001 < value < 0.00000001
+
+
+def _div(a: float, b: float) -> float:
+    """a / b with NumPy semantics (inf/NaN instead of ZeroDivisionError)"""
+    if b == 0:
+        return NAN if a == 0 or a != a else math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class OnlineFeatures:
+    """
+    Rolling feature state for one symbol/timeframe
+
+    Closed candles are committed with push(); peek() returns the feature row
+    of a candle (e.g. the one still forming) on top of the committed state
+    without changing it.
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the state
+
+        Args:
+            config: Indicator configuration (FeatureEngineer.config)
+        """
+        self.config = config
+        self.fast = min(config['macd_fast'], config['macd_slow'])
+        self.slow = max(config['macd_fast'], config['macd_slow'])
+
+        periods = list(config['ma_periods']) + [config['bb_period'], config['volume_ma_period'], 6]
+        self.ring_size = max(max(periods), WINDOW_BARS)
+        # Last ring_size committed bars (open, high, low, close, volume), oldest first
+        self._bars = np.full((self.ring_size, 5), np.nan)
+        self._state = self._initial_state()
+
+    def _initial_state(self) -> Dict:
+        state = {'n': 0, 'obv': NAN, 'prev_hist': NAN}
+        for p in self.config['ma_periods']:
+            state[f'sma_total_{p}'] = 0.0
+        for p in self.config['ema_periods']:
+            state[f'ema_{p}'] = 0.0
+        state.update({
+            'bb_total': 0.0, 'bb_total2': 0.0, 'vol_total': 0.0,
+            'macd_fast': 0.0, 'macd_slow': 0.0, 'macd_signal': 0.0,
+            'rsi_gain': 0.0, 'rsi_loss': 0.0,
+            'atr': 0.0,
+            'adx_plus_dm': 0.0, 'adx_minus_dm': 0.0, 'adx_tr': 0.0, 'adx_sum_dx': 0.0, 'adx': NAN
+        })
+        return state
+
+    @property
+    def count(self) -> int:
+        """Number of committed bars"""
+        return self._state['n']
+
+    def push(self, o: float, h: float, l: float, c: float, v: float):
+        """Commit a closed candle"""
+        self._state = self._step(o, h, l, c, v, with_row=False)[0]
+        self._bars[:-1] = self._bars[1:]
+        self._bars[-1] = (o, h, l, c, v)
+
+    def peek(self, o: float, h: float, l: float, c: float, v: float) -> Dict[str, float]:
+        """
+        Feature row for a candle following the committed ones (state is unchanged)
+
+        Returns:
+            Dict of feature name -> value (NaN while an indicator is warming up)
+        """
+        return self._step(o, h, l, c, v, with_row=True)[1]
+
+    def _back(self, k: int, field: int, current: float) -> float:
+        """Value of field k bars before the new one (k=0 is the new bar itself)"""
+        return current if k == 0 else self._bars[-k, field]
+
+    def _sma(self, state: Dict, key: str, x: float, period: int, field: int, i: int) -> float:
+        """Running-sum SMA step (same arithmetic as indicators.sma)"""
+        total = state[key] + x
+        out = NAN
+        if i >= period - 1:
+            out = total / period
+            total -= self._back(period - 1, field, x)
+        state[key] = total
+        return out
+
+    @staticmethod
+    def _ema(state: Dict, key: str, x: float, period: int, j: int) -> float:
+        """SMA-seeded EMA step for the j-th input (j < 0 is before the EMA starts)"""
+        if j < 0:
+            return NAN
+        if j < period:
+            state[key] += x
+            if j < period - 1:
+                return NAN
+            state[key] /= period
+        else:
+            k = 2.0 / (period + 1)
+            state[key] = (x - state[key]) * k + state[key]
+        return state[key]
+
+    def _step(self, o: float, h: float, l: float, c: float, v: float, with_row: bool) -> tuple:
+        cfg = self.config
+        state = dict(self._state)
+        i = state['n']
+        state['n'] = i + 1
+        prev_c = self._bars[-1, 3]
+        row = {}
+
+        # Moving averages
+        for p in cfg['ma_periods']:
+            row[f'SMA_{p}'] = self._sma(state, f'sma_total_{p}', c, p, 3, i)
+        for p in cfg['ema_periods']:
+            row[f'EMA_{p}'] = self._ema(state, f'ema_{p}', c, p, i)
+
+        # RSI (Wilder)
+        p = cfg['rsi_period']
+        rsi = NAN
+        if 1 <= i:
+            diff = c - prev_c
+            gain, loss = state['rsi_gain'], state['rsi_loss']
+            if i > p:
+                loss *= p - 1
+                gain *= p - 1
+            if diff < 0:
+                loss -= diff
+            else:
+                gain += diff
+            if i >= p:
+                loss /= p
+                gain /= p
+                total = gain + loss
+                rsi = 0.0 if _is_zero(total) else 100.0 * (gain / total)
+            state['rsi_gain'], state['rsi_loss'] = gain, loss
+
+        # MACD (fast EMA starts at the slow lookback, signal EMA once the line exists)
+        fast_ema = self._ema(state, 'macd_fast', c, self.fast, i - (self.slow - self.fast))
+        slow_ema = self._ema(state, 'macd_slow', c, self.slow, i)
+        line = fast_ema - slow_ema
+        signal = self._ema(state, 'macd_signal', line, cfg['macd_signal'], i - (self.slow - 1))
+        if i < self.slow + cfg['macd_signal'] - 2:
+            line = signal = NAN
+        hist = line - signal
+        bullish = hist > 0 and state['prev_hist'] <= 0
+        bearish = hist < 0 and state['prev_hist'] >= 0
+        state['prev_hist'] = hist
+
+        # Bollinger Bands
+        p = cfg['bb_period']
+        middle = self._sma(state, 'bb_total', c, p, 3, i)
+        total2 = state['bb_total2'] + c * c
+        upper = lower = NAN
+        if i >= p - 1:
+            variance = total2 / p - middle * middle
+            back = self._back(p - 1, 3, c)
+            total2 -= back * back
+            std = math.sqrt(variance) if variance >= 0.00000001 else 0.0
+            upper = middle + std * float(cfg['bb_std'])
+            lower = middle - std * float(cfg['bb_std'])
+        state['bb_total2'] = total2
+
+        # Volume
+        volume_ma = self._sma(state, 'vol_total', v, cfg['volume_ma_period'], 4, i)
+        if i == 0:
+            state['obv'] = v
+        elif c > prev_c:
+            state['obv'] += v
+        elif c < prev_c:
+            state['obv'] -= v
+
+        # True range, ATR and ADX (Wilder)
+        prev_h, prev_l = self._bars[-1, 1], self._bars[-1, 2]
+        tr = max(h - l, abs(prev_c - h), abs(prev_c - l)) if i else NAN
+        p = cfg['atr_period']
+        atr = NAN
+        if 1 <= i <= p:
+            state['atr'] += tr
+            if i == p:
+                state['atr'] /= p
+                atr = state['atr']
+        elif i > p:
+            state['atr'] = (state['atr'] * (p - 1) + tr) / p
+            atr = state['atr']
+        adx = self._adx_step(state, i, h, l, prev_h, prev_l, tr)
+
+        if not with_row:
+            return state, None
+
+        row['price_above_sma_7'] = int(c > row['SMA_7'])
+        row['price_above_ema_25'] = int(c > row['EMA_25'])
+        row['RSI'] = rsi
+        row['RSI_oversold'] = int(rsi < 30)
+        row['RSI_overbought'] = int(rsi > 70)
+        row['MACD'] = line
+        row['MACD_signal'] = signal
+        row['MACD_hist'] = hist
+        row['MACD_bullish'] = int(bullish)
+        row['MACD_bearish'] = int(bearish)
+        span = upper - lower
+        row['BB_upper'] = upper
+        row['BB_middle'] = middle
+        row['BB_lower'] = lower
+        row['BB_width'] = _div(span, middle)
+        row['BB_position'] = _div(c - lower, span)
+        row['price_below_bb_lower'] = int(c < lower)
+        row['price_above_bb_upper'] = int(c > upper)
+        row['volume_MA'] = volume_ma
+        row['volume_ratio'] = _div(v, volume_ma)
+        row['OBV'] = state['obv']
+        row['volume_spike'] = int(v > volume_ma * 2)
+        row['ATR'] = atr
+        row['ATR_pct'] = _div(atr, c) * 100
+        row.update(self._window_features(o, h, l, c, v))
+        row.update(self._price_features(o, h, l, c))
+        row['ADX'] = adx
+        return state, row
+
+    def _adx_step(self, state: Dict, i: int, h: float, l: float, prev_h: float, prev_l: float,
+                  tr: float) -> float:
+        """ADX step replicating TA-Lib's seeding (DM/TR sums, then averaged DX)"""
+        p = ADX_PERIOD
+        if i == 0:
+            return NAN
+
+        diff_p = h - prev_h
+        diff_m = prev_l - l
+        plus_dm, minus_dm, tr_sum = state['adx_plus_dm'], state['adx_minus_dm'], state['adx_tr']
+        if i >= p:
+            minus_dm -= minus_dm / p
+            plus_dm -= plus_dm / p
+        if diff_m > 0 and diff_p < diff_m:
+            minus_dm += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            plus_dm += diff_p
+        tr_sum = tr_sum - tr_sum / p + tr if i >= p else tr_sum + tr
+        state['adx_plus_dm'], state['adx_minus_dm'], state['adx_tr'] = plus_dm, minus_dm, tr_sum
+        if i < p:
+            return NAN
+
+        dx = NAN
+        if not _is_zero(tr_sum):
+            minus_di = 100.0 * (minus_dm / tr_sum)
+            plus_di = 100.0 * (plus_dm / tr_sum)
+            total = minus_di + plus_di
+            if not _is_zero(total):
+                dx = 100.0 * (abs(minus_di - plus_di) / total)
+
+        if i < 2 * p - 1:
+            if dx == dx:
+                state['adx_sum_dx'] += dx
+            return NAN
+        if i == 2 * p - 1:
+            if dx == dx:
+                state['adx_sum_dx'] += dx
+            state['adx'] = state['adx_sum_dx'] / p
+        elif dx == dx:
+            state['adx'] = (state['adx'] * (p - 1) + dx) / p
+        return state['adx']
+
+    def _window_features(self, o: float, h: float, l: float, c: float, v: float) -> Dict[str, float]:
+        """Finite-window TA-Lib indicators on the last WINDOW_BARS bars"""
+        tail = np.vstack((self._bars[-(WINDOW_BARS - 1):], (o, h, l, c, v)))
+        # Drop slots not filled yet so TA-Lib doesn't see NaN bars
+        tail = tail[-min(len(tail), self._state['n'] + 1):]
+        to, th, tl, tc = (np.ascontiguousarray(tail[:, k]) for k in range(4))
+
+        features = {}
+        for name, fn in PATTERNS:
+            features[name] = float(fn(to, th, tl, tc)[-1]) / 100
+        slowk, slowd = ta.STOCH(th, tl, tc, fastk_period=14, slowk_period=3, slowd_period=3)
+        features['STOCH_K'] = float(slowk[-1])
+        features['STOCH_D'] = float(slowd[-1])
+        features['CCI'] = float(ta.CCI(th, tl, tc, timeperiod=20)[-1])
+        features['WILLR'] = float(ta.WILLR(th, tl, tc, timeperiod=14)[-1])
+        return features
+
+    def _price_features(self, o: float, h: float, l: float, c: float) -> Dict[str, float]:
+        closes = self._bars[:, 3]
+        prev_c = closes[-1]
+        gap = o - prev_c
+        return {
+            'price_change': _div(c, closes[-1]) - 1,
+            'price_change_2': _div(c, closes[-2]) - 1,
+            'price_change_5': _div(c, closes[-5]) - 1,
+            'hl_range': _div(h - l, c),
+            'body_size': _div(abs(o - c), c),
+            'upper_shadow': _div(h - max(o, c), c),
+            'lower_shadow': _div(min(o, c) - l, c),
+            'gap': gap,
+            'gap_pct': _div(gap, prev_c)
+        }
@@ -4,9 +4,11 @@ Handles position sizing, leverage, stop loss, take profit, and risk controls
 """
 
 import logging
+import time
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
-import pandas as pd
+
+from utils.trade import Trade
 
 
 class RiskManager:
@@ -41,33 +43,57 @@ class RiskManager:
         self.trailing_stop = config.get('trailing_stop', False)
         self.trailing_stop_percent = config.get('trailing_stop_percent', 1.5)
         self.cooldown_period = config.get('cooldown_period', 600)  # seconds
+        self.confidence_threshold = config.get('confidence_threshold', 0.6)
+        self._recompute_constants()
         
         # Tracking
         self.daily_pnl = 0
         self.daily_loss = 0
         self.trades_today = 0
-        self.last_loss_time = None
-        self.open_positions = []
+        self._last_loss_mono = None  # time.monotonic() of the last loss
+        self.open_positions = {}  # position id -> position
         self.daily_reset_time = datetime.now().date()
+        self._next_reset = self._midnight_after(self.daily_reset_time)
         
         self.logger.info("Risk Manager initialized")
         self.logger.info(f"Capital: ${self.initial_capital}, Leverage: {self.leverage}x")
         self.logger.info(f"Risk per trade: {self.risk_per_trade}%, Max daily loss: {self.max_loss_per_day}%")
     
+    def _recompute_constants(self):
+        """Derive the price multipliers and limits used per trade; call after changing a risk parameter"""
+        self._risk_frac = self.risk_per_trade / 100
+        self._sl_mult_long = 1 - self.stop_loss_percent / 100
+        self._sl_mult_short = 1 + self.stop_loss_percent / 100
+        self._tp_mult_long = 1 + self.take_profit_percent / 100
+        self._tp_mult_short = 1 - self.take_profit_percent / 100
+        self._trail_mult_long = 1 - self.trailing_stop_percent / 100
+        self._trail_mult_short = 1 + self.trailing_stop_percent / 100
+        self._max_daily_loss = self.initial_capital * self.max_loss_per_day / 100
+        self._min_capital = self.initial_capital * 0.5
+    
     def update_capital(self, new_capital: float):
         """Update current capital"""
         self.current_capital = new_capital
         self.logger.info(f"Capital updated: ${self.current_capital:.2f}")
     
+    @staticmethod
+    def _midnight_after(day) -> float:
+        """Epoch timestamp of the local midnight that ends `day`"""
+        return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+    
     def reset_daily_tracking(self):
         """Reset daily tracking metrics"""
+        # A float compare per call; the date is only built once the day rolls over
+        if time.time() < self._next_reset:
+            return
+        
         today = datetime.now().date()
-        if today > self.daily_reset_time:
-            self.logger.info(f"Resetting daily tracking. Previous day PnL: ${self.daily_pnl:.2f}")
-            self.daily_pnl = 0
-            self.daily_loss = 0
-            self.trades_today = 0
-            self.daily_reset_time = today
+        self.logger.info(f"Resetting daily tracking. Previous day PnL: ${self.daily_pnl:.2f}")
+        self.daily_pnl = 0
+        self.daily_loss = 0
+        self.trades_today = 0
+        self.daily_reset_time = today
+        self._next_reset = self._midnight_after(today)
     
     def calculate_position_size(self, entry_price: float, stop_loss_price: float,
                                side: str = 'long') -> Tuple[float, float]:
@@ -82,37 +108,36 @@ class RiskManager:
         Returns:
             (position_size, position_value) tuple
         """
-        try:
-            # Calculate risk amount in dollars
-            risk_amount = self.current_capital * (self.risk_per_trade / 100)
-            
-            # Calculate price risk per unit
-            if side == 'long':
-                price_risk = entry_price - stop_loss_price
-            else:  # short
-                price_risk = stop_loss_price - entry_price
-            
-            if price_risk <= 0:
-                self.logger.error(f"Invalid stop loss: entry={entry_price}, sl={stop_loss_price}")
-                return 0, 0
-            
-            # Position size = risk amount / price risk
-            position_size = risk_amount / price_risk
-            
-            # Apply leverage
-            position_value = position_size * entry_price
-            max_position_value = self.current_capital * self.leverage
-            
-            if position_value > max_position_value:
-                position_value = max_position_value
-                position_size = position_value / entry_price
-            
-            self.logger.debug(f"Position size: {position_size:.4f} units, Value: ${position_value:.2f}")
-            return position_size, position_value
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating position size: {e}")
+        if entry_price <= 0:
+            self.logger.error(f"Invalid entry price: {entry_price}")
+            return 0, 0
+        
+        # Calculate risk amount in dollars
+        risk_amount = self.current_capital * self._risk_frac
+        
+        # Calculate price risk per unit
+        if side == 'long':
+            price_risk = entry_price - stop_loss_price
+        else:  # short
+            price_risk = stop_loss_price - entry_price
+        
+        if price_risk <= 0:
+            self.logger.error(f"Invalid stop loss: entry={entry_price}, sl={stop_loss_price}")
             return 0, 0
+        
+        # Position size = risk amount / price risk
+        position_size = risk_amount / price_risk
+        
+        # Apply leverage
+        position_value = position_size * entry_price
+        max_position_value = self.current_capital * self.leverage
+        
+        if position_value > max_position_value:
+            position_value = max_position_value
+            position_size = position_value / entry_price
+        
+        self.logger.debug("Position size: %.4f units, Value: $%.2f", position_size, position_value)
+        return position_size, position_value
     
     def calculate_fixed_position_size(self, entry_price: float) -> Tuple[float, float]:
         """
@@ -124,17 +149,16 @@ class RiskManager:
         Returns:
             (position_size, position_value) tuple
         """
-        try:
-            # Use a fixed percentage of capital per trade
-            position_value = (self.current_capital * self.leverage) / self.max_open_positions
-            position_size = position_value / entry_price
-            
-            self.logger.debug(f"Fixed position size: {position_size:.4f} units, Value: ${position_value:.2f}")
-            return position_size, position_value
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating fixed position size: {e}")
+        if entry_price <= 0 or self.max_open_positions <= 0:
+            self.logger.error(f"Invalid fixed sizing: entry={entry_price}, max positions={self.max_open_positions}")
             return 0, 0
+        
+        # Use a fixed percentage of capital per trade
+        position_value = (self.current_capital * self.leverage) / self.max_open_positions
+        position_size = position_value / entry_price
+        
+        self.logger.debug("Fixed position size: %.4f units, Value: $%.2f", position_size, position_value)
+        return position_size, position_value
     
     def calculate_stop_loss(self, entry_price: float, side: str = 'long') -> float:
         """
@@ -148,11 +172,11 @@ class RiskManager:
             Stop loss price
         """
         if side == 'long':
-            sl_price = entry_price * (1 - self.stop_loss_percent / 100)
+            sl_price = entry_price * self._sl_mult_long
         else:  # short
-            sl_price = entry_price * (1 + self.stop_loss_percent / 100)
+            sl_price = entry_price * self._sl_mult_short
         
-        self.logger.debug(f"Stop loss calculated: {sl_price:.4f} ({self.stop_loss_percent}%)")
+        self.logger.debug("Stop loss calculated: %.4f (%s%%)", sl_price, self.stop_loss_percent)
         return sl_price
     
     def calculate_take_profit(self, entry_price: float, side: str = 'long') -> float:
@@ -167,11 +191,11 @@ class RiskManager:
             Take profit price
         """
         if side == 'long':
-            tp_price = entry_price * (1 + self.take_profit_percent / 100)
+            tp_price = entry_price * self._tp_mult_long
         else:  # short
-            tp_price = entry_price * (1 - self.take_profit_percent / 100)
+            tp_price = entry_price * self._tp_mult_short
         
-        self.logger.debug(f"Take profit calculated: {tp_price:.4f} ({self.take_profit_percent}%)")
+        self.logger.debug("Take profit calculated: %.4f (%s%%)", tp_price, self.take_profit_percent)
         return tp_price
     
     def can_open_position(self) -> Tuple[bool, str]:
@@ -189,19 +213,19 @@ class RiskManager:
             return False, f"Max open positions reached ({self.max_open_positions})"
         
         # Check daily loss limit
-        daily_loss_percent = (self.daily_loss / self.initial_capital) * 100
-        if daily_loss_percent >= self.max_loss_per_day:
+        if self.daily_loss >= self._max_daily_loss:
+            daily_loss_percent = (self.daily_loss / self.initial_capital) * 100
             return False, f"Daily loss limit reached ({daily_loss_percent:.2f}%)"
         
         # Check cooldown period after loss
-        if self.last_loss_time:
-            time_since_loss = (datetime.now() - self.last_loss_time).total_seconds()
+        if self._last_loss_mono is not None:
+            time_since_loss = time.monotonic() - self._last_loss_mono
             if time_since_loss < self.cooldown_period:
                 remaining = self.cooldown_period - time_since_loss
                 return False, f"Cooldown period active ({remaining:.0f}s remaining)"
         
         # Check if enough capital
-        if self.current_capital <= self.initial_capital * 0.5:
+        if self.current_capital <= self._min_capital:
             return False, "Insufficient capital (50% drawdown reached)"
         
         return True, "OK"
@@ -223,9 +247,8 @@ class RiskManager:
             return False, reason
         
         # Check signal confidence
-        confidence_threshold = self.config.get('confidence_threshold', 0.6)
-        if signal['confidence'] < confidence_threshold:
-            return False, f"Low confidence ({signal['confidence']:.2f} < {confidence_threshold})"
+        if signal['confidence'] < self.confidence_threshold:
+            return False, f"Low confidence ({signal['confidence']:.2f} < {self.confidence_threshold})"
         
         # Only allow BUY or SELL signals
         if signal['signal'] not in ['BUY', 'SELL']:
@@ -233,16 +256,23 @@ class RiskManager:
         
         return True, "Valid"
     
-    def add_position(self, position: Dict):
+    def add_position(self, trade: Trade):
         """
         Add new position to tracking
         
         Args:
-            position: Position dict with details
+            trade: Executed trade that opened the position
         """
-        self.open_positions.append(position)
+        self.open_positions[trade.order_id] = {
+            'id': trade.order_id,
+            'side': trade.side,
+            'entry_price': trade.entry_price,
+            'stop_loss': trade.stop_loss,
+            'take_profit': trade.take_profit,
+            'size': trade.amount
+        }
         self.trades_today += 1
-        self.logger.info(f"Position added: {position['side']} {position['size']:.4f} @ {position['entry_price']:.4f}")
+        self.logger.info(f"Position added: {trade.side} {trade.amount:.4f} @ {trade.entry_price:.4f}")
     
     def remove_position(self, position_id: str):
         """
@@ -251,7 +281,7 @@ class RiskManager:
         Args:
             position_id: Position ID
         """
-        self.open_positions = [p for p in self.open_positions if p.get('id') != position_id]
+        self.open_positions.pop(position_id, None)
         self.logger.info(f"Position removed: {position_id}")
     
     def update_position_pnl(self, position_id: str, pnl: float, is_closed: bool = False):
@@ -267,7 +297,7 @@ class RiskManager:
         
         if pnl < 0:
             self.daily_loss += abs(pnl)
-            self.last_loss_time = datetime.now()
+            self._last_loss_mono = time.monotonic()
         
         if is_closed:
             self.remove_position(position_id)
@@ -308,33 +338,30 @@ class RiskManager:
         if not self.trailing_stop:
             return None
         
-        try:
-            side = position['side']
-            entry_price = position['entry_price']
-            current_sl = position.get('stop_loss')
-            
-            if side == 'long':
-                # Update SL if price moved up
-                profit_percent = ((current_price - entry_price) / entry_price) * 100
-                if profit_percent > self.trailing_stop_percent:
-                    new_sl = current_price * (1 - self.trailing_stop_percent / 100)
-                    if new_sl > current_sl:
-                        self.logger.info(f"Trailing stop updated: {current_sl:.4f} -> {new_sl:.4f}")
-                        return new_sl
-            
-            else:  # short
-                profit_percent = ((entry_price - current_price) / entry_price) * 100
-                if profit_percent > self.trailing_stop_percent:
-                    new_sl = current_price * (1 + self.trailing_stop_percent / 100)
-                    if new_sl < current_sl:
-                        self.logger.info(f"Trailing stop updated: {current_sl:.4f} -> {new_sl:.4f}")
-                        return new_sl
-            
-            return None
-            
-        except Exception as e:
-            self.logger.error(f"Error checking trailing stop: {e}")
+        side = position['side']
+        entry_price = position['entry_price']
+        current_sl = position.get('stop_loss')
+        if current_sl is None or entry_price <= 0:
             return None
+        
+        if side == 'long':
+            # Update SL if price moved up
+            profit_percent = ((current_price - entry_price) / entry_price) * 100
+            if profit_percent > self.trailing_stop_percent:
+                new_sl = current_price * self._trail_mult_long
+                if new_sl > current_sl:
+                    self.logger.info(f"Trailing stop updated: {current_sl:.4f} -> {new_sl:.4f}")
+                    return new_sl
+        
+        else:  # short
+            profit_percent = ((entry_price - current_price) / entry_price) * 100
+            if profit_percent > self.trailing_stop_percent:
+                new_sl = current_price * self._trail_mult_short
+                if new_sl < current_sl:
+                    self.logger.info(f"Trailing stop updated: {current_sl:.4f} -> {new_sl:.4f}")
+                    return new_sl
+        
+        return None
 
 
 if __name__ == "__main__":
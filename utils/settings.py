@@ -0,0 +1,107 @@
+"""
+Typed Settings
+Immutable view of config.yaml, built once at startup for attribute access on the hot path
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class TradingConfig:
+    """Trading section"""
+    pair: str
+    interval: int
+    initial_capital: float
+    leverage: int
+
+
+@dataclass(slots=True, frozen=True)
+class RiskConfig:
+    """Risk management section"""
+    risk_per_trade: float
+    max_loss_per_day: float
+    max_open_positions: int
+    cooldown_period: int
+    stop_loss_percent: float
+    take_profit_percent: float
+    trailing_stop: bool
+    trailing_stop_percent: float
+
+
+@dataclass(slots=True, frozen=True)
+class AIConfig:
+    """AI model section"""
+    type: str
+    confidence_threshold: float
+    model_path: Optional[str] = None
+
+
+@dataclass(slots=True, frozen=True)
+class DataConfig:
+    """Data collection section"""
+    timeframe: str
+    candle_stream: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class BotConfig:
+    """Bot configuration"""
+    testnet: bool
+    trading: TradingConfig
+    risk: RiskConfig
+    ai: AIConfig
+    data: DataConfig
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'BotConfig':
+        """
+        Build and validate settings from the parsed YAML
+
+        Args:
+            config: Configuration dict (as loaded from config.yaml)
+
+        Returns:
+            BotConfig instance
+
+        Raises:
+            ValueError: If a required setting is missing or has the wrong type
+        """
+        try:
+            trading = config['trading']
+            risk = config['risk_management']
+            ai = config['ai_model']
+            data = config['data_collection']
+
+            return cls(
+                testnet=bool(config['exchange']['testnet']),
+                trading=TradingConfig(
+                    pair=str(trading['pair']),
+                    interval=int(trading['interval']),
+                    initial_capital=float(trading['initial_capital']),
+                    leverage=int(trading['leverage'])
+                ),
+                risk=RiskConfig(
+                    risk_per_trade=float(risk['risk_per_trade']),
+                    max_loss_per_day=float(risk['max_loss_per_day']),
+                    max_open_positions=int(risk['max_open_positions']),
+                    cooldown_period=int(risk['cooldown_period']),
+                    stop_loss_percent=float(risk['stop_loss_percent']),
+                    take_profit_percent=float(risk['take_profit_percent']),
+                    trailing_stop=bool(risk['trailing_stop']),
+                    trailing_stop_percent=float(risk['trailing_stop_percent'])
+                ),
+                ai=AIConfig(
+                    type=str(ai['type']),
+                    confidence_threshold=float(ai['confidence_threshold']),
+                    model_path=ai.get('model_path')
+                ),
+                data=DataConfig(
+                    timeframe=str(data['ohlcv_timeframe']),
+                    candle_stream=bool(data.get('candle_stream', False))
+                )
+            )
+        except KeyError as e:
+            raise ValueError(f"Missing required config key: {e}") from e
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid config value: {e}") from e
@@ -0,0 +1,34 @@
+"""
+Trade Record
+Immutable record of an executed trade shared by logger, notifier, dashboard and risk manager
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(slots=True, frozen=True)
+class Trade:
+    """
+    Executed trade
+
+    Attributes:
+        symbol: Trading pair
+        side: 'long' or 'short'
+        amount: Position size
+        entry_price: Entry price
+        stop_loss: Stop loss price
+        take_profit: Take profit price
+        confidence: Signal confidence that triggered the trade
+        timestamp: Execution time
+        order_id: Exchange ID of the entry order
+    """
+    symbol: str
+    side: str
+    amount: float
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    confidence: float
+    timestamp: datetime
+    order_id: str
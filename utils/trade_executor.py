@@ -4,12 +4,123 @@ Handles order execution on Bitget Futures
 """
 
 import ccxt
+import hashlib
+import itertools
 import logging
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List
 from datetime import datetime
 import uuid
 
+from utils.data_collector import configure_session, load_markets_cached, prewarm_session
+
+# (symbol, leverage, margin_mode, testnet) settings already applied in this process
+_APPLIED_LEVERAGE = set()
+
+# Dry-run order ids: a per-process tag plus a counter, unique without a syscall per order
+_DRY_RUN_TAG = uuid.uuid4().hex[:4]
+_dry_order_seq = itertools.count()
+
+
+# Orders kept in memory for status lookups; older ones are forgotten
+MAX_TRACKED_ORDERS = 10_000
+
+# Delays (seconds) between checks that a market entry has filled; the last one repeats
+_POLL_DELAYS = (0.2, 0.2, 0.5, 0.5, 1.0)
+
+# Upper bound (seconds) on the backoff between order retries
+MAX_RETRY_DELAY = 10.0
+
+# Connections opened at startup: an entry plus its SL and TP orders
+PREWARM_CONNECTIONS = 3
+
+# Bitget place-order limit (orders/second), shared by everything using one API key
+ORDER_RATE_LIMIT = 10
+
+# API key hash -> token bucket shared by all executors trading on that key
+_ORDER_BUCKETS = {}
+_ORDER_BUCKETS_LOCK = threading.Lock()
+
+
+# Fixed fields of simulated orders, per order type
+_DRY_MARKET = {'type': 'market', 'price': None, 'status': 'closed', 'remaining': 0}
+_DRY_LIMIT = {'type': 'limit', 'status': 'open', 'filled': 0}
+_DRY_STOP_LOSS = {'type': 'stop_market', 'status': 'open'}
+_DRY_TAKE_PROFIT = {'type': 'take_profit_market', 'status': 'open'}
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until the call fits the rate"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        # Reserve a token (the balance may go negative) and sleep off the debt outside the lock
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _order_bucket(api_key: Optional[str]) -> _TokenBucket:
+    """Process-wide order rate limiter for an API key"""
+    key = hashlib.sha256((api_key or '').encode()).hexdigest()
+    with _ORDER_BUCKETS_LOCK:
+        bucket = _ORDER_BUCKETS.get(key)
+        if bucket is None:
+            bucket = _ORDER_BUCKETS[key] = _TokenBucket(ORDER_RATE_LIMIT, ORDER_RATE_LIMIT)
+        return bucket
+
+
+def _poll_delay(attempt: int) -> float:
+    """Delay before fill check number attempt: quick at first, then once a second"""
+    return _POLL_DELAYS[attempt] if attempt < len(_POLL_DELAYS) else _POLL_DELAYS[-1]
+
+
+def _dry_order_id() -> str:
+    """Id for a simulated order"""
+    return f"DRY_{_DRY_RUN_TAG}{next(_dry_order_seq):06x}"
+
+
+def _dry_order(template: Dict, symbol: str, side: str, amount: float, **fields) -> Dict:
+    """
+    Build a simulated order from its type template
+    
+    Args:
+        template: Fixed fields for the order type
+        symbol: Trading pair
+        side: 'buy' or 'sell'
+        amount: Order size
+        **fields: Per-order fields (price, filled, stopPrice, ...)
+        
+    Returns:
+        ccxt-shaped order dict
+    """
+    now = datetime.now()
+    return {
+        **template,
+        'id': _dry_order_id(),
+        'symbol': symbol,
+        'side': side,
+        'amount': amount,
+        'timestamp': int(now.timestamp() * 1000),
+        'datetime': now.isoformat(),
+        'info': {'dry_run': True},
+        **fields
+    }
+
 
 class TradeExecutor:
     """
@@ -22,7 +133,8 @@ class TradeExecutor:
     """
     
     def __init__(self, api_key: str, api_secret: str, password: str, 
-                 testnet: bool = True, dry_run: bool = False):
+                 testnet: bool = True, dry_run: bool = False,
+                 exchange: Optional[ccxt.Exchange] = None):
         """
         Initialize trade executor
         
@@ -32,13 +144,21 @@ class TradeExecutor:
             password: Bitget API password
             testnet: Use testnet or mainnet
             dry_run: If True, simulate orders without executing
+            exchange: Already connected ccxt exchange to share (reuses its
+                HTTP keep-alive connections and loaded markets)
         """
         self.logger = logging.getLogger(__name__)
         self.dry_run = dry_run
+        self.testnet = testnet
         self.exchange = None
+        self._owns_exchange = False
+        self._order_bucket = _order_bucket(api_key)
         
         if dry_run:
             self.logger.warning("DRY RUN MODE - Orders will be simulated")
+        elif exchange is not None:
+            self.exchange = exchange
+            self.logger.info("Trade Executor initialized (%s, shared connection)", 'TESTNET' if testnet else 'MAINNET - REAL MONEY')
         else:
             try:
                 self.exchange = ccxt.bitget({
@@ -50,6 +170,8 @@ class TradeExecutor:
                         'defaultType': 'swap',  # futures
                     }
                 })
+                configure_session(self.exchange)
+                self._owns_exchange = True
                 
                 if testnet:
                     self.exchange.set_sandbox_mode(True)
@@ -57,17 +179,68 @@ class TradeExecutor:
                 else:
                     self.logger.warning("Trade Executor initialized (MAINNET - REAL MONEY)")
                 
-                # Test connection
-                self.exchange.load_markets()
+                # Market metadata (cached on disk for the day)
+                load_markets_cached(self.exchange, testnet)
                 
             except Exception as e:
-                self.logger.error(f"Failed to initialize exchange: {e}")
+                self.logger.error("Failed to initialize exchange: %s", e)
                 raise
         
-        # Order tracking
-        self.orders = []
+        # Warm the connection pool so the first order burst skips the handshakes
+        if self.exchange is not None:
+            prewarm_session(self.exchange, PREWARM_CONNECTIONS)
+        
+        # Order tracking: fixed ring of (seq, order) slots plus an id index for O(1) lookups
+        self._ring = [None] * MAX_TRACKED_ORDERS
+        self._ring_seq = itertools.count()
+        self._orders_by_id = {}
         self.max_retries = 3
-        self.retry_delay = 1  # seconds
+        self.retry_delay = 1  # seconds, base of the exponential backoff
+        
+        # Bind the simulated order methods once instead of branching on dry_run per order
+        if dry_run:
+            self.create_market_order = self._create_market_order_dry
+            self.create_limit_order = self._create_limit_order_dry
+            self.create_stop_loss_order = self._create_stop_loss_order_dry
+            self.create_take_profit_order = self._create_take_profit_order_dry
+    
+    def close(self):
+        """Close the keep-alive connection pool of an exchange this executor created"""
+        if self._owns_exchange:
+            self.exchange.session.close()
+            self._owns_exchange = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _track(self, order: Dict):
+        """Record a placed order, evicting the oldest once the history is full"""
+        # next() on the counter hands each caller its own slot, so appends never wait on a lock
+        seq = next(self._ring_seq)
+        slot = seq % MAX_TRACKED_ORDERS
+        evicted = self._ring[slot]
+        self._ring[slot] = (seq, order)
+        if evicted is not None:
+            self._orders_by_id.pop(evicted[1]['id'], None)
+        self._orders_by_id[order['id']] = order
+    
+    def recent_orders(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Orders placed by this executor, oldest first
+        
+        Args:
+            limit: Return only the newest `limit` orders (None = all still tracked)
+            
+        Returns:
+            List of order dicts
+        """
+        entries = sorted(entry for entry in list(self._ring) if entry is not None)
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        return [order for _, order in entries]
     
     def set_leverage(self, symbol: str, leverage: int, margin_mode: str = 'cross'):
         """
@@ -80,15 +253,21 @@ class TradeExecutor:
         """
         try:
             if self.dry_run:
-                self.logger.info(f"[DRY RUN] Would set leverage: {symbol} = {leverage}x ({margin_mode})")
+                self.logger.info("[DRY RUN] Would set leverage: %s = %sx (%s)", symbol, leverage, margin_mode)
+                return True
+            
+            key = (symbol, leverage, margin_mode, self.testnet)
+            if key in _APPLIED_LEVERAGE:
+                self.logger.debug("Leverage already set: %s = %sx (%s)", symbol, leverage, margin_mode)
                 return True
             
             self.exchange.set_leverage(leverage, symbol)
-            self.logger.info(f"Leverage set: {symbol} = {leverage}x ({margin_mode})")
+            _APPLIED_LEVERAGE.add(key)
+            self.logger.info("Leverage set: %s = %sx (%s)", symbol, leverage, margin_mode)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error setting leverage: {e}")
+            self.logger.error("Error setting leverage: %s", e)
             return False
     
     def create_market_order(self, symbol: str, side: str, amount: float, 
@@ -106,55 +285,52 @@ class TradeExecutor:
             Order dict or None if failed
         """
         try:
-            if self.dry_run:
-                order_id = f"DRY_{uuid.uuid4().hex[:8]}"
-                order = {
-                    'id': order_id,
-                    'symbol': symbol,
-                    'type': 'market',
-                    'side': side,
-                    'amount': amount,
-                    'price': None,
-                    'status': 'closed',
-                    'filled': amount,
-                    'remaining': 0,
-                    'timestamp': int(time.time() * 1000),
-                    'datetime': datetime.now().isoformat(),
-                    'info': {'dry_run': True}
-                }
-                self.logger.info(f"[DRY RUN] Market order: {side.upper()} {amount} {symbol}")
-                self.orders.append(order)
-                return order
-            
-            # Execute real order with retries
-            for attempt in range(self.max_retries):
-                try:
-                    order = self.exchange.create_order(
-                        symbol=symbol,
-                        type='market',
-                        side=side,
-                        amount=amount,
-                        params=params or {}
-                    )
-                    
-                    self.logger.info(f"Market order executed: {side.upper()} {amount} {symbol}")
-                    self.logger.debug(f"Order details: {order}")
-                    self.orders.append(order)
-                    return order
-                    
-                except Exception as e:
-                    self.logger.warning(f"Order attempt {attempt + 1} failed: {e}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.retry_delay)
-                    else:
-                        raise
-            
-            return None
+            return self._submit_market_order(symbol, side, amount, params)
             
         except Exception as e:
-            self.logger.error(f"Error creating market order: {e}")
+            self.logger.error("Error creating market order: %s", e)
             return None
     
+    def _submit_market_order(self, symbol: str, side: str, amount: float,
+                             params: Optional[Dict] = None) -> Dict:
+        """
+        Place a real market order, retrying transient failures
+        
+        Raises:
+            ccxt.NotSupported: If the exchange rejects the order's params (not retried)
+            ccxt.InsufficientFunds, ccxt.InvalidOrder: Rejected orders (not retried)
+            Exception: The last error once retries are exhausted
+        """
+        for attempt in range(self.max_retries):
+            try:
+                self._order_bucket.acquire()
+                order = self.exchange.create_order(
+                    symbol=symbol,
+                    type='market',
+                    side=side,
+                    amount=amount,
+                    params=params or {}
+                )
+                
+                self.logger.info("Market order executed: %s %s %s", side.upper(), amount, symbol)
+                self.logger.debug("Order details: %s", order)
+                self._track(order)
+                return order
+                
+            except (ccxt.NotSupported, ccxt.InsufficientFunds, ccxt.InvalidOrder):
+                raise
+            except Exception as e:
+                self.logger.warning("Order attempt %s failed: %s", attempt + 1, e)
+                if attempt < self.max_retries - 1:
+                    time.sleep(self._backoff_delay(attempt))
+                else:
+                    raise
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter so retries don't line up across bots"""
+        delay = self.retry_delay * (2 ** attempt) + random.uniform(0, self.retry_delay)
+        return min(delay, MAX_RETRY_DELAY)
+    
     def create_limit_order(self, symbol: str, side: str, amount: float, 
                           price: float, params: Optional[Dict] = None) -> Optional[Dict]:
         """
@@ -171,26 +347,7 @@ class TradeExecutor:
             Order dict or None if failed
         """
         try:
-            if self.dry_run:
-                order_id = f"DRY_{uuid.uuid4().hex[:8]}"
-                order = {
-                    'id': order_id,
-                    'symbol': symbol,
-                    'type': 'limit',
-                    'side': side,
-                    'amount': amount,
-                    'price': price,
-                    'status': 'open',
-                    'filled': 0,
-                    'remaining': amount,
-                    'timestamp': int(time.time() * 1000),
-                    'datetime': datetime.now().isoformat(),
-                    'info': {'dry_run': True}
-                }
-                self.logger.info(f"[DRY RUN] Limit order: {side.upper()} {amount} {symbol} @ {price}")
-                self.orders.append(order)
-                return order
-            
+            self._order_bucket.acquire()
             order = self.exchange.create_order(
                 symbol=symbol,
                 type='limit',
@@ -200,14 +357,45 @@ class TradeExecutor:
                 params=params or {}
             )
             
-            self.logger.info(f"Limit order created: {side.upper()} {amount} {symbol} @ {price}")
-            self.orders.append(order)
+            self.logger.info("Limit order created: %s %s %s @ %s", side.upper(), amount, symbol, price)
+            self._track(order)
             return order
             
         except Exception as e:
-            self.logger.error(f"Error creating limit order: {e}")
+            self.logger.error("Error creating limit order: %s", e)
             return None
     
+    def create_orders_batch(self, specs: List[Dict], max_workers: int = 4) -> List[Optional[Dict]]:
+        """
+        Submit several independent orders (e.g. across symbols) concurrently
+        
+        Each spec goes through create_market_order / create_limit_order, so
+        retries, dry-run handling and order tracking are the same as for a
+        single order.
+        
+        Args:
+            specs: Dicts with 'symbol', 'side', 'amount' and optionally
+                'type' ('market' or 'limit'), 'price' and 'params'
+            max_workers: Orders in flight at once (Bitget allows ~10 orders/s)
+            
+        Returns:
+            Order dicts in the order of specs, None for orders that failed
+        """
+        if not specs:
+            return []
+        
+        def submit(spec: Dict) -> Optional[Dict]:
+            if spec.get('type', 'market') == 'limit':
+                return self.create_limit_order(spec['symbol'], spec['side'], spec['amount'],
+                                               spec['price'], spec.get('params'))
+            return self.create_market_order(spec['symbol'], spec['side'], spec['amount'], spec.get('params'))
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs)), thread_name_prefix='order-batch') as pool:
+            orders = list(pool.map(submit, specs))
+        
+        self.logger.info("Order batch submitted: %s/%s succeeded", sum(o is not None for o in orders), len(specs))
+        return orders
+    
     def create_stop_loss_order(self, symbol: str, side: str, amount: float, 
                               stop_price: float, params: Optional[Dict] = None) -> Optional[Dict]:
         """
@@ -224,24 +412,6 @@ class TradeExecutor:
             Order dict or None if failed
         """
         try:
-            if self.dry_run:
-                order_id = f"DRY_{uuid.uuid4().hex[:8]}"
-                order = {
-                    'id': order_id,
-                    'symbol': symbol,
-                    'type': 'stop_market',
-                    'side': side,
-                    'amount': amount,
-                    'stopPrice': stop_price,
-                    'status': 'open',
-                    'timestamp': int(time.time() * 1000),
-                    'datetime': datetime.now().isoformat(),
-                    'info': {'dry_run': True}
-                }
-                self.logger.info(f"[DRY RUN] Stop loss: {side.upper()} {amount} {symbol} @ {stop_price}")
-                self.orders.append(order)
-                return order
-            
             # Bitget-specific parameters for stop loss
             params = params or {}
             params.update({
@@ -249,6 +419,7 @@ class TradeExecutor:
                 'triggerType': 'market_price'
             })
             
+            self._order_bucket.acquire()
             order = self.exchange.create_order(
                 symbol=symbol,
                 type='stop_market',
@@ -257,12 +428,12 @@ class TradeExecutor:
                 params=params
             )
             
-            self.logger.info(f"Stop loss order created: {side.upper()} {amount} {symbol} @ {stop_price}")
-            self.orders.append(order)
+            self.logger.info("Stop loss order created: %s %s %s @ %s", side.upper(), amount, symbol, stop_price)
+            self._track(order)
             return order
             
         except Exception as e:
-            self.logger.error(f"Error creating stop loss order: {e}")
+            self.logger.error("Error creating stop loss order: %s", e)
             return None
     
     def create_take_profit_order(self, symbol: str, side: str, amount: float, 
@@ -281,24 +452,6 @@ class TradeExecutor:
             Order dict or None if failed
         """
         try:
-            if self.dry_run:
-                order_id = f"DRY_{uuid.uuid4().hex[:8]}"
-                order = {
-                    'id': order_id,
-                    'symbol': symbol,
-                    'type': 'take_profit_market',
-                    'side': side,
-                    'amount': amount,
-                    'stopPrice': take_profit_price,
-                    'status': 'open',
-                    'timestamp': int(time.time() * 1000),
-                    'datetime': datetime.now().isoformat(),
-                    'info': {'dry_run': True}
-                }
-                self.logger.info(f"[DRY RUN] Take profit: {side.upper()} {amount} {symbol} @ {take_profit_price}")
-                self.orders.append(order)
-                return order
-            
             # Bitget-specific parameters for take profit
             params = params or {}
             params.update({
@@ -306,6 +459,7 @@ class TradeExecutor:
                 'triggerType': 'market_price'
             })
             
+            self._order_bucket.acquire()
             order = self.exchange.create_order(
                 symbol=symbol,
                 type='take_profit_market',
@@ -314,19 +468,81 @@ class TradeExecutor:
                 params=params
             )
             
-            self.logger.info(f"Take profit order created: {side.upper()} {amount} {symbol} @ {take_profit_price}")
-            self.orders.append(order)
+            self.logger.info("Take profit order created: %s %s %s @ %s", side.upper(), amount, symbol, take_profit_price)
+            self._track(order)
             return order
             
         except Exception as e:
-            self.logger.error(f"Error creating take profit order: {e}")
+            self.logger.error("Error creating take profit order: %s", e)
             return None
     
+    # Simulated counterparts of the order methods above, bound in __init__ for dry runs
+    
+    def _create_market_order_dry(self, symbol: str, side: str, amount: float,
+                                 params: Optional[Dict] = None) -> Dict:
+        order = _dry_order(_DRY_MARKET, symbol, side, amount, filled=amount)
+        self.logger.info("[DRY RUN] Market order: %s %s %s", side.upper(), amount, symbol)
+        self._track(order)
+        return order
+    
+    def _create_limit_order_dry(self, symbol: str, side: str, amount: float,
+                                price: float, params: Optional[Dict] = None) -> Dict:
+        order = _dry_order(_DRY_LIMIT, symbol, side, amount, price=price, remaining=amount)
+        self.logger.info("[DRY RUN] Limit order: %s %s %s @ %s", side.upper(), amount, symbol, price)
+        self._track(order)
+        return order
+    
+    def _create_stop_loss_order_dry(self, symbol: str, side: str, amount: float,
+                                    stop_price: float, params: Optional[Dict] = None) -> Dict:
+        order = _dry_order(_DRY_STOP_LOSS, symbol, side, amount, stopPrice=stop_price)
+        self.logger.info("[DRY RUN] Stop loss: %s %s %s @ %s", side.upper(), amount, symbol, stop_price)
+        self._track(order)
+        return order
+    
+    def _create_take_profit_order_dry(self, symbol: str, side: str, amount: float,
+                                      take_profit_price: float, params: Optional[Dict] = None) -> Dict:
+        order = _dry_order(_DRY_TAKE_PROFIT, symbol, side, amount, stopPrice=take_profit_price)
+        self.logger.info("[DRY RUN] Take profit: %s %s %s @ %s", side.upper(), amount, symbol, take_profit_price)
+        self._track(order)
+        return order
+    
+    def wait_for_fill(self, order: Dict, symbol: str, timeout: float = 5.0) -> Dict:
+        """
+        Poll an order until the exchange reports it filled
+        
+        Args:
+            order: Order dict as returned when it was placed
+            symbol: Trading pair
+            timeout: Seconds to keep polling before giving up
+            
+        Returns:
+            Latest known state of the order (may still be open if polling ran out)
+        """
+        if self.dry_run:
+            return order
+        
+        deadline = time.monotonic() + timeout
+        for attempt in itertools.count():
+            if order.get('status') == 'closed':
+                return order
+            delay = _poll_delay(attempt)
+            if time.monotonic() + delay > deadline:
+                break
+            time.sleep(delay)
+            order = self.get_order_status(order['id'], symbol) or order
+        
+        self.logger.warning("Order %s not reported filled after %.1fs", order['id'], timeout)
+        return order
+    
     def open_position_with_sl_tp(self, symbol: str, side: str, amount: float, 
                                  stop_loss: float, take_profit: float) -> Dict:
         """
         Open position with stop loss and take profit
         
+        SL/TP are attached to the entry order so one request opens the
+        protected position; exchanges that reject attached SL/TP fall back to
+        separate orders.
+        
         Args:
             symbol: Trading pair
             side: 'long' or 'short'
@@ -342,25 +558,34 @@ class TradeExecutor:
             entry_side = 'buy' if side == 'long' else 'sell'
             exit_side = 'sell' if side == 'long' else 'buy'
             
-            # 1. Open position (market order)
-            entry_order = self.create_market_order(symbol, entry_side, amount)
+            # Open the position with SL/TP attached (Bitget preset stop-loss / stop-surplus prices)
+            attached = {
+                'stopLoss': {'triggerPrice': stop_loss},
+                'takeProfit': {'triggerPrice': take_profit}
+            }
+            sl_order = tp_order = None
+            sl_tp_attached = True
+            try:
+                if self.dry_run:
+                    entry_order = self.create_market_order(symbol, entry_side, amount, params=attached)
+                else:
+                    entry_order = self._submit_market_order(symbol, entry_side, amount, params=attached)
+            except ccxt.NotSupported as e:
+                self.logger.warning("Attached SL/TP not supported (%s), placing separate orders", e)
+                sl_tp_attached = False
+                entry_order, sl_order, tp_order = self._open_with_separate_sl_tp(
+                    symbol, entry_side, exit_side, amount, stop_loss, take_profit
+                )
+            
             if not entry_order:
                 return {'success': False, 'error': 'Failed to create entry order'}
             
-            # Small delay to ensure order is processed
-            time.sleep(0.5)
-            
-            # 2. Set stop loss
-            sl_order = self.create_stop_loss_order(symbol, exit_side, amount, stop_loss)
-            
-            # 3. Set take profit
-            tp_order = self.create_take_profit_order(symbol, exit_side, amount, take_profit)
-            
             result = {
                 'success': True,
                 'entry_order': entry_order,
                 'stop_loss_order': sl_order,
                 'take_profit_order': tp_order,
+                'sl_tp_attached': sl_tp_attached,
                 'symbol': symbol,
                 'side': side,
                 'amount': amount,
@@ -369,15 +594,36 @@ class TradeExecutor:
                 'take_profit': take_profit
             }
             
-            self.logger.info(f"Position opened: {side.upper()} {amount} {symbol}")
-            self.logger.info(f"Entry: {result['entry_price']}, SL: {stop_loss}, TP: {take_profit}")
+            self.logger.info("Position opened: %s %s %s", side.upper(), amount, symbol)
+            self.logger.info("Entry: %s, SL: %s, TP: %s", result['entry_price'], stop_loss, take_profit)
             
             return result
             
         except Exception as e:
-            self.logger.error(f"Error opening position with SL/TP: {e}")
+            self.logger.error("Error opening position with SL/TP: %s", e)
             return {'success': False, 'error': str(e)}
     
+    def _open_with_separate_sl_tp(self, symbol: str, entry_side: str, exit_side: str, amount: float,
+                                  stop_loss: float, take_profit: float) -> tuple:
+        """
+        Open a position, then place its stop loss and take profit as their own orders
+        
+        Returns:
+            (entry_order, sl_order, tp_order); entry_order is None if the entry failed
+        """
+        entry_order = self.create_market_order(symbol, entry_side, amount)
+        if not entry_order:
+            return None, None, None
+        
+        # Wait until the entry is filled, returning as soon as it is
+        entry_order = self.wait_for_fill(entry_order, symbol)
+        
+        # Stop loss and take profit are independent, so place them concurrently
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='sl-tp') as pool:
+            f_sl = pool.submit(self.create_stop_loss_order, symbol, exit_side, amount, stop_loss)
+            f_tp = pool.submit(self.create_take_profit_order, symbol, exit_side, amount, take_profit)
+            return entry_order, f_sl.result(), f_tp.result()
+    
     def close_position(self, symbol: str, side: str, amount: Optional[float] = None) -> Optional[Dict]:
         """
         Close position (market order)
@@ -391,13 +637,23 @@ class TradeExecutor:
             Order dict or None if failed
         """
         try:
+            # Close the whole position in one request where the exchange supports it,
+            # instead of looking up its size first
+            if amount is None and not self.dry_run and self.exchange.has.get('closePosition'):
+                self._order_bucket.acquire()
+                order = self.exchange.close_position(symbol, side)
+                if order.get('id'):
+                    self._track(order)
+                self.logger.info("Position closed: %s %s (full size)", side.upper(), symbol)
+                return order
+            
             # Get current position if amount not specified
             if amount is None:
                 positions = self.get_positions(symbol)
                 if positions:
                     amount = abs(float(positions[0].get('contracts', 0)))
                 else:
-                    self.logger.warning(f"No open position found for {symbol}")
+                    self.logger.warning("No open position found for %s", symbol)
                     return None
             
             # Determine close side (opposite of position side)
@@ -408,12 +664,12 @@ class TradeExecutor:
                                             params={'reduceOnly': True})
             
             if order:
-                self.logger.info(f"Position closed: {side.upper()} {amount} {symbol}")
+                self.logger.info("Position closed: %s %s %s", side.upper(), amount, symbol)
             
             return order
             
         except Exception as e:
-            self.logger.error(f"Error closing position: {e}")
+            self.logger.error("Error closing position: %s", e)
             return None
     
     def cancel_order(self, order_id: str, symbol: str) -> bool:
@@ -429,15 +685,15 @@ class TradeExecutor:
         """
         try:
             if self.dry_run:
-                self.logger.info(f"[DRY RUN] Would cancel order: {order_id}")
+                self.logger.info("[DRY RUN] Would cancel order: %s", order_id)
                 return True
             
             self.exchange.cancel_order(order_id, symbol)
-            self.logger.info(f"Order cancelled: {order_id}")
+            self.logger.info("Order cancelled: %s", order_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error cancelling order: {e}")
+            self.logger.error("Error cancelling order: %s", e)
             return False
     
     def get_order_status(self, order_id: str, symbol: str) -> Optional[Dict]:
@@ -454,16 +710,13 @@ class TradeExecutor:
         try:
             if self.dry_run:
                 # Find in local orders
-                for order in self.orders:
-                    if order['id'] == order_id:
-                        return order
-                return None
+                return self._orders_by_id.get(order_id)
             
             order = self.exchange.fetch_order(order_id, symbol)
             return order
             
         except Exception as e:
-            self.logger.error(f"Error fetching order status: {e}")
+            self.logger.error("Error fetching order status: %s", e)
             return None
     
     def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
@@ -483,16 +736,16 @@ class TradeExecutor:
             
             positions = self.exchange.fetch_positions([symbol] if symbol else None)
             
-            # Filter open positions
+            # Filter open positions (contracts is None for empty slots, a string if unparsed)
             open_positions = [
-                pos for pos in positions 
-                if float(pos.get('contracts', 0)) != 0
+                pos for pos in positions
+                if (contracts := pos.get('contracts')) and float(contracts) != 0
             ]
             
             return open_positions
             
         except Exception as e:
-            self.logger.error(f"Error fetching positions: {e}")
+            self.logger.error("Error fetching positions: %s", e)
             return []
     
     def get_balance(self) -> Dict:
@@ -516,7 +769,7 @@ class TradeExecutor:
             return balance
             
         except Exception as e:
-            self.logger.error(f"Error fetching balance: {e}")
+            self.logger.error("Error fetching balance: %s", e)
             return {}
 
 